@@ -0,0 +1,102 @@
+"""
+Micro-benchmark: cached article representation.
+
+Compares the validated ``MediumArticle`` Pydantic model (HttpUrl parsing per
+article, ``model_dump_json`` per response) with the tuple-backed
+``ArticleRecord`` used internally, on three axes:
+
+    build      constructing N articles from parsed fields (refresh CPU)
+    serialize  rendering the /api/articles/ body for N articles
+    memory     retained bytes per cached article (tracemalloc)
+
+Usage (from backend/):
+    python -m benchmarks.article_records [--count 100 1000 10000] [--repeat 5]
+"""
+import argparse
+import gc
+import time
+import tracemalloc
+from datetime import datetime, timedelta
+
+from models.article import ArticleRecord, ArticlesResponse, MediumArticle, dump_json
+
+def article_fields(count: int):
+    """Parsed-entry field dicts shaped like MediumService output."""
+    start = datetime(2025, 1, 1)
+    return [
+        {
+            "title": f"Peppol and e-invoicing rollout notes, part {i}",
+            "description": "How clearance models change invoice validation " * 3,
+            "url": f"https://medium.com/@adrian.c.pop/peppol-rollout-notes-part-{i}-{i:012x}?source=rss",
+            "published_date": start + timedelta(hours=i),
+            "reading_time": f"{i % 12 + 1} min",
+            "tags": ["einvoicing", "peppol", "compliance"],
+        }
+        for i in range(count)
+    ]
+
+def build_models(fields):
+    return [MediumArticle(**f) for f in fields]
+
+def build_records(fields):
+    return [
+        ArticleRecord(f["title"], f["url"], f["published_date"], f["description"], f["reading_time"], tuple(f["tags"]))
+        for f in fields
+    ]
+
+def serialize_models(models):
+    response = ArticlesResponse(articles=models, total_count=len(models), last_updated=datetime(2025, 6, 1))
+    return response.model_dump_json().encode("utf-8")
+
+def serialize_records(records):
+    return dump_json({
+        "articles": [record.to_document() for record in records],
+        "total_count": len(records),
+        "last_updated": datetime(2025, 6, 1),
+        "source": "Medium RSS Feed",
+    })
+
+def best_time(func, arg, repeat: int) -> float:
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func(arg)
+        best = min(best, time.perf_counter() - start)
+    return best
+
+def retained_bytes(build, fields) -> int:
+    """Bytes still allocated after building (and keeping) the articles."""
+    gc.collect()
+    tracemalloc.start()
+    before, _ = tracemalloc.get_traced_memory()
+    articles = build(fields)
+    after, _ = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    del articles
+    return after - before
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--count", type=int, nargs="+", default=[100, 1000, 10000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    print(f"{'count':>7} {'build model ms':>15} {'build record ms':>16} {'serialize model ms':>19} "
+          f"{'serialize record ms':>20} {'model B/article':>16} {'record B/article':>17}")
+    for count in args.count:
+        fields = article_fields(count)
+        models = build_models(fields)
+        records = build_records(fields)
+        assert serialize_models(models) == serialize_records(records)
+        print(
+            f"{count:>7} "
+            f"{best_time(build_models, fields, args.repeat) * 1000:>15.2f} "
+            f"{best_time(build_records, fields, args.repeat) * 1000:>16.2f} "
+            f"{best_time(serialize_models, models, args.repeat) * 1000:>19.2f} "
+            f"{best_time(serialize_records, records, args.repeat) * 1000:>20.2f} "
+            f"{retained_bytes(build_models, fields) / count:>16.0f} "
+            f"{retained_bytes(build_records, fields) / count:>17.0f}"
+        )
+
+if __name__ == "__main__":
+    main()
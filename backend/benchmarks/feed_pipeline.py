@@ -0,0 +1,243 @@
+"""
+Offline benchmark suite for the Medium feed pipeline.
+
+Generates synthetic Medium-like RSS feeds (10 to 5,000 entries, small to very
+large bodies) and times each stage without touching the network:
+
+    feedparser      feedparser.parse on the raw document
+    parse_entry     MediumService.parse_feed_entry over every parsed entry
+    reading_time    MediumService.calculate_reading_time over every body
+    get_articles    cold MediumService.get_articles against a local stub server
+
+Throughput is reported as entries/s and MB/s of feed XML, memory as the
+tracemalloc peak of one extra run. Results can be saved as a baseline and
+later runs compared against it; a stage slower than the baseline by more than
+``--threshold`` is flagged as a regression.
+
+Usage (from backend/):
+    python -m benchmarks.feed_pipeline                          # full grid
+    python -m benchmarks.feed_pipeline --quick                  # small grid
+    python -m benchmarks.feed_pipeline --save-baseline benchmarks/baseline.json
+    python -m benchmarks.feed_pipeline --baseline benchmarks/baseline.json --fail-on-regression
+"""
+import argparse
+import asyncio
+import json
+import logging
+import os
+import platform
+import random
+import sys
+import threading
+import time
+import tracemalloc
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+import feedparser
+
+from benchmarks.reading_time import build_article
+from services.medium_service import MediumService
+
+# Body sizes in words; "xl" is several times a long-form Medium post
+BODY_SIZES = {"small": 150, "medium": 1500, "large": 8000, "xl": 40000}
+
+# (entries, body size); larger feeds use smaller bodies to keep runs bounded
+FULL_GRID = [
+    (10, "small"), (10, "large"), (10, "xl"),
+    (100, "small"), (100, "medium"), (100, "large"),
+    (1000, "small"), (1000, "medium"),
+    (5000, "small"),
+]
+QUICK_GRID = [(10, "small"), (10, "large"), (100, "medium")]
+
+STAGES = ("feedparser", "parse_entry", "reading_time", "get_articles")
+
+DEFAULT_BASELINE = os.path.join(os.path.dirname(__file__), "baseline.json")
+
+def build_feed(entries: int, body_words: int, seed: int = 7) -> str:
+    """Render a Medium-like RSS 2.0 document with ``entries`` items."""
+    rng = random.Random(seed)
+    # A handful of distinct bodies keeps generation fast for 5,000-entry feeds
+    bodies = [build_article(body_words, seed=seed + i) for i in range(min(entries, 8))]
+    items = []
+    for i in range(entries):
+        items.append(
+            f"<item><title>Synthetic post {i}</title>"
+            f"<link>https://medium.com/@bench/post-{i}</link>"
+            f'<guid isPermaLink="false">https://medium.com/p/{i:08x}</guid>'
+            f"<category>tag{i % 7}</category><category>topic{rng.randint(0, 20)}</category>"
+            f"<pubDate>{formatdate(1735689600 + i * 3600, usegmt=True)}</pubDate>"
+            f"<content:encoded><![CDATA[{bodies[i % len(bodies)]}]]></content:encoded></item>"
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">'
+        "<channel><title>Benchmark feed</title><link>https://medium.com/@bench</link>"
+        + "".join(items)
+        + "</channel></rss>"
+    )
+
+class FeedServer:
+    """Threaded local HTTP server serving one feed body."""
+
+    def __init__(self, body: str):
+        payload = body.encode("utf-8")
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                self.send_response(200)
+                self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self.server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self.url = f"http://127.0.0.1:{self.server.server_address[1]}/feed"
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+
+    def __enter__(self):
+        self.thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+def stage_functions(rss: str, url: str):
+    """Return {stage: zero-argument callable} for one feed."""
+    service = MediumService()
+    entries = feedparser.parse(rss).entries
+    bodies = [entry.content[0].value for entry in entries]
+
+    def parse_entries():
+        for entry in entries:
+            service.parse_feed_entry(entry)
+
+    def reading_times():
+        for body in bodies:
+            service.calculate_reading_time(body)
+
+    def get_articles():
+        # Fresh service each run: fetch, feedparser, entry parsing and sort
+        cold = MediumService(rss_url=url, cache_ttl=0)
+        articles = asyncio.run(cold.get_articles())
+        assert len(articles) == len(entries)
+
+    return {
+        "feedparser": lambda: feedparser.parse(rss),
+        "parse_entry": parse_entries,
+        "reading_time": reading_times,
+        "get_articles": get_articles,
+    }
+
+def measure(func, repeat: int):
+    """Return (best seconds, peak traced bytes) for ``func``."""
+    best = float("inf")
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func()
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak
+
+def repeats_for(entries: int, body_words: int, repeat: int) -> int:
+    # Keep multi-second cases to a single timed run
+    return 1 if entries * body_words > 2_000_000 else repeat
+
+def run_suite(grid, repeat: int, stages=STAGES):
+    results = []
+    for entries, size in grid:
+        body_words = BODY_SIZES[size]
+        rss = build_feed(entries, body_words)
+        feed_mb = len(rss.encode("utf-8")) / 1e6
+        runs = repeats_for(entries, body_words, repeat)
+        with FeedServer(rss) as server:
+            functions = stage_functions(rss, server.url)
+            for stage in stages:
+                seconds, peak = measure(functions[stage], runs)
+                results.append({
+                    "case": f"{entries}x{size}",
+                    "stage": stage,
+                    "entries": entries,
+                    "body_words": body_words,
+                    "feed_mb": round(feed_mb, 3),
+                    "seconds": seconds,
+                    "entries_per_s": entries / seconds,
+                    "mb_per_s": feed_mb / seconds,
+                    "peak_mb": peak / 1e6,
+                })
+                print_row(results[-1])
+    return results
+
+def print_header() -> None:
+    print(f"{'case':>12} {'stage':>13} {'feed MB':>8} {'ms':>10} {'entries/s':>11} "
+          f"{'MB/s':>8} {'peak MB':>8}")
+
+def print_row(row) -> None:
+    print(f"{row['case']:>12} {row['stage']:>13} {row['feed_mb']:>8.2f} {row['seconds'] * 1000:>10.2f} "
+          f"{row['entries_per_s']:>11.0f} {row['mb_per_s']:>8.2f} {row['peak_mb']:>8.1f}")
+
+def compare(results, baseline, threshold: float):
+    """Print per-stage deltas against ``baseline``; return regressed rows."""
+    previous = {(row["case"], row["stage"]): row for row in baseline.get("results", [])}
+    regressions = []
+    print()
+    print(f"{'case':>12} {'stage':>13} {'base ms':>10} {'now ms':>10} {'time':>8} {'peak':>8}")
+    for row in results:
+        base = previous.get((row["case"], row["stage"]))
+        if base is None:
+            continue
+        time_delta = row["seconds"] / base["seconds"] - 1
+        peak_delta = row["peak_mb"] / base["peak_mb"] - 1 if base["peak_mb"] else 0.0
+        flag = ""
+        if time_delta > threshold or peak_delta > threshold:
+            flag = "  REGRESSION"
+            regressions.append(row)
+        print(f"{row['case']:>12} {row['stage']:>13} {base['seconds'] * 1000:>10.2f} "
+              f"{row['seconds'] * 1000:>10.2f} {time_delta:>+8.0%} {peak_delta:>+8.0%}{flag}")
+    return regressions
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--quick", action="store_true", help="run the small grid only")
+    parser.add_argument("--repeat", type=int, default=3)
+    parser.add_argument("--stages", nargs="+", choices=STAGES, default=list(STAGES))
+    parser.add_argument("--baseline", default=DEFAULT_BASELINE, help="baseline JSON to compare against")
+    parser.add_argument("--save-baseline", metavar="PATH", help="write this run as the new baseline")
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed slowdown before flagging (0.25 = 25%%)")
+    parser.add_argument("--fail-on-regression", action="store_true")
+    args = parser.parse_args()
+
+    # The service logs every fetch at INFO
+    logging.basicConfig(level=logging.WARNING)
+
+    grid = QUICK_GRID if args.quick else FULL_GRID
+    print_header()
+    results = run_suite(grid, args.repeat, args.stages)
+
+    if args.save_baseline:
+        with open(args.save_baseline, "w", encoding="utf-8") as f:
+            json.dump({
+                "python": platform.python_version(),
+                "machine": platform.machine(),
+                "feedparser": feedparser.__version__,
+                "results": results,
+            }, f, indent=2)
+        print(f"\nBaseline written to {args.save_baseline}")
+        return
+
+    if args.baseline and os.path.exists(args.baseline):
+        with open(args.baseline, encoding="utf-8") as f:
+            regressions = compare(results, json.load(f), args.threshold)
+        if regressions and args.fail_on_regression:
+            sys.exit(1)
+
+if __name__ == "__main__":
+    main()
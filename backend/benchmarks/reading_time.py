@@ -0,0 +1,84 @@
+"""
+Micro-benchmark: reading-time calculation on large articles.
+
+Compares the streaming ``html.parser`` word counter used by
+``MediumService.calculate_reading_time`` with the previous
+BeautifulSoup + readtime path.
+
+Usage (from backend/):
+    python -m benchmarks.reading_time [--words 2000 20000] [--repeat 5]
+"""
+import argparse
+import random
+import time
+import tracemalloc
+
+import readtime
+from bs4 import BeautifulSoup
+
+from services.medium_service import MediumService
+
+VOCABULARY = (
+    "invoice compliance e-invoicing peppol vat reporting clearance model "
+    "platform architecture validation schema api integration tax authority"
+).split()
+
+def build_article(words: int, seed: int = 42) -> str:
+    """Medium-like HTML body with headings, paragraphs, code and figures."""
+    rng = random.Random(seed)
+    parts = []
+    written = 0
+    section = 0
+    while written < words:
+        section += 1
+        parts.append(f"<h3>Section {section}</h3>")
+        for _ in range(5):
+            length = rng.randint(40, 120)
+            text = " ".join(rng.choice(VOCABULARY) for _ in range(length))
+            parts.append(f"<p>{text}, <strong>{rng.choice(VOCABULARY)}</strong> &amp; <a href='#'>link</a>.</p>")
+            written += length + 2
+        parts.append("<pre><code>validate(invoice, rules)</code></pre>")
+        parts.append("<figure><img src='x.png'><figcaption>Figure caption</figcaption></figure>")
+        parts.append("<script>track()</script>")
+    return "".join(parts)
+
+def legacy_reading_time(html: str) -> str:
+    """The BeautifulSoup + readtime implementation this benchmark replaces."""
+    soup = BeautifulSoup(html, "html.parser")
+    for script in soup(["script", "style"]):
+        script.decompose()
+    return readtime.of_text(soup.get_text(strip=True)).text
+
+def measure(func, html: str, repeat: int):
+    """Return (best seconds per call, peak traced bytes, result)."""
+    best = float("inf")
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = func(html)
+        best = min(best, time.perf_counter() - start)
+    tracemalloc.start()
+    func(html)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+    return best, peak, result
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--words", type=int, nargs="+", default=[2000, 20000, 100000])
+    parser.add_argument("--repeat", type=int, default=5)
+    args = parser.parse_args()
+
+    service = MediumService()
+    print(f"{'words':>8} {'html KB':>8} {'legacy ms':>10} {'stream ms':>10} {'speedup':>8} "
+          f"{'legacy peak KB':>15} {'stream peak KB':>15}  result")
+    for words in args.words:
+        html = build_article(words)
+        legacy_s, legacy_peak, legacy_result = measure(legacy_reading_time, html, args.repeat)
+        stream_s, stream_peak, stream_result = measure(service.calculate_reading_time, html, args.repeat)
+        match = "ok" if legacy_result == stream_result else f"MISMATCH {legacy_result!r} != {stream_result!r}"
+        print(f"{words:>8} {len(html) / 1024:>8.0f} {legacy_s * 1000:>10.2f} {stream_s * 1000:>10.2f} "
+              f"{legacy_s / stream_s:>7.1f}x {legacy_peak / 1024:>15.0f} {stream_peak / 1024:>15.0f}  {match}")
+
+if __name__ == "__main__":
+    main()
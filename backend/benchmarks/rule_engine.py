@@ -0,0 +1,138 @@
+"""
+Micro-benchmark: invoice rule evaluation throughput (rules/second).
+
+Compares three ways of running the same rule set over one invoice:
+
+    interpreted   per-call port of the validate-rules edge function: dotted
+                  paths split and walked and regexes compiled on every
+                  evaluation (Python's re cache softens the latter)
+    cached        RuleSetCache.get + validate, the /api/invoices/validate
+                  path: content hash of the rules, then the compiled set
+    compiled      validate on an already compiled set (evaluation only)
+
+Usage (from backend/):
+    python -m benchmarks.rule_engine [--rules 10 100 1000] [--seconds 1.0]
+"""
+import argparse
+import random
+import re
+import time
+
+from services.rule_engine import (
+    UNDEFINED,
+    RuleSetCache,
+    compile_rule_set,
+    js_string,
+    loose_equals,
+    strict_equals,
+    _relational,
+)
+
+INVOICE = {
+    "number": "INV-2025-000123",
+    "issueDate": "2025-03-01",
+    "currency": "RON",
+    "seller": {"name": "Acme SRL", "vat": "RO12345678", "address": {"country": "RO", "city": "Cluj-Napoca"}},
+    "buyer": {"name": "Globex GmbH", "vat": "DE987654321", "address": {"country": "DE", "city": "Berlin"}},
+    "totals": {"net": 1250.0, "vat": 237.5, "gross": 1487.5, "due": "1487.50"},
+    "payment": {"iban": "RO49AAAA1B31007593840000", "terms": 30},
+    "notes": "Delivered under framework agreement 7/2024",
+}
+
+RULE_TEMPLATES = [
+    {"field": "totals.net", "operator": ">", "value": 0},
+    {"field": "totals.gross", "operator": ">=", "value": 1000},
+    {"field": "totals.due", "operator": "==", "value": 1487.5},
+    {"field": "currency", "operator": "===", "value": "RON"},
+    {"field": "seller.vat", "operator": "matches", "value": "^RO\\d{2,10}$"},
+    {"field": "buyer.vat", "operator": "matches", "value": "^[A-Z]{2}[0-9A-Z]{2,12}$"},
+    {"field": "seller.address.country", "operator": "!=", "value": "XX"},
+    {"field": "buyer.name", "operator": "notEmpty"},
+    {"field": "notes", "operator": "contains", "value": "agreement"},
+    {"field": "payment.terms", "operator": "<=", "value": 60, "action": "warning"},
+    {"field": "payment.iban", "operator": "matches", "value": "^RO\\d{2}[A-Z]{4}[0-9A-Z]{16}$"},
+    {"field": "buyer.address.postcode", "operator": "notEmpty", "action": "warning"},
+]
+
+def build_rules(count: int, seed: int = 3):
+    rng = random.Random(seed)
+    return [dict(rng.choice(RULE_TEMPLATES)) for _ in range(count)]
+
+def _resolve(obj, path):
+    value = obj
+    for part in path.split("."):
+        value = value.get(part, UNDEFINED) if isinstance(value, dict) else UNDEFINED
+    return value
+
+def _compare(operator, a, b):
+    if operator in (">", "greaterThan"):
+        return _relational(lambda x, y: x > y)(a, b)
+    if operator in ("<", "lessThan"):
+        return _relational(lambda x, y: x < y)(a, b)
+    if operator == ">=":
+        return _relational(lambda x, y: x >= y)(a, b)
+    if operator == "<=":
+        return _relational(lambda x, y: x <= y)(a, b)
+    if operator in ("==", "equals"):
+        return loose_equals(a, b)
+    if operator == "===":
+        return strict_equals(a, b)
+    if operator == "!=":
+        return not loose_equals(a, b)
+    if operator == "!==":
+        return not strict_equals(a, b)
+    if operator == "notEmpty":
+        return a is not None and a is not UNDEFINED and js_string(a).strip() != ""
+    if operator == "contains":
+        return js_string(b) in js_string("" if a is None or a is UNDEFINED else a)
+    if operator == "matches":
+        try:
+            return re.compile(js_string(b)).search(js_string("" if a is None or a is UNDEFINED else a)) is not None
+        except re.error:
+            return False
+    return False
+
+def validate_interpreted(rules, invoice):
+    """Straight port of the edge function's validateInvoice."""
+    errors, warnings, rule_log = [], [], []
+    for number, rule in enumerate(rules, 1):
+        expected = rule.get("value", UNDEFINED)
+        passed = _compare(rule["operator"], _resolve(invoice, rule["field"]), expected)
+        rule_log.append({"rule": number, "passed": passed})
+        if not passed:
+            message = f"Rule failed: {rule['field']} {rule['operator']} {js_string(expected)}"
+            (warnings if rule.get("action") == "warning" else errors).append(message)
+    return {"isValid": not errors, "errors": errors, "warnings": warnings, "ruleLog": rule_log}
+
+def rules_per_second(func, rule_count: int, seconds: float) -> float:
+    calls = 0
+    start = time.perf_counter()
+    deadline = start + seconds
+    while time.perf_counter() < deadline:
+        func()
+        calls += 1
+    return calls * rule_count / (time.perf_counter() - start)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--rules", type=int, nargs="+", default=[10, 100, 1000])
+    parser.add_argument("--seconds", type=float, default=1.0, help="time budget per measurement")
+    args = parser.parse_args()
+
+    print(f"{'rules':>6} {'interpreted r/s':>16} {'cached r/s':>12} {'compiled r/s':>13} {'speedup':>8} {'compile ms':>11}")
+    for count in args.rules:
+        rules = build_rules(count)
+        cache = RuleSetCache()
+        start = time.perf_counter()
+        compiled = compile_rule_set(rules)
+        compile_ms = (time.perf_counter() - start) * 1000
+        assert compiled.validate(INVOICE) == validate_interpreted(rules, INVOICE)
+
+        interpreted = rules_per_second(lambda: validate_interpreted(rules, INVOICE), count, args.seconds)
+        cached = rules_per_second(lambda: cache.get(rules)[0].validate(INVOICE), count, args.seconds)
+        evaluated = rules_per_second(lambda: compiled.validate(INVOICE), count, args.seconds)
+        print(f"{count:>6} {interpreted:>16,.0f} {cached:>12,.0f} {evaluated:>13,.0f} "
+              f"{cached / interpreted:>7.1f}x {compile_ms:>11.2f}")
+
+if __name__ == "__main__":
+    main()
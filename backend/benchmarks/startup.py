@@ -0,0 +1,136 @@
+"""
+Startup profile: import-time breakdown and time until /health answers.
+
+Runs in fresh interpreters so nothing is cached from this process:
+
+    imports   ``python -X importtime -c "import server"``, grouped by top-level
+              package, plus a check that the feed parsing dependencies
+              (feedparser, bs4, dateutil) are not loaded at import time
+    ready     wall time from process spawn until GET /health returns 200,
+              through uvicorn when installed (else an in-process ASGI client)
+
+Both are compared against a budget; the exit code is 1 when either is over.
+Startup hooks talk to MongoDB, so point ``MONGO_URL`` at a reachable server
+to measure a realistic start (an unreachable one adds the index timeouts).
+
+Usage (from backend/):
+    python -m benchmarks.startup [--import-budget-ms 1500] [--ready-budget-ms 5000] [--top 15]
+"""
+import argparse
+import json
+import os
+import re
+import socket
+import subprocess
+import sys
+import time
+import urllib.request
+from collections import defaultdict
+from importlib.util import find_spec
+
+BACKEND_DIR = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+
+# Only the feed pipeline should pull these in, on first use
+LAZY_MODULES = ("feedparser", "bs4", "dateutil")
+
+IMPORTTIME_LINE = re.compile(r"^import time:\s+(\d+) \|\s+(\d+) \|( *)(\S+)$")
+
+# Runs /health through the ASGI app when uvicorn is not available
+IN_PROCESS_READY = """
+from fastapi.testclient import TestClient
+import server
+with TestClient(server.app) as client:
+    assert client.get("/health").status_code == 200
+print("ready", flush=True)
+"""
+
+def profile_imports():
+    """Return (total ms, {package: self ms}, loaded lazy modules) for ``import server``."""
+    check = "import server, sys; print(','.join(m for m in %r if m in sys.modules))" % (LAZY_MODULES,)
+    proc = subprocess.run(
+        [sys.executable, "-X", "importtime", "-c", check],
+        cwd=BACKEND_DIR, capture_output=True, text=True, check=True,
+    )
+    by_package = defaultdict(float)
+    total_us = 0
+    for line in proc.stderr.splitlines():
+        match = IMPORTTIME_LINE.match(line)
+        if not match:
+            continue
+        self_us, cumulative_us, indent, name = match.groups()
+        by_package[name.split(".")[0]] += int(self_us) / 1000
+        if name == "server":
+            total_us = int(cumulative_us)
+    loaded = [name for name in proc.stdout.strip().split(",") if name]
+    return total_us / 1000, dict(by_package), loaded
+
+def free_port() -> int:
+    with socket.socket() as sock:
+        sock.bind(("127.0.0.1", 0))
+        return sock.getsockname()[1]
+
+def time_to_ready(timeout: float = 60.0):
+    """Return (runner, ms from spawn until /health answers 200)."""
+    env = dict(os.environ, PYTHONDONTWRITEBYTECODE="1")
+    if find_spec("uvicorn") is None:
+        start = time.perf_counter()
+        subprocess.run(
+            [sys.executable, "-c", IN_PROCESS_READY],
+            cwd=BACKEND_DIR, env=env, check=True, capture_output=True, timeout=timeout,
+        )
+        return "in-process", (time.perf_counter() - start) * 1000
+
+    port = free_port()
+    start = time.perf_counter()
+    proc = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "server:app", "--port", str(port), "--log-level", "warning"],
+        cwd=BACKEND_DIR, env=env, stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL,
+    )
+    try:
+        while time.perf_counter() - start < timeout:
+            try:
+                with urllib.request.urlopen(f"http://127.0.0.1:{port}/health", timeout=1) as response:
+                    if response.status == 200:
+                        return "uvicorn", (time.perf_counter() - start) * 1000
+            except OSError:
+                time.sleep(0.02)
+        raise TimeoutError(f"/health not ready after {timeout:.0f}s")
+    finally:
+        proc.terminate()
+        proc.wait(timeout=10)
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument("--import-budget-ms", type=float, default=1500)
+    parser.add_argument("--ready-budget-ms", type=float, default=5000)
+    parser.add_argument("--top", type=int, default=15, help="packages to list in the breakdown")
+    parser.add_argument("--json", action="store_true", help="print the report as JSON")
+    args = parser.parse_args()
+
+    import_ms, by_package, loaded_lazy = profile_imports()
+    runner, ready_ms = time_to_ready()
+    over_budget = import_ms > args.import_budget_ms or ready_ms > args.ready_budget_ms
+
+    if args.json:
+        print(json.dumps({
+            "import_ms": round(import_ms, 1),
+            "import_budget_ms": args.import_budget_ms,
+            "ready_ms": round(ready_ms, 1),
+            "ready_budget_ms": args.ready_budget_ms,
+            "ready_runner": runner,
+            "eager_heavy_modules": loaded_lazy,
+            "packages_ms": {name: round(ms, 1) for name, ms in sorted(by_package.items(), key=lambda item: -item[1])[:args.top]},
+        }, indent=2))
+    else:
+        print(f"{'package':<24} {'self ms':>8}")
+        for name, ms in sorted(by_package.items(), key=lambda item: -item[1])[:args.top]:
+            print(f"{name:<24} {ms:>8.1f}")
+        print()
+        print(f"import server     {import_ms:>8.0f} ms  (budget {args.import_budget_ms:.0f})")
+        print(f"/health ready     {ready_ms:>8.0f} ms  (budget {args.ready_budget_ms:.0f}, {runner})")
+        print(f"eager heavy deps  {', '.join(loaded_lazy) or 'none'}")
+    if over_budget or loaded_lazy:
+        sys.exit(1)
+
+if __name__ == "__main__":
+    main()
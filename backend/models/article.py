@@ -1,6 +1,7 @@
 from pydantic import BaseModel, HttpUrl
+from pydantic_core import to_json
 from datetime import datetime
-from typing import Optional, List
+from typing import Any, Dict, NamedTuple, Optional, List, Tuple
 
 class MediumArticle(BaseModel):
     title: str
@@ -15,8 +16,87 @@ class MediumArticle(BaseModel):
             datetime: lambda v: v.isoformat()
         }
 
+class ArticleRecord(NamedTuple):
+    """
+    Compact internal form of an article (tuple-backed, no per-field validation).
+    
+    The feed parser, caches, search index and article store all pass these
+    around. Routes serialize them straight to ``MediumArticle``-shaped JSON;
+    the Pydantic models describe the API but are not built per request.
+    """
+    title: str
+    url: str
+    published_date: datetime
+    description: Optional[str] = None
+    reading_time: Optional[str] = None
+    tags: Tuple[str, ...] = ()
+    
+    @classmethod
+    def from_model(cls, article: MediumArticle) -> "ArticleRecord":
+        return cls(
+            article.title,
+            str(article.url),
+            article.published_date,
+            article.description,
+            article.reading_time,
+            tuple(article.tags or ()),
+        )
+    
+    @classmethod
+    def from_document(cls, doc: Dict[str, Any]) -> "ArticleRecord":
+        """Build from a stored document or its JSON form (ISO date string)."""
+        published_date = doc["published_date"]
+        if isinstance(published_date, str):
+            published_date = datetime.fromisoformat(published_date)
+        return cls(
+            doc["title"],
+            doc["url"],
+            published_date,
+            doc.get("description"),
+            doc.get("reading_time"),
+            tuple(doc.get("tags") or ()),
+        )
+    
+    def to_document(self) -> Dict[str, Any]:
+        # Field order of MediumArticle, so the JSON reads the same
+        return {
+            "title": self.title,
+            "description": self.description,
+            "url": self.url,
+            "published_date": self.published_date,
+            "reading_time": self.reading_time,
+            "tags": list(self.tags),
+        }
+
+def dump_json(data: Any) -> bytes:
+    """
+    Compact UTF-8 JSON via pydantic-core's serializer.
+    
+    Dicts from ``ArticleRecord.to_document`` serialize with the same field
+    order, datetime format and escaping as ``MediumArticle.model_dump_json``,
+    without building or revalidating models. URLs are the exception: they
+    are written as stored, whereas ``HttpUrl`` would normalise them (e.g. a
+    trailing slash after a bare host).
+    """
+    return to_json(data)
+
 class ArticlesResponse(BaseModel):
     articles: List[MediumArticle]
     total_count: int
     last_updated: datetime
-    source: str = "Medium RSS Feed"
\ No newline at end of file
+    source: str = "Medium RSS Feed"
+
+class ArticlesPage(BaseModel):
+    articles: List[MediumArticle]
+    next_cursor: Optional[str] = None
+    limit: int
+
+
+class ArticleSearchResult(BaseModel):
+    article: MediumArticle
+    score: float
+
+class ArticleSearchResponse(BaseModel):
+    query: str
+    results: List[ArticleSearchResult]
+    total_count: int
@@ -0,0 +1,22 @@
+from pydantic import BaseModel
+from typing import Any, Dict, List, Optional
+
+class Rule(BaseModel):
+    field: str
+    operator: str
+    value: Any = None
+    action: Optional[str] = None
+
+class ValidationRequest(BaseModel):
+    rules: List[Rule]
+    invoice: Dict[str, Any]
+
+class RuleLogEntry(BaseModel):
+    rule: int
+    passed: bool
+
+class ValidationResponse(BaseModel):
+    isValid: bool
+    errors: List[str]
+    warnings: List[str]
+    ruleLog: List[RuleLogEntry]
@@ -1,17 +1,55 @@
-from fastapi import APIRouter, HTTPException
+import asyncio
+from fastapi import APIRouter, HTTPException, Query, Request, Response
+from fastapi.responses import StreamingResponse
 from datetime import datetime
-from typing import List
+from typing import List, Optional
 import logging
-from models.article import MediumArticle, ArticlesResponse
-from services.medium_service import medium_service
+from models.article import (
+    MediumArticle,
+    ArticlesResponse,
+    ArticlesPage,
+    ArticleSearchResponse,
+    dump_json,
+)
+from services.feed_aggregator import feed_aggregator
+from services.response_cache import ARTICLES_CACHE_CONTROL
 
 logger = logging.getLogger(__name__)
 router = APIRouter(prefix="/articles", tags=["articles"])
 
+NDJSON_MEDIA_TYPE = "application/x-ndjson"
+
+def get_article_store(request: Request):
+    """Article store attached to the app at startup."""
+    return request.app.state.article_store
+
+def json_response(data) -> Response:
+    """
+    Serialize article records directly. Returning a Response skips FastAPI's
+    response_model round trip (dump, revalidate, dump again), so the
+    ``response_model=`` declarations only document the schema in OpenAPI
+    and are never applied to the body.
+    """
+    return Response(content=dump_json(data), media_type="application/json")
+
+async def stream_articles_ndjson(store):
+    """Yield one JSON line per stored article, straight from the DB cursor."""
+    try:
+        async for article in store.iter_articles():
+            yield dump_json(article.to_document()) + b"\n"
+    except Exception as e:
+        # Headers are already sent; end the stream and leave a trace
+        logger.error(f"Article stream aborted: {str(e)}")
+
 @router.get("/", response_model=ArticlesResponse)
-async def get_medium_articles():
+async def get_medium_articles(request: Request, stream: bool = False):
     """
-    Fetch all published Medium articles for the configured user.
+    Fetch all stored Medium articles for the configured user.
+    
+    The JSON body is serialized and compressed once per feed version and
+    served as raw bytes, with ``304 Not Modified`` for a matching ETag.
+    With ``?stream=1`` or ``Accept: application/x-ndjson`` articles are
+    streamed one per line as NDJSON instead, so memory stays flat.
     
     Returns:
         ArticlesResponse: Contains list of articles with metadata
@@ -19,35 +57,32 @@ async def get_medium_articles():
     Raises:
         HTTPException: If articles cannot be fetched
     """
-    try:
-        logger.info("Fetching Medium articles from RSS feed")
-        articles = await medium_service.get_articles()
-        
-        if not articles:
-            logger.warning("No articles retrieved from Medium RSS feed")
-            # Return empty response instead of error for better UX
-            return ArticlesResponse(
-                articles=[],
-                total_count=0,
-                last_updated=datetime.now()
-            )
-        
-        logger.info(f"Successfully retrieved {len(articles)} articles")
-        return ArticlesResponse(
-            articles=articles,
-            total_count=len(articles),
-            last_updated=datetime.now()
+    if stream or NDJSON_MEDIA_TYPE in request.headers.get("accept", ""):
+        return StreamingResponse(
+            stream_articles_ndjson(get_article_store(request)),
+            media_type=NDJSON_MEDIA_TYPE,
         )
     
+    try:
+        cached = await request.app.state.articles_response_cache.get()
     except Exception as e:
-        logger.error(f"Failed to fetch Medium articles: {str(e)}")
+        logger.error(f"Failed to load Medium articles: {str(e)}")
         raise HTTPException(
             status_code=500,
             detail="Failed to fetch articles from Medium. Please try again later."
         )
+    
+    headers = {"Cache-Control": ARTICLES_CACHE_CONTROL, "Vary": "Accept-Encoding"}
+    encoding, body, etag = cached.select(request.headers.get("accept-encoding"))
+    headers["ETag"] = etag
+    if cached.matches(request.headers.get("if-none-match")):
+        return Response(status_code=304, headers=headers)
+    if encoding != "identity":
+        headers["Content-Encoding"] = encoding
+    return Response(content=body, media_type="application/json", headers=headers)
 
 @router.get("/latest", response_model=List[MediumArticle])
-async def get_latest_articles(limit: int = 5):
+async def get_latest_articles(request: Request, limit: int = Query(5, ge=1, le=100)):
     """
     Fetch the most recent Medium articles with optional limit.
     
@@ -58,8 +93,8 @@ async def get_latest_articles(limit: int = 5):
         List[MediumArticle]: Latest articles sorted by publication date
     """
     try:
-        articles = await medium_service.get_articles()
-        return articles[:limit]
+        articles = await get_article_store(request).list_articles(limit=limit)
+        return json_response([article.to_document() for article in articles])
     
     except Exception as e:
         logger.error(f"Failed to fetch latest articles: {str(e)}")
@@ -68,34 +103,114 @@ async def get_latest_articles(limit: int = 5):
             detail="Failed to fetch latest articles"
         )
 
+@router.get("/query", response_model=ArticlesPage)
+async def query_articles(
+    request: Request,
+    limit: int = Query(10, ge=1, le=100),
+    cursor: Optional[str] = None,
+    tag: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+):
+    """
+    Page through stored articles, newest first.
+    
+    Args:
+        limit: Page size (1-100)
+        cursor: ``next_cursor`` from the previous page
+        tag: Only articles carrying this tag
+        since: Only articles published at or after this date
+        until: Only articles published before this date
+    
+    Returns:
+        ArticlesPage: One page of articles and the cursor for the next one
+    """
+    try:
+        articles, next_cursor = await get_article_store(request).query_articles(
+            limit, cursor=cursor, tag=tag, since=since, until=until
+        )
+    except ValueError:
+        raise HTTPException(status_code=400, detail="Invalid cursor")
+    except Exception as e:
+        logger.error(f"Failed to query articles: {str(e)}")
+        raise HTTPException(
+            status_code=500,
+            detail="Failed to query articles"
+        )
+    return json_response({
+        "articles": [article.to_document() for article in articles],
+        "next_cursor": next_cursor,
+        "limit": limit,
+    })
+
+@router.get("/search", response_model=ArticleSearchResponse)
+async def search_articles(
+    q: str = Query(..., min_length=1, max_length=200),
+    limit: int = Query(10, ge=1, le=50),
+    prefix: bool = True,
+):
+    """
+    Full-text search over article titles, descriptions, tags and body text.
+    
+    Args:
+        q: Search terms
+        limit: Maximum number of results (1-50)
+        prefix: Also match terms that start with a query word
+    
+    Returns:
+        ArticleSearchResponse: Matches ranked by BM25 score
+    """
+    hits = feed_aggregator.search(q, limit=limit, prefix=prefix)
+    return json_response({
+        "query": q,
+        "results": [{"article": article.to_document(), "score": round(score, 4)} for article, score in hits],
+        "total_count": len(hits),
+    })
+
 @router.get("/health")
 async def check_medium_integration():
     """
     Health check endpoint to verify Medium RSS feed accessibility.
     
+    Probes every feed the aggregator polls (``MEDIUM_FEEDS``), so the
+    circuits reported are the ones carrying poll traffic.
+    
     Returns:
-        dict: Status information about Medium integration
+        dict: Overall status plus ``rss_url``/``circuit`` per feed; the
+        top-level ``rss_url``/``circuit`` are the first feed's
     """
+    services = feed_aggregator.services
     try:
-        rss_data = await medium_service.fetch_rss_data()
-        if rss_data:
-            return {
-                "status": "healthy",
-                "message": "Medium RSS feed is accessible",
-                "rss_url": medium_service.rss_url,
-                "timestamp": datetime.now().isoformat()
+        bodies = await asyncio.gather(*(service.fetch_rss_data() for service in services))
+        feeds = [
+            {
+                "rss_url": service.rss_url,
+                "accessible": bool(body),
+                "circuit": service.breaker.snapshot(),
             }
+            for service, body in zip(services, bodies)
+        ]
+        accessible = sum(feed["accessible"] for feed in feeds)
+        if accessible == len(feeds):
+            status, message = "healthy", "Medium RSS feed is accessible"
         else:
-            return {
-                "status": "unhealthy",
-                "message": "Medium RSS feed is not accessible",
-                "rss_url": medium_service.rss_url,
-                "timestamp": datetime.now().isoformat()
-            }
+            status, message = "unhealthy", "Medium RSS feed is not accessible"
+        if len(feeds) > 1:
+            message = f"{accessible} of {len(feeds)} Medium RSS feeds are accessible"
+        return {
+            "status": status,
+            "message": message,
+            "rss_url": services[0].rss_url,
+            "circuit": services[0].breaker.snapshot(),
+            "feeds": feeds,
+            "timestamp": datetime.now().isoformat()
+        }
     
     except Exception as e:
         return {
             "status": "error",
             "message": f"Health check failed: {str(e)}",
+            "circuit": services[0].breaker.snapshot(),
+            "feeds": [{"rss_url": s.rss_url, "circuit": s.breaker.snapshot()} for s in services],
             "timestamp": datetime.now().isoformat()
         }
\ No newline at end of file
@@ -1,15 +1,23 @@
 import os
 import re
+import time
 import logging
+import httpx
 from fastapi import APIRouter, Request
 from fastapi.responses import JSONResponse
 from pydantic import BaseModel
 
+from services.email_queue import RESEND_API_BASE
+from services.metrics import RESEND_REQUEST_DURATION
+from services.rate_limit import TRUSTED_PROXIES, client_ip, parse_networks, rate_limit_key, retry_after_header
+
 logger = logging.getLogger("contact")
 
 router = APIRouter(prefix="/contact", tags=["contact"])
 
 EMAIL_RE = re.compile(r"^[^\s@]+@[^\s@]+\.[^\s@]+$")
+RESEND_API_URL = f"{RESEND_API_BASE}/emails"
+TRUSTED_NETWORKS = parse_networks(TRUSTED_PROXIES)
 
 
 class ContactPayload(BaseModel):
@@ -19,8 +27,40 @@ class ContactPayload(BaseModel):
     botField: str = ""
 
 
+def build_message(payload: ContactPayload) -> dict:
+    """Resend email body for a contact form submission."""
+    name = payload.name.replace("<", "").replace(">", "")
+    email = payload.email.replace("<", "").replace(">", "")
+    message = payload.message.replace("<", "").replace(">", "")
+    return {
+        "from": "Contact Form <contact@adrianpop.tech>",
+        "to": "adrian.c.pop@gmail.com",
+        "subject": f"New message from {name}",
+        "html": f"<p><strong>Name:</strong> {name}</p>"
+                f"<p><strong>Email:</strong> {email}</p>"
+                f"<p><strong>Message:</strong><br/>{message}</p>",
+    }
+
+
 @router.post("/send-email")
 async def send_email(payload: ContactPayload, request: Request):
+    limiter = getattr(request.app.state, "contact_rate_limiter", None)
+    if limiter is not None:
+        peer = request.client.host if request.client else None
+        ip = client_ip(peer, request.headers.get("x-forwarded-for"), TRUSTED_NETWORKS)
+        try:
+            retry_after = await limiter.hit(rate_limit_key(ip))
+        except Exception as exc:
+            # Fail open: a limiter outage must not take the contact form down
+            logger.error("Rate limiter unavailable: %s", exc)
+            retry_after = 0
+        if retry_after:
+            return JSONResponse(
+                {"success": False, "error": "Too many requests"},
+                status_code=429,
+                headers={"Retry-After": retry_after_header(retry_after)},
+            )
+
     if payload.botField.strip():
         return JSONResponse({"success": False, "error": "Spam detected"}, status_code=400)
 
@@ -38,26 +78,36 @@ async def send_email(payload: ContactPayload, request: Request):
         logger.error("RESEND_API_KEY not set")
         return JSONResponse({"success": False, "error": "Server misconfiguration"}, status_code=500)
 
-    import httpx
-    name = payload.name.replace("<", "").replace(">", "")
-    email = payload.email.replace("<", "").replace(">", "")
-    message = payload.message.replace("<", "").replace(">", "")
-
+    message = build_message(payload)
+
+    outbox = getattr(request.app.state, "email_outbox", None)
+    if outbox is not None:
+        try:
+            message_id = await outbox.enqueue(message)
+            email_workers = getattr(request.app.state, "email_workers", None)
+            if email_workers is not None:
+                email_workers.notify()
+            return JSONResponse({"success": True, "queued": True, "id": message_id}, status_code=202)
+        except Exception as exc:
+            # Queue unavailable: fall back to sending inline rather than dropping it
+            logger.error("Could not queue email, sending inline: %s", exc)
+
+    request_kwargs = dict(
+        headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
+        json=message,
+        timeout=10.0,
+    )
+
+    start = time.perf_counter()
     try:
-        async with httpx.AsyncClient() as client:
-            res = await client.post(
-                "https://api.resend.com/emails",
-                headers={"Authorization": f"Bearer {api_key}", "Content-Type": "application/json"},
-                json={
-                    "from": "Contact Form <contact@adrianpop.tech>",
-                    "to": "adrian.c.pop@gmail.com",
-                    "subject": f"New message from {name}",
-                    "html": f"<p><strong>Name:</strong> {name}</p>"
-                            f"<p><strong>Email:</strong> {email}</p>"
-                            f"<p><strong>Message:</strong><br/>{message}</p>",
-                },
-                timeout=10.0,
-            )
+        # Shared pooled client from server startup; one-off client otherwise
+        client = getattr(request.app.state, "http_client", None)
+        if client is not None:
+            res = await client.post(RESEND_API_URL, **request_kwargs)
+        else:
+            async with httpx.AsyncClient() as client:
+                res = await client.post(RESEND_API_URL, **request_kwargs)
+        RESEND_REQUEST_DURATION.labels("emails", str(res.status_code)).observe(time.perf_counter() - start)
 
         if not res.is_success:
             logger.error("Resend error %s: %s", res.status_code, res.text)
@@ -66,5 +116,7 @@ async def send_email(payload: ContactPayload, request: Request):
         return JSONResponse({"success": True})
 
     except Exception as exc:
+        if isinstance(exc, httpx.HTTPError):
+            RESEND_REQUEST_DURATION.labels("emails", "error").observe(time.perf_counter() - start)
         logger.exception("Unexpected error sending email: %s", exc)
         return JSONResponse({"success": False, "error": "Failed to send email"}, status_code=500)
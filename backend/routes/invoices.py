@@ -0,0 +1,59 @@
+import logging
+from datetime import datetime
+from fastapi import APIRouter, Request
+from fastapi.responses import JSONResponse
+
+from models.invoice import ValidationRequest, ValidationResponse
+from services.rule_engine import rule_set_cache
+from services.rule_runner import RuleEvaluationError, rule_runner
+
+logger = logging.getLogger(__name__)
+
+router = APIRouter(prefix="/invoices", tags=["invoices"])
+
+
+@router.post("/validate", response_model=ValidationResponse)
+async def validate_invoice(payload: ValidationRequest, request: Request):
+    """
+    Validate an invoice against a rule set.
+    
+    Rule sets are compiled once (path accessors, operator predicates,
+    precompiled regexes) and cached by content hash, so repeated calls with
+    the same rules only evaluate them. Semantics and response shape follow
+    the ``validate-rules`` Supabase edge function, except that ``matches``
+    uses Python regular expressions. Rule sets with ``matches`` run in worker
+    processes under ``RULE_EVAL_TIMEOUT`` so a backtracking pattern cannot
+    block the event loop; overrunning it answers 422.
+    
+    Args:
+        payload: ``rules`` (field, operator, value, action) and the ``invoice`` object
+    
+    Returns:
+        ValidationResponse: ``isValid``, ``errors``, ``warnings`` and a per-rule ``ruleLog``
+    """
+    try:
+        # exclude_unset keeps an omitted rule value distinct from an explicit null
+        rules = [rule.model_dump(exclude_unset=True) for rule in payload.rules]
+        compiled, _ = rule_set_cache.get(rules)
+        result = await rule_runner.validate(compiled, rules, payload.invoice)
+    except RuleEvaluationError as exc:
+        logger.warning("Rule evaluation aborted: %s", exc)
+        return JSONResponse({"error": str(exc)}, status_code=422)
+    except Exception as exc:
+        logger.exception("Validation error: %s", exc)
+        return JSONResponse({"error": str(exc)}, status_code=500)
+
+    # Run history is best effort, like the edge function's rule_runs insert
+    buffer = getattr(request.app.state, "rule_run_buffer", None)
+    if buffer is not None:
+        try:
+            await buffer.add({
+                "created_at": datetime.utcnow(),
+                "ruleset": compiled.digest,
+                "is_valid": result["isValid"],
+                "errors": result["errors"],
+                "warnings": result["warnings"],
+            })
+        except Exception as exc:
+            logger.warning("Could not record rule run: %s", exc)
+    return result
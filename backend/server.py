@@ -1,4 +1,10 @@
 # server.py
+import time
+
+# Startup profile: module imports and startup hooks are timed from here
+_IMPORT_STARTED = time.perf_counter()
+
+import asyncio
 import os
 import uuid
 import logging
@@ -6,13 +12,29 @@ from datetime import datetime
 
 from fastapi import FastAPI, APIRouter
 from fastapi.middleware.cors import CORSMiddleware
-from fastapi.responses import JSONResponse
+from fastapi.responses import JSONResponse, Response
 from pydantic import BaseModel, Field
 from motor.motor_asyncio import AsyncIOMotorClient
 from typing import Optional
 
+import httpx
+
 from routes.articles import router as articles_router
 from routes.contact import router as contact_router
+from routes.invoices import router as invoices_router
+from services.article_store import ArticleStore
+from services.email_queue import EmailOutbox, EmailWorkerPool, ResendSender
+from services.feed_aggregator import feed_aggregator
+from services.feed_poller import FeedPoller, FEED_POLLER_ENABLED
+from services.heartbeat import MongoHeartbeat
+from prometheus_client import CONTENT_TYPE_LATEST, generate_latest
+from services.metrics import MetricsMiddleware, MongoCommandMetrics, registry
+from services.http_client import create_http_client
+from services.parse_executor import create_parse_executor
+from services.rate_limit import create_rate_limiter
+from services.write_behind import WriteBehindBuffer
+from services.rule_runner import rule_runner
+from services.response_cache import ArticlesResponseCache
 
 # -----------------------------------------------------------------------------
 # Logging
@@ -49,6 +71,13 @@ MONGO_DB_NAME = os.getenv("MONGO_DB", "adrian_pop_portfolio")
 # -----------------------------------------------------------------------------
 mongo_client: Optional[AsyncIOMotorClient] = None
 db = None
+http_client: Optional[httpx.AsyncClient] = None
+feed_poller: Optional[FeedPoller] = None
+parse_executor = None
+email_workers: Optional[EmailWorkerPool] = None
+status_buffer: Optional[WriteBehindBuffer] = None
+mongo_heartbeat: Optional[MongoHeartbeat] = None
+index_task: Optional[asyncio.Task] = None
 
 # -----------------------------------------------------------------------------
 # Models (example)
@@ -63,20 +92,115 @@ class StatusCheckCreate(BaseModel):
 # -----------------------------------------------------------------------------
 # Lifecycle
 # -----------------------------------------------------------------------------
+async def ensure_indexes(targets):
+    """Create each store's Mongo indexes, logging (not raising) failures."""
+    for name, target in targets:
+        try:
+            await target.ensure_indexes()
+        except Exception as e:
+            logger.warning(f"Could not create {name} indexes: {e}")
+
 @app.on_event("startup")
 async def on_startup():
-    global mongo_client, db
+    global mongo_client, db, http_client, feed_poller, parse_executor, email_workers, status_buffer, mongo_heartbeat, index_task
+    startup_started = time.perf_counter()
     logger.info("Starting up the application...")
     logger.info(f"MongoDB URL: {MONGO_URL}")
     logger.info(f"Database: {MONGO_DB_NAME}")
 
-    mongo_client = AsyncIOMotorClient(MONGO_URL, serverSelectionTimeoutMS=2000)
+    # Command timings are recorded by a pymongo listener for /metrics
+    mongo_client = AsyncIOMotorClient(
+        MONGO_URL,
+        serverSelectionTimeoutMS=2000,
+        event_listeners=[MongoCommandMetrics()],
+    )
     db = mongo_client[MONGO_DB_NAME]
-    logger.info("Application startup complete.")
+
+    # Readiness is answered from a background ping instead of per probe
+    mongo_heartbeat = MongoHeartbeat(db)
+    mongo_heartbeat.start()
+
+    # Status checks are written behind in batches
+    status_buffer = WriteBehindBuffer(db.status_checks)
+    status_buffer.start()
+    # Invoice validation history, written behind like status checks
+    rule_run_buffer = WriteBehindBuffer(db.rule_runs)
+    rule_run_buffer.start()
+    app.state.rule_run_buffer = rule_run_buffer
+
+    # Shared pooled HTTP client for outbound calls (Medium RSS, Resend)
+    http_client = create_http_client()
+    app.state.http_client = http_client
+
+    # Feed parsing (feedparser, HTML cleaning) runs off the event loop
+    parse_executor = create_parse_executor()
+    feed_aggregator.configure(http_client, parse_executor)
+    # Warm start: restore the last parsed feed so the first poll can be a 304
+    feed_aggregator.load_snapshots()
+
+    # Articles are served from Mongo; the poller keeps the collection in sync with Medium
+    article_store = ArticleStore(db)
+    app.state.article_store = article_store
+    app.state.articles_response_cache = ArticlesResponseCache(article_store)
+    if FEED_POLLER_ENABLED:
+        feed_poller = FeedPoller(feed_aggregator, article_store)
+        feed_poller.start()
+
+    # Per-client rate limit on the contact form (in-process or shared via Mongo)
+    contact_rate_limiter = create_rate_limiter(db)
+    app.state.contact_rate_limiter = contact_rate_limiter
+
+    # Contact form emails go through a durable outbox drained by background workers
+    email_outbox = EmailOutbox(db)
+    app.state.email_outbox = email_outbox
+    email_workers = EmailWorkerPool(email_outbox, ResendSender(os.getenv("RESEND_API_KEY"), http_client))
+    app.state.email_workers = email_workers
+    email_workers.start()
+
+    # Index creation waits on Mongo; keep it off the path to serving /health
+    index_targets = [("article", article_store), ("email outbox", email_outbox)]
+    if hasattr(contact_rate_limiter, "ensure_indexes"):
+        index_targets.append(("rate limit", contact_rate_limiter))
+    index_task = asyncio.create_task(ensure_indexes(index_targets))
+    startup_ms = (time.perf_counter() - startup_started) * 1000
+    logger.info(f"Application startup complete in {startup_ms:.0f} ms (module imports {IMPORT_MS:.0f} ms).")
 
 @app.on_event("shutdown")
 async def on_shutdown():
-    global mongo_client
+    global mongo_client, http_client, feed_poller, parse_executor, email_workers, status_buffer, mongo_heartbeat, index_task
+    if index_task:
+        index_task.cancel()
+        index_task = None
+    if mongo_heartbeat:
+        await mongo_heartbeat.stop()
+        mongo_heartbeat = None
+    if status_buffer:
+        await status_buffer.stop()
+        logger.info(f"Status buffer flushed: {status_buffer.stats()}")
+        status_buffer = None
+    rule_run_buffer = getattr(app.state, "rule_run_buffer", None)
+    if rule_run_buffer:
+        await rule_run_buffer.stop()
+        app.state.rule_run_buffer = None
+    # Regex rule workers are spawned on first use
+    rule_runner.close()
+    if email_workers:
+        await email_workers.stop()
+        email_workers = None
+        logger.info("Email workers stopped.")
+    if feed_poller:
+        await feed_poller.stop()
+        feed_poller = None
+        logger.info("Feed poller stopped.")
+    feed_aggregator.configure(None, None)
+    if parse_executor:
+        parse_executor.shutdown(wait=False, cancel_futures=True)
+        parse_executor = None
+        logger.info("Parse executor shut down.")
+    if http_client:
+        app.state.http_client = None
+        await http_client.aclose()
+        logger.info("HTTP client closed.")
     if mongo_client:
         mongo_client.close()
         logger.info("Mongo client closed.")
@@ -95,25 +219,32 @@ async def health():
 
 @app.get("/ready")
 async def ready():
-    """Readiness probe: verifies Mongo connectivity."""
-    try:
-        await db.command("ping")  # type: ignore
+    """Readiness probe: reports the cached Mongo heartbeat state without pinging."""
+    if mongo_heartbeat is not None and mongo_heartbeat.is_ready():
         return {
             "status": "ready",
             "database": "connected",
+            "heartbeat": mongo_heartbeat.snapshot(),
             "timestamp": datetime.utcnow().isoformat() + "Z",
         }
-    except Exception as e:
-        logger.error(f"Readiness check failed: {e}")
-        return JSONResponse(
-            status_code=503,
-            content={
-                "status": "not-ready",
-                "database": "disconnected",
-                "error": str(e),
-                "timestamp": datetime.utcnow().isoformat() + "Z",
-            },
-        )
+    error = mongo_heartbeat.not_ready_reason() if mongo_heartbeat else "Heartbeat not started"
+    heartbeat = mongo_heartbeat.snapshot() if mongo_heartbeat else None
+    logger.error(f"Readiness check failed: {error}")
+    return JSONResponse(
+        status_code=503,
+        content={
+            "status": "not-ready",
+            "database": "disconnected",
+            "error": error,
+            "heartbeat": heartbeat,
+            "timestamp": datetime.utcnow().isoformat() + "Z",
+        },
+    )
+
+@app.get("/metrics", include_in_schema=False)
+async def metrics():
+    """Prometheus scrape endpoint: request, upstream and Mongo latency histograms."""
+    return Response(generate_latest(registry), media_type=CONTENT_TYPE_LATEST)
 
 # -----------------------------------------------------------------------------
 # Root routes (no prefix)
@@ -137,16 +268,19 @@ async def api_root():
 @api_router.post("/status", response_model=StatusCheck)
 async def create_status(payload: StatusCheckCreate):
     item = StatusCheck(client_name=payload.client_name)
-    # Example persistence (optional):
+    # Example persistence (optional), batched by the write-behind buffer
     try:
-        await db.status_checks.insert_one(item.model_dump())  # type: ignore
+        await status_buffer.add(item.model_dump())  # type: ignore
     except Exception as e:
         logger.warning(f"Could not write status check: {e}")
     return item
 
 api_router.include_router(articles_router)
 api_router.include_router(contact_router)
+api_router.include_router(invoices_router)
 
+# Request timings for /metrics (inside CORS, so preflights are not counted)
+app.add_middleware(MetricsMiddleware)
 app.add_middleware(
     CORSMiddleware,
     allow_credentials=True,
@@ -156,3 +290,5 @@ app.add_middleware(
 )
 
 app.include_router(api_router)
+
+IMPORT_MS = (time.perf_counter() - _IMPORT_STARTED) * 1000
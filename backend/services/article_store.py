@@ -0,0 +1,146 @@
+import base64
+import logging
+from datetime import datetime
+from typing import AsyncIterator, List, Optional, Tuple
+from pymongo import ASCENDING, DESCENDING, UpdateOne
+from models.article import ArticleRecord
+
+logger = logging.getLogger(__name__)
+
+ARTICLES_COLLECTION = "articles"
+# Single document tracking the feed version: {_id: "articles", version, updated_at}
+META_COLLECTION = "articles_meta"
+
+# Newest first, URL as tie-breaker so the keyset order is total
+ARTICLE_SORT = [("published_date", DESCENDING), ("url", DESCENDING)]
+
+def encode_cursor(article: ArticleRecord) -> str:
+    """Opaque keyset cursor pointing just after ``article``."""
+    raw = f"{article.published_date.isoformat()}|{article.url}"
+    return base64.urlsafe_b64encode(raw.encode("utf-8")).decode("ascii")
+
+def decode_cursor(cursor: str) -> Tuple[datetime, str]:
+    """Inverse of ``encode_cursor``. Raises ValueError on malformed input."""
+    try:
+        raw = base64.urlsafe_b64decode(cursor.encode("ascii")).decode("utf-8")
+        published, url = raw.split("|", 1)
+        return datetime.fromisoformat(published), url
+    except Exception as e:
+        raise ValueError(f"Invalid cursor: {cursor}") from e
+
+def build_query(
+    cursor: Optional[str] = None,
+    tag: Optional[str] = None,
+    since: Optional[datetime] = None,
+    until: Optional[datetime] = None,
+) -> dict:
+    """Mongo filter for a page of articles in ``ARTICLE_SORT`` order."""
+    clauses = []
+    if tag:
+        clauses.append({"tags": tag})
+    if since or until:
+        date_range = {}
+        if since:
+            date_range["$gte"] = since
+        if until:
+            date_range["$lt"] = until
+        clauses.append({"published_date": date_range})
+    if cursor:
+        published, url = decode_cursor(cursor)
+        clauses.append({"$or": [
+            {"published_date": {"$lt": published}},
+            {"published_date": published, "url": {"$lt": url}},
+        ]})
+    if not clauses:
+        return {}
+    if len(clauses) == 1:
+        return clauses[0]
+    return {"$and": clauses}
+
+class ArticleStore:
+    """MongoDB persistence for parsed Medium articles, keyed by article URL."""
+    
+    def __init__(self, db):
+        self.collection = db[ARTICLES_COLLECTION]
+        self.meta = db[META_COLLECTION]
+    
+    async def ensure_indexes(self) -> None:
+        await self.collection.create_index([("url", ASCENDING)], unique=True)
+        await self.collection.create_index(ARTICLE_SORT)
+        await self.collection.create_index([("tags", ASCENDING)] + ARTICLE_SORT)
+    
+    @staticmethod
+    def to_document(article: ArticleRecord) -> dict:
+        return article.to_document()
+    
+    @staticmethod
+    def from_document(doc: dict) -> ArticleRecord:
+        # Documents were written by us from parsed records; no revalidation
+        return ArticleRecord.from_document(doc)
+    
+    async def upsert_articles(self, articles: List[ArticleRecord]) -> int:
+        """Insert new articles and refresh existing ones. Returns the number of writes."""
+        if not articles:
+            return 0
+        now = datetime.utcnow()
+        operations = []
+        for article in articles:
+            doc = self.to_document(article)
+            operations.append(UpdateOne(
+                {"url": doc["url"]},
+                {"$set": doc, "$setOnInsert": {"first_seen_at": now}},
+                upsert=True,
+            ))
+        result = await self.collection.bulk_write(operations, ordered=False)
+        written = result.upserted_count + result.modified_count
+        if written:
+            # Bump the version so every worker drops its serialized responses
+            await self.meta.update_one(
+                {"_id": ARTICLES_COLLECTION},
+                {"$inc": {"version": 1}, "$set": {"updated_at": now}},
+                upsert=True,
+            )
+        return written
+    
+    async def get_version(self) -> Tuple[int, Optional[datetime]]:
+        """Return (version, updated_at) of the stored feed; (0, None) before the first poll."""
+        doc = await self.meta.find_one({"_id": ARTICLES_COLLECTION})
+        if not doc:
+            return 0, None
+        return doc.get("version", 0), doc.get("updated_at")
+    
+    async def list_articles(self, limit: Optional[int] = None) -> List[ArticleRecord]:
+        """Return stored articles, newest first."""
+        cursor = self.collection.find({}, {"_id": 0, "first_seen_at": 0}).sort(ARTICLE_SORT)
+        if limit is not None:
+            cursor = cursor.limit(limit)
+        return [self.from_document(doc) async for doc in cursor]
+    
+    async def iter_articles(self, batch_size: int = 50) -> AsyncIterator[ArticleRecord]:
+        """Yield stored articles newest first without loading them all at once."""
+        cursor = self.collection.find({}, {"_id": 0, "first_seen_at": 0}).sort(ARTICLE_SORT).batch_size(batch_size)
+        async for doc in cursor:
+            yield self.from_document(doc)
+    
+    async def query_articles(
+        self,
+        limit: int,
+        cursor: Optional[str] = None,
+        tag: Optional[str] = None,
+        since: Optional[datetime] = None,
+        until: Optional[datetime] = None,
+    ) -> Tuple[List[ArticleRecord], Optional[str]]:
+        """
+        Return one page of articles and the cursor for the next page.
+        
+        One extra document is read to tell whether another page exists, so
+        the work per call is bounded by ``limit``.
+        """
+        query = build_query(cursor=cursor, tag=tag, since=since, until=until)
+        docs = self.collection.find(query, {"_id": 0, "first_seen_at": 0}).sort(ARTICLE_SORT).limit(limit + 1)
+        articles = [self.from_document(doc) async for doc in docs]
+        next_cursor = None
+        if len(articles) > limit:
+            articles = articles[:limit]
+            next_cursor = encode_cursor(articles[-1])
+        return articles, next_cursor
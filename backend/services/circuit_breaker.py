@@ -0,0 +1,70 @@
+import time
+from typing import Dict, Optional
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half-open"
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open circuit breaker for an upstream dependency.
+    
+    After ``failure_threshold`` consecutive failures the circuit opens and
+    calls are rejected immediately. Once ``recovery_timeout`` seconds have
+    passed a limited number of trial calls are let through (half-open): a
+    success closes the circuit, a failure opens it again.
+    """
+    
+    def __init__(self, failure_threshold: int = 5, recovery_timeout: float = 60.0, half_open_max_calls: int = 1):
+        self.failure_threshold = failure_threshold
+        self.recovery_timeout = recovery_timeout
+        self.half_open_max_calls = half_open_max_calls
+        self.failures = 0
+        self.opened_at: Optional[float] = None
+        self.last_failure: Optional[str] = None
+        self._state = CLOSED
+        self._half_open_calls = 0
+    
+    @property
+    def state(self) -> str:
+        if self._state == OPEN and time.monotonic() - self.opened_at >= self.recovery_timeout:
+            self._state = HALF_OPEN
+            self._half_open_calls = 0
+        return self._state
+    
+    def allow_request(self) -> bool:
+        state = self.state
+        if state == CLOSED:
+            return True
+        if state == HALF_OPEN and self._half_open_calls < self.half_open_max_calls:
+            self._half_open_calls += 1
+            return True
+        return False
+    
+    def record_success(self) -> None:
+        self.failures = 0
+        self.opened_at = None
+        self._state = CLOSED
+    
+    def record_failure(self, reason: str = "") -> None:
+        self.failures += 1
+        self.last_failure = reason or None
+        if self._state == HALF_OPEN or self.failures >= self.failure_threshold:
+            self._state = OPEN
+            self.opened_at = time.monotonic()
+    
+    def retry_in(self) -> float:
+        """Seconds until an open circuit lets a trial call through (0 otherwise)."""
+        if self.state != OPEN:
+            return 0.0
+        return max(0.0, self.recovery_timeout - (time.monotonic() - self.opened_at))
+    
+    def snapshot(self) -> Dict:
+        return {
+            "state": self.state,
+            "consecutive_failures": self.failures,
+            "failure_threshold": self.failure_threshold,
+            "recovery_timeout": self.recovery_timeout,
+            "retry_in_seconds": round(self.retry_in(), 3),
+            "last_failure": self.last_failure,
+        }
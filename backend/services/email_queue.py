@@ -0,0 +1,280 @@
+import asyncio
+import hashlib
+import logging
+import os
+import random
+import time
+import uuid
+from datetime import datetime, timedelta
+from typing import Callable, Dict, List, Optional
+import httpx
+from pymongo import ASCENDING, ReturnDocument, UpdateOne
+from services.metrics import RESEND_REQUEST_DURATION
+
+logger = logging.getLogger(__name__)
+
+EMAIL_OUTBOX_COLLECTION = "email_outbox"
+
+RESEND_API_BASE = os.getenv("RESEND_API_BASE", "https://api.resend.com")
+EMAIL_WORKERS = int(os.getenv("EMAIL_WORKERS", "2"))
+# Resend accepts at most 100 emails per batch call
+EMAIL_BATCH_SIZE = min(100, int(os.getenv("EMAIL_BATCH_SIZE", "10")))
+EMAIL_POLL_INTERVAL = float(os.getenv("EMAIL_POLL_INTERVAL", "2"))
+EMAIL_MAX_ATTEMPTS = int(os.getenv("EMAIL_MAX_ATTEMPTS", "8"))
+EMAIL_RETRY_BASE = float(os.getenv("EMAIL_RETRY_BASE", "5"))
+EMAIL_RETRY_MAX = float(os.getenv("EMAIL_RETRY_MAX", "3600"))
+EMAIL_LEASE_SECONDS = float(os.getenv("EMAIL_LEASE_SECONDS", "60"))
+
+# Outbox document states
+STATUS_PENDING = "pending"
+STATUS_SENDING = "sending"
+STATUS_SENT = "sent"
+STATUS_DEAD = "dead"
+
+class EmailDeliveryError(Exception):
+    """Delivery failed; ``retryable`` is False when resending cannot help."""
+    
+    def __init__(self, message: str, retryable: bool = True):
+        super().__init__(message)
+        self.retryable = retryable
+
+def idempotency_key(message_ids: List[str]) -> str:
+    """
+    Resend ``Idempotency-Key`` for a delivery of these outbox messages.
+    
+    A retry after a timeout (or after another worker re-claims an expired
+    lease) sends the same key, so Resend does not deliver twice.
+    """
+    if len(message_ids) == 1:
+        return f"outbox-{message_ids[0]}"
+    digest = hashlib.sha256("\n".join(sorted(message_ids)).encode("utf-8")).hexdigest()
+    return f"outbox-batch-{digest}"
+
+def retry_delay(attempts: int, base: float = EMAIL_RETRY_BASE, maximum: float = EMAIL_RETRY_MAX) -> float:
+    """Capped exponential backoff with ±20% jitter for the given attempt number (1-based)."""
+    delay = min(maximum, base * (2 ** max(0, attempts - 1)))
+    return delay * random.uniform(0.8, 1.2)
+
+class EmailOutbox:
+    """
+    MongoDB-backed outbound email queue.
+    
+    Messages are claimed with a lease, so a worker that dies mid-delivery
+    releases them once the lease expires (at-least-once delivery).
+    """
+    
+    def __init__(self, db):
+        self.collection = db[EMAIL_OUTBOX_COLLECTION]
+    
+    async def ensure_indexes(self) -> None:
+        await self.collection.create_index([("status", ASCENDING), ("next_attempt_at", ASCENDING)])
+    
+    async def enqueue(self, message: Dict) -> str:
+        now = datetime.utcnow()
+        message_id = str(uuid.uuid4())
+        await self.collection.insert_one({
+            "_id": message_id,
+            "status": STATUS_PENDING,
+            "message": message,
+            "attempts": 0,
+            "next_attempt_at": now,
+            "created_at": now,
+            "updated_at": now,
+        })
+        return message_id
+    
+    async def claim(self, limit: int, lease_seconds: float = EMAIL_LEASE_SECONDS) -> List[Dict]:
+        """Atomically lease up to ``limit`` due messages."""
+        now = datetime.utcnow()
+        query = {"$or": [
+            {"status": STATUS_PENDING, "next_attempt_at": {"$lte": now}},
+            {"status": STATUS_SENDING, "lease_until": {"$lte": now}},
+        ]}
+        update = {"$set": {
+            "status": STATUS_SENDING,
+            "lease_until": now + timedelta(seconds=lease_seconds),
+            "updated_at": now,
+        }}
+        claimed = []
+        for _ in range(limit):
+            doc = await self.collection.find_one_and_update(
+                query, update, sort=[("next_attempt_at", ASCENDING)], return_document=ReturnDocument.AFTER
+            )
+            if doc is None:
+                break
+            claimed.append(doc)
+        return claimed
+    
+    async def mark_sent(self, message_ids: List[str]) -> None:
+        now = datetime.utcnow()
+        await self.collection.update_many(
+            {"_id": {"$in": message_ids}},
+            {"$set": {"status": STATUS_SENT, "sent_at": now, "updated_at": now}, "$unset": {"lease_until": ""}},
+        )
+    
+    async def mark_failed(self, failures: List[Dict]) -> None:
+        """Apply ``{"_id", "status", "attempts", "next_attempt_at", "error"}`` updates."""
+        now = datetime.utcnow()
+        operations = [
+            UpdateOne({"_id": failure["_id"]}, {
+                "$set": {
+                    "status": failure["status"],
+                    "attempts": failure["attempts"],
+                    "next_attempt_at": failure["next_attempt_at"],
+                    "last_error": failure["error"],
+                    "updated_at": now,
+                },
+                "$unset": {"lease_until": ""},
+            })
+            for failure in failures
+        ]
+        if operations:
+            await self.collection.bulk_write(operations, ordered=False)
+
+class ResendSender:
+    """Delivers messages through Resend's batch endpoint."""
+    
+    def __init__(
+        self,
+        api_key: Optional[str],
+        http_client: Optional[httpx.AsyncClient] = None,
+        base_url: str = RESEND_API_BASE,
+        timeout: float = 10.0,
+    ):
+        self.api_key = api_key
+        self.http_client = http_client
+        self.base_url = base_url.rstrip("/")
+        self.timeout = timeout
+    
+    async def send_batch(self, messages: List[Dict], idempotency_key: Optional[str] = None) -> None:
+        if not self.api_key:
+            raise EmailDeliveryError("RESEND_API_KEY not set")
+        headers = {"Authorization": f"Bearer {self.api_key}", "Content-Type": "application/json"}
+        if idempotency_key:
+            headers["Idempotency-Key"] = idempotency_key
+        request_kwargs = dict(
+            headers=headers,
+            json=messages,
+            timeout=self.timeout,
+        )
+        url = f"{self.base_url}/emails/batch"
+        start = time.perf_counter()
+        try:
+            if self.http_client is not None:
+                res = await self.http_client.post(url, **request_kwargs)
+            else:
+                async with httpx.AsyncClient() as client:
+                    res = await client.post(url, **request_kwargs)
+        except httpx.HTTPError as e:
+            RESEND_REQUEST_DURATION.labels("emails/batch", "error").observe(time.perf_counter() - start)
+            raise EmailDeliveryError(f"Resend request failed: {e}")
+        RESEND_REQUEST_DURATION.labels("emails/batch", str(res.status_code)).observe(time.perf_counter() - start)
+        if not res.is_success:
+            # Other 4xx mean the payload itself is rejected; 401/403 are a bad or
+            # rotated API key, which is fixed by config, not by the message, and
+            # 409 is the same idempotency key still in flight elsewhere
+            retryable = res.status_code in (401, 403, 409, 429) or res.status_code >= 500
+            raise EmailDeliveryError(f"Resend error {res.status_code}: {res.text}", retryable=retryable)
+
+class EmailWorkerPool:
+    """Background workers that drain the outbox in batches with retries."""
+    
+    def __init__(
+        self,
+        outbox: EmailOutbox,
+        sender: ResendSender,
+        workers: int = EMAIL_WORKERS,
+        batch_size: int = EMAIL_BATCH_SIZE,
+        poll_interval: float = EMAIL_POLL_INTERVAL,
+        max_attempts: int = EMAIL_MAX_ATTEMPTS,
+        backoff: Callable[[int], float] = retry_delay,
+    ):
+        self.outbox = outbox
+        self.sender = sender
+        self.workers = workers
+        self.batch_size = batch_size
+        self.poll_interval = poll_interval
+        self.max_attempts = max_attempts
+        self.backoff = backoff
+        self._tasks: List[asyncio.Task] = []
+        self._wakeup = asyncio.Event()
+    
+    def notify(self) -> None:
+        """Wake idle workers right after a new message is queued."""
+        self._wakeup.set()
+    
+    async def process_batch(self) -> int:
+        """Claim and deliver one batch. Returns the number of messages handled."""
+        docs = await self.outbox.claim(self.batch_size)
+        if not docs:
+            return 0
+        message_ids = [doc["_id"] for doc in docs]
+        try:
+            await self.sender.send_batch([doc["message"] for doc in docs], idempotency_key(message_ids))
+        except EmailDeliveryError as e:
+            if e.retryable or len(docs) == 1:
+                logger.error(f"Email batch of {len(docs)} failed: {e}")
+                await self.outbox.mark_failed([self._failure(doc, e) for doc in docs])
+                return len(docs)
+            # The batch mixes unrelated visitors; find the rejected message
+            # instead of dead-lettering the valid ones with it
+            logger.warning(f"Email batch of {len(docs)} rejected ({e}), sending one by one")
+            await self._deliver_each(docs)
+            return len(docs)
+        await self.outbox.mark_sent(message_ids)
+        logger.info(f"Delivered {len(docs)} queued emails")
+        return len(docs)
+    
+    async def _deliver_each(self, docs: List[Dict]) -> None:
+        sent = []
+        failures = []
+        for doc in docs:
+            try:
+                await self.sender.send_batch([doc["message"]], idempotency_key([doc["_id"]]))
+            except EmailDeliveryError as e:
+                logger.error(f"Email {doc['_id']} failed: {e}")
+                failures.append(self._failure(doc, e))
+            else:
+                sent.append(doc["_id"])
+        if sent:
+            await self.outbox.mark_sent(sent)
+        if failures:
+            await self.outbox.mark_failed(failures)
+    
+    def _failure(self, doc: Dict, error: EmailDeliveryError) -> Dict:
+        attempts = doc.get("attempts", 0) + 1
+        dead = not error.retryable or attempts >= self.max_attempts
+        if dead:
+            logger.error(f"Email {doc['_id']} moved to dead-letter after {attempts} attempts")
+        return {
+            "_id": doc["_id"],
+            "status": STATUS_DEAD if dead else STATUS_PENDING,
+            "attempts": attempts,
+            "next_attempt_at": datetime.utcnow() + timedelta(seconds=0 if dead else self.backoff(attempts)),
+            "error": str(error),
+        }
+    
+    async def _run(self) -> None:
+        while True:
+            try:
+                if await self.process_batch():
+                    continue
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Email worker error: {str(e)}")
+            self._wakeup.clear()
+            try:
+                await asyncio.wait_for(self._wakeup.wait(), self.poll_interval)
+            except asyncio.TimeoutError:
+                pass
+    
+    def start(self) -> None:
+        if not self._tasks:
+            self._tasks = [asyncio.create_task(self._run()) for _ in range(self.workers)]
+    
+    async def stop(self) -> None:
+        for task in self._tasks:
+            task.cancel()
+        await asyncio.gather(*self._tasks, return_exceptions=True)
+        self._tasks = []
@@ -0,0 +1,181 @@
+import asyncio
+import hashlib
+import heapq
+import logging
+import os
+from concurrent.futures import Executor
+from typing import Dict, List, Optional, Tuple
+import httpx
+from models.article import ArticleRecord
+from services.medium_service import MediumService, medium_service
+from services.search_index import SearchIndex
+
+logger = logging.getLogger(__name__)
+
+# Comma-separated feeds: "@user" (Medium author), "publication" (Medium
+# publication) or a full RSS/Atom URL. Empty means the default author only.
+MEDIUM_FEEDS = os.getenv("MEDIUM_FEEDS", "")
+FEED_MAX_CONCURRENCY = int(os.getenv("FEED_MAX_CONCURRENCY", "4"))
+FEED_TIMEOUT = float(os.getenv("FEED_TIMEOUT", "10"))
+# Directory for per-feed warm-start snapshots; empty disables them. The
+# default (backend/snapshots, /app/snapshots in the image) is a compose volume
+# so snapshots survive redeploys.
+FEED_SNAPSHOT_DIR = os.getenv(
+    "FEED_SNAPSHOT_DIR",
+    os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "snapshots"),
+)
+
+def service_for_feed(spec: str) -> MediumService:
+    """Build a MediumService for one MEDIUM_FEEDS entry."""
+    spec = spec.strip()
+    if spec.startswith(("http://", "https://")):
+        return MediumService(medium_username=spec, rss_url=spec)
+    if spec.startswith("@"):
+        return MediumService(medium_username=spec[1:])
+    return MediumService(medium_username=spec, rss_url=f"https://medium.com/feed/{spec}")
+
+class FeedAggregator:
+    """
+    Fetches several feeds concurrently and merges them into one timeline.
+    
+    Each feed runs under a shared concurrency limit and its own timeout; a
+    feed that is slow or failing contributes its last good articles (or
+    nothing) instead of holding back the merge.
+    """
+    
+    def __init__(
+        self,
+        services: List[MediumService],
+        max_concurrency: int = FEED_MAX_CONCURRENCY,
+        feed_timeout: float = FEED_TIMEOUT,
+    ):
+        self.services = services
+        self.max_concurrency = max_concurrency
+        self.feed_timeout = feed_timeout
+        # Shared across polls so fetches still running after a timeout keep
+        # counting against max_concurrency; rebuilt if the event loop changes
+        self._slots: Optional[asyncio.Semaphore] = None
+        self._slots_loop: Optional[asyncio.AbstractEventLoop] = None
+        
+        # One index over all feeds, keyed by URL: BM25 scores from separate
+        # per-feed indexes (own idf, own average length) do not compare
+        self.search_index = SearchIndex()
+        self._indexed: Dict[str, str] = {}
+        self._index_versions: List[Tuple[Optional[SearchIndex], int]] = []
+    
+    @classmethod
+    def from_config(cls, feeds: str = MEDIUM_FEEDS) -> "FeedAggregator":
+        specs = [spec for spec in feeds.split(",") if spec.strip()]
+        if not specs:
+            return cls([medium_service])
+        return cls([service_for_feed(spec) for spec in specs])
+    
+    def configure(self, http_client: Optional[httpx.AsyncClient], executor: Optional[Executor]) -> None:
+        """Inject the shared HTTP client and parse executor into every feed."""
+        for service in self.services:
+            service.http_client = http_client
+            service.executor = executor
+    
+    def load_snapshots(self, directory: str = FEED_SNAPSHOT_DIR) -> int:
+        """
+        Point every feed at its snapshot file under ``directory`` and restore
+        whatever was saved by the previous process. Returns the number of
+        feeds that were warmed.
+        """
+        if not directory:
+            return 0
+        loaded = 0
+        for service in self.services:
+            name = hashlib.sha1(service.rss_url.encode("utf-8")).hexdigest()
+            service.snapshot_path = os.path.join(directory, f"{name}.jsonl")
+            if service.load_snapshot():
+                loaded += 1
+        return loaded
+    
+    def _get_slots(self) -> asyncio.Semaphore:
+        loop = asyncio.get_running_loop()
+        if self._slots is None or self._slots_loop is not loop:
+            self._slots = asyncio.Semaphore(max(1, self.max_concurrency))
+            self._slots_loop = loop
+        return self._slots
+    
+    async def _refresh_feed(self, service: MediumService, slots: asyncio.Semaphore) -> Optional[List[ArticleRecord]]:
+        await slots.acquire()
+        # On timeout the refresh keeps running in the background and its result
+        # is cached for the next poll; its slot is only released when it ends
+        refresh = asyncio.ensure_future(service.refresh_articles())
+        refresh.add_done_callback(lambda _: slots.release())
+        try:
+            articles = await asyncio.wait_for(asyncio.shield(refresh), self.feed_timeout)
+        except asyncio.TimeoutError:
+            logger.warning(f"Feed {service.rss_url} timed out after {self.feed_timeout}s")
+            articles = None
+        except Exception as e:
+            logger.error(f"Feed {service.rss_url} failed: {str(e)}")
+            articles = None
+        if articles is None:
+            return service.cached_articles
+        return articles
+    
+    async def refresh_articles(self) -> Optional[List[ArticleRecord]]:
+        """Refresh every feed and return the merged timeline (None if all failed)."""
+        slots = self._get_slots()
+        results = await asyncio.gather(*(self._refresh_feed(service, slots) for service in self.services))
+        feeds = [articles for articles in results if articles is not None]
+        if not feeds:
+            return None
+        return merge_articles(feeds)
+    
+    def search(self, query: str, limit: int = 10, prefix: bool = True) -> List[Tuple[ArticleRecord, float]]:
+        """Search all feeds; an article shared by several feeds is returned once."""
+        if len(self.services) == 1:
+            return self.services[0].search_index.search(query, limit=limit, prefix=prefix)
+        self._sync_search_index()
+        return self.search_index.search(query, limit=limit, prefix=prefix)
+    
+    def _sync_search_index(self) -> None:
+        """
+        Bring the shared index in line with the feeds' parsed entries.
+        
+        Runs only when a feed's own index changed since the last search, and
+        then only (re)indexes articles whose fingerprint changed. The first
+        feed listing a URL provides its text, as in ``merge_articles``.
+        """
+        versions = [(service.search_index, service.search_index.version) for service in self.services]
+        if len(versions) == len(self._index_versions) and all(
+            index is seen and version == seen_version
+            for (index, version), (seen, seen_version) in zip(versions, self._index_versions)
+        ):
+            return
+        
+        wanted: Dict[str, Tuple[str, ArticleRecord, str]] = {}
+        for service in self.services:
+            for fingerprint, article, text in service.parsed_entries.values():
+                wanted.setdefault(article.url, (fingerprint, article, text))
+        for url, (fingerprint, article, text) in wanted.items():
+            if self._indexed.get(url) != fingerprint:
+                self.search_index.add(url, article, text)
+                self._indexed[url] = fingerprint
+        for url in [url for url in self._indexed if url not in wanted]:
+            self.search_index.remove(url)
+            del self._indexed[url]
+        self._index_versions = versions
+
+def merge_articles(feeds: List[List[ArticleRecord]]) -> List[ArticleRecord]:
+    """
+    k-way merge of newest-first article lists, dropping repeated URLs.
+    
+    Each feed is already sorted, so a heap merge is O(n log k) instead of
+    concatenating and re-sorting everything.
+    """
+    merged = []
+    seen = set()
+    for article in heapq.merge(*feeds, key=lambda a: a.published_date, reverse=True):
+        url = article.url
+        if url not in seen:
+            seen.add(url)
+            merged.append(article)
+    return merged
+
+# Create aggregator instance
+feed_aggregator = FeedAggregator.from_config()
@@ -0,0 +1,57 @@
+import asyncio
+import logging
+import os
+from typing import Optional
+from services.article_store import ArticleStore
+
+logger = logging.getLogger(__name__)
+
+FEED_POLL_INTERVAL = float(os.getenv("FEED_POLL_INTERVAL", "300"))
+FEED_POLLER_ENABLED = os.getenv("FEED_POLLER_ENABLED", "true").lower() in ("1", "true", "yes")
+
+class FeedPoller:
+    """
+    Background task that refreshes the Medium feed and upserts it into MongoDB.
+    
+    ``service`` is anything with an async ``refresh_articles()``: a single
+    MediumService or the FeedAggregator.
+    """
+    
+    def __init__(self, service, store: ArticleStore, interval: float = FEED_POLL_INTERVAL):
+        self.service = service
+        self.store = store
+        self.interval = interval
+        self._task: Optional[asyncio.Task] = None
+    
+    async def poll_once(self) -> int:
+        """Run a single refresh + persist cycle. Returns the number of writes."""
+        articles = await self.service.refresh_articles()
+        if articles is None:
+            logger.warning("Feed poll skipped: Medium RSS feed unavailable")
+            return 0
+        written = await self.store.upsert_articles(articles)
+        logger.info(f"Feed poll stored {len(articles)} articles ({written} changed)")
+        return written
+    
+    async def _run(self) -> None:
+        while True:
+            try:
+                await self.poll_once()
+            except asyncio.CancelledError:
+                raise
+            except Exception as e:
+                logger.error(f"Feed poll failed: {str(e)}")
+            await asyncio.sleep(self.interval)
+    
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,74 @@
+import json
+import os
+import tempfile
+import time
+from typing import Dict, NamedTuple, Optional, Tuple
+from models.article import ArticleRecord, dump_json
+
+SNAPSHOT_FORMAT = "medium-feed-snapshot"
+SNAPSHOT_VERSION = 1
+
+class FeedSnapshot(NamedTuple):
+    entries: Dict[str, Tuple[str, ArticleRecord, str]]
+    etag: Optional[str]
+    last_modified: Optional[str]
+    saved_at: float
+
+def write_snapshot(path: str, rss_url: str, entries, etag: Optional[str], last_modified: Optional[str]) -> None:
+    """
+    Write a JSON-lines snapshot: one header line, then one line per entry.
+    
+    The file is written to a unique temp file next to its destination and
+    renamed into place, so readers never see a partial snapshot, even when
+    several workers save the same feed at once.
+    """
+    directory = os.path.dirname(path)
+    if directory:
+        os.makedirs(directory, exist_ok=True)
+    header = {
+        "format": SNAPSHOT_FORMAT,
+        "version": SNAPSHOT_VERSION,
+        "rss_url": rss_url,
+        "etag": etag,
+        "last_modified": last_modified,
+        "saved_at": time.time(),
+        "count": len(entries),
+    }
+    fd, tmp_path = tempfile.mkstemp(dir=directory or ".", prefix=os.path.basename(path) + ".", suffix=".tmp")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(dump_json(header) + b"\n")
+            for guid, (fingerprint, article, text) in entries.items():
+                record = {
+                    "guid": guid,
+                    "fingerprint": fingerprint,
+                    "text": text,
+                    "article": article.to_document(),
+                }
+                f.write(dump_json(record) + b"\n")
+        os.replace(tmp_path, path)
+    except BaseException:
+        os.unlink(tmp_path)
+        raise
+
+def read_snapshot(path: str, rss_url: str) -> Optional[FeedSnapshot]:
+    """Read a snapshot line by line; None if missing or written for another format/feed."""
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        header = json.loads(f.readline() or "{}")
+        if (
+            header.get("format") != SNAPSHOT_FORMAT
+            or header.get("version") != SNAPSHOT_VERSION
+            or header.get("rss_url") != rss_url
+        ):
+            return None
+        entries = {}
+        for line in f:
+            record = json.loads(line)
+            entries[record["guid"]] = (
+                record["fingerprint"],
+                ArticleRecord.from_document(record["article"]),
+                record["text"],
+            )
+    return FeedSnapshot(entries, header.get("etag"), header.get("last_modified"), header["saved_at"])
@@ -0,0 +1,98 @@
+import asyncio
+import logging
+import os
+import time
+from datetime import datetime
+from typing import Dict, Optional
+
+logger = logging.getLogger(__name__)
+
+READY_HEARTBEAT_INTERVAL = float(os.getenv("READY_HEARTBEAT_INTERVAL", "5"))
+READY_HEARTBEAT_TIMEOUT = float(os.getenv("READY_HEARTBEAT_TIMEOUT", "2"))
+# /ready reports not-ready once the last successful ping is older than this
+READY_MAX_STALENESS = float(os.getenv("READY_MAX_STALENESS", "15"))
+
+class MongoHeartbeat:
+    """Pings MongoDB on a schedule and keeps the result for readiness probes."""
+    
+    def __init__(
+        self,
+        db,
+        interval: float = READY_HEARTBEAT_INTERVAL,
+        timeout: float = READY_HEARTBEAT_TIMEOUT,
+        max_staleness: float = READY_MAX_STALENESS,
+    ):
+        self.db = db
+        self.interval = interval
+        self.timeout = timeout
+        self.max_staleness = max_staleness
+        self.latency_ms: Optional[float] = None
+        self.last_success: Optional[datetime] = None
+        self.last_error: Optional[str] = None
+        self.consecutive_failures = 0
+        self._last_success_monotonic: Optional[float] = None
+        self._task: Optional[asyncio.Task] = None
+    
+    async def beat(self) -> bool:
+        """Ping once and record the outcome."""
+        start = time.perf_counter()
+        try:
+            await asyncio.wait_for(self.db.command("ping"), self.timeout)
+        except Exception as e:
+            self.consecutive_failures += 1
+            self.last_error = str(e) or type(e).__name__
+            if self.consecutive_failures == 1:
+                logger.error(f"Mongo heartbeat failed: {self.last_error}")
+            return False
+        self.latency_ms = (time.perf_counter() - start) * 1000
+        self.last_success = datetime.utcnow()
+        self._last_success_monotonic = time.monotonic()
+        if self.consecutive_failures:
+            logger.info(f"Mongo heartbeat recovered after {self.consecutive_failures} failures")
+        self.consecutive_failures = 0
+        self.last_error = None
+        return True
+    
+    def age(self) -> Optional[float]:
+        """Seconds since the last successful ping (None if there was none)."""
+        if self._last_success_monotonic is None:
+            return None
+        return time.monotonic() - self._last_success_monotonic
+    
+    def is_ready(self) -> bool:
+        age = self.age()
+        return age is not None and age <= self.max_staleness
+    
+    def not_ready_reason(self) -> str:
+        if self.last_error:
+            return self.last_error
+        if self.last_success is None:
+            return "No successful ping yet"
+        return f"Last successful ping is older than {self.max_staleness:g}s"
+    
+    def snapshot(self) -> Dict:
+        age = self.age()
+        return {
+            "latency_ms": round(self.latency_ms, 3) if self.latency_ms is not None else None,
+            "last_success": self.last_success.isoformat() + "Z" if self.last_success else None,
+            "age_seconds": round(age, 3) if age is not None else None,
+            "consecutive_failures": self.consecutive_failures,
+        }
+    
+    async def _run(self) -> None:
+        while True:
+            await self.beat()
+            await asyncio.sleep(self.interval)
+    
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        if self._task is not None:
+            self._task.cancel()
+            try:
+                await self._task
+            except asyncio.CancelledError:
+                pass
+            self._task = None
@@ -0,0 +1,80 @@
+import re
+from html.parser import HTMLParser
+from typing import Tuple
+
+WORD_RE = re.compile(r"\w+")
+SKIPPED_TAGS = frozenset(("script", "style"))
+
+class HTMLWordCounter(HTMLParser):
+    """
+    Count words in HTML text nodes without building a DOM.
+    
+    Text nodes are stripped and treated as if concatenated, which is what
+    ``BeautifulSoup.get_text(strip=True)`` produces, and words are counted the
+    way ``readtime`` splits text (on runs of non-word characters). Only the
+    boundary characters of each node are kept between events, unless
+    ``collect_text`` asks for the stripped nodes to be kept as well.
+    """
+    
+    def __init__(self, collect_text: bool = False):
+        super().__init__(convert_charrefs=True)
+        self._texts = [] if collect_text else None
+        self.word_runs = 0
+        self.has_text = False
+        self._starts_with_word = False
+        self._ends_with_word = False
+        self._skip_depth = 0
+    
+    def handle_starttag(self, tag, attrs):
+        if tag in SKIPPED_TAGS:
+            self._skip_depth += 1
+    
+    def handle_endtag(self, tag):
+        if tag in SKIPPED_TAGS and self._skip_depth:
+            self._skip_depth -= 1
+    
+    def handle_data(self, data):
+        if self._skip_depth:
+            return
+        data = data.strip()
+        if not data:
+            return
+        if self._texts is not None:
+            self._texts.append(data)
+        
+        # subn counts matches in C without materialising the words
+        runs = WORD_RE.subn("", data)[1]
+        starts_with_word = WORD_RE.match(data) is not None
+        # A word split across two adjacent nodes joins into one
+        if self._ends_with_word and starts_with_word:
+            runs -= 1
+        if not self.has_text:
+            self.has_text = True
+            self._starts_with_word = starts_with_word
+        self.word_runs += runs
+        self._ends_with_word = WORD_RE.fullmatch(data[-1]) is not None
+    
+    @property
+    def word_count(self) -> int:
+        """Token count matching ``len(re.split(r'\\W+', text.strip()))``."""
+        if not self.has_text:
+            return 0
+        return self.word_runs + (not self._starts_with_word) + (not self._ends_with_word)
+    
+    def text(self, separator: str = " ") -> str:
+        """Collected text nodes joined like ``BeautifulSoup.get_text(separator, strip=True)``."""
+        return separator.join(self._texts or ())
+
+def count_html_words(html_content: str) -> int:
+    """Number of words in the visible text of ``html_content`` (0 if there is none)."""
+    counter = HTMLWordCounter()
+    counter.feed(html_content)
+    counter.close()
+    return counter.word_count
+
+def html_words_and_text(html_content: str, separator: str = " ") -> Tuple[int, str]:
+    """Word count and visible text of ``html_content`` from a single parse."""
+    counter = HTMLWordCounter(collect_text=True)
+    counter.feed(html_content)
+    counter.close()
+    return counter.word_count, counter.text(separator)
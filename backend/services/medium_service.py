@@ -1,76 +1,172 @@
 import asyncio
+import hashlib
+import math
+import os
+import time
 import httpx
-import feedparser
-import readtime
-from bs4 import BeautifulSoup
 from datetime import datetime
-from dateutil import parser as date_parser
-from typing import List, Optional
+from concurrent.futures import Executor
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
 import logging
-from models.article import MediumArticle
+from models.article import ArticleRecord
+from services.circuit_breaker import CircuitBreaker
+from services.feed_snapshot import read_snapshot, write_snapshot
+from services.metrics import MEDIUM_FETCH_DURATION, MEDIUM_PARSE_DURATION
+from services.html_text import count_html_words, html_words_and_text
+from services.search_index import SearchIndex
 
 logger = logging.getLogger(__name__)
 
+MEDIUM_CACHE_TTL = float(os.getenv("MEDIUM_CACHE_TTL", "300"))
+FEED_PARSE_BATCH_SIZE = int(os.getenv("FEED_PARSE_BATCH_SIZE", "8"))
+MEDIUM_BREAKER_FAILURES = int(os.getenv("MEDIUM_BREAKER_FAILURES", "5"))
+MEDIUM_BREAKER_COOLDOWN = float(os.getenv("MEDIUM_BREAKER_COOLDOWN", "60"))
+
+# Medium's reading speed (words per minute), as used by the readtime package
+READING_WPM = 265
+
+# Returned by fetch_rss_data when the upstream answers 304 Not Modified
+NOT_MODIFIED = object()
+
 class MediumService:
-    def __init__(self, medium_username: str = "adrian.c.pop"):
+    def __init__(
+        self,
+        medium_username: str = "adrian.c.pop",
+        cache_ttl: float = MEDIUM_CACHE_TTL,
+        rss_url: Optional[str] = None,
+        http_client: Optional[httpx.AsyncClient] = None,
+        executor: Optional[Executor] = None,
+    ):
         self.medium_username = medium_username
-        self.rss_url = f"https://medium.com/feed/@{self.medium_username}"
+        self.rss_url = rss_url or f"https://medium.com/feed/@{self.medium_username}"
         self.timeout = 30
+        self.cache_ttl = cache_ttl
+        # Shared pooled client injected at startup; falls back to a one-off client
+        self.http_client = http_client
+        # Executor for CPU-bound parsing; None uses the loop's default thread pool
+        self.executor = executor
+        self.parse_batch_size = FEED_PARSE_BATCH_SIZE
+        # Fails fast while the upstream is down; callers fall back to cached articles
+        self.breaker = CircuitBreaker(MEDIUM_BREAKER_FAILURES, MEDIUM_BREAKER_COOLDOWN)
+        # Local file the parsed feed is saved to after each change (None disables)
+        self.snapshot_path: Optional[str] = None
+        
+        # Parsed articles cache (stale-while-revalidate)
+        self._articles: Optional[List[ArticleRecord]] = None
+        self._fetched_at: float = 0.0
+        self._refresh_task: Optional[asyncio.Task] = None
+        
+        # Upstream validators for conditional GET
+        self._etag: Optional[str] = None
+        self._last_modified: Optional[str] = None
+        
+        # guid -> (content fingerprint, parsed article, body text) from the last parse
+        self._entry_cache: Dict[str, Tuple[str, ArticleRecord, str]] = {}
+        # Full-text index over the current feed, updated with the entry cache
+        self.search_index = SearchIndex()
+    
+    def __getstate__(self):
+        # Process-pool workers only need the parsing configuration, not
+        # clients, tasks or caches (which are not picklable anyway).
+        return {
+            "medium_username": self.medium_username,
+            "cache_ttl": self.cache_ttl,
+            "rss_url": self.rss_url,
+        }
+    
+    def __setstate__(self, state):
+        self.__init__(**state)
+    
+    async def fetch_rss_data(self, conditional: bool = False):
+        """
+        Fetch RSS data from Medium with proper error handling.
+        
+        With ``conditional=True`` the stored ETag/Last-Modified validators are
+        sent and ``NOT_MODIFIED`` is returned when the feed is unchanged.
+        The validators are not updated here (see ``fetch_feed``).
+        """
+        body, _, _ = await self.fetch_feed(conditional)
+        return body
     
-    async def fetch_rss_data(self) -> Optional[str]:
-        """Fetch RSS data from Medium with proper error handling."""
+    async def fetch_feed(self, conditional: bool = False) -> Tuple[object, Optional[str], Optional[str]]:
+        """
+        Return (body, etag, last_modified) for the feed.
+        
+        The response validators are only handed back: callers that parse the
+        body commit them, so an unparsed fetch (e.g. the health check) can
+        never make a later conditional GET skip a feed version.
+        """
+        if not self.breaker.allow_request():
+            logger.warning(f"Circuit open for {self.rss_url}, skipping fetch")
+            return None, None, None
+        
+        headers = {"User-Agent": "Portfolio Bot 1.0"}
+        if conditional:
+            if self._etag:
+                headers["If-None-Match"] = self._etag
+            if self._last_modified:
+                headers["If-Modified-Since"] = self._last_modified
+        
+        start = time.perf_counter()
+        outcome = "error"
         try:
-            async with httpx.AsyncClient(timeout=self.timeout) as client:
-                response = await client.get(
-                    self.rss_url,
-                    headers={"User-Agent": "Portfolio Bot 1.0"}
-                )
-                response.raise_for_status()
-                return response.text
+            if self.http_client is not None:
+                response = await self.http_client.get(self.rss_url, headers=headers, timeout=self.timeout)
+            else:
+                async with httpx.AsyncClient(timeout=self.timeout) as client:
+                    response = await client.get(self.rss_url, headers=headers)
+            if conditional and response.status_code == 304:
+                self.breaker.record_success()
+                outcome = "not_modified"
+                return NOT_MODIFIED, self._etag, self._last_modified
+            response.raise_for_status()
+            self.breaker.record_success()
+            outcome = "ok"
+            return response.text, response.headers.get("etag"), response.headers.get("last-modified")
         except httpx.TimeoutException:
             logger.error(f"Timeout occurred while fetching RSS from {self.rss_url}")
-            return None
+            self.breaker.record_failure("timeout")
+            outcome = "timeout"
+            return None, None, None
         except httpx.HTTPStatusError as e:
             logger.error(f"HTTP error occurred: {e.response.status_code}")
-            return None
+            self.breaker.record_failure(f"HTTP {e.response.status_code}")
+            outcome = "http_error"
+            return None, None, None
         except Exception as e:
             logger.error(f"Unexpected error occurred: {str(e)}")
-            return None
-    
-    def clean_html_content(self, html_content: str) -> str:
-        """Extract clean text from HTML content for reading time calculation."""
-        soup = BeautifulSoup(html_content, 'html.parser')
-        # Remove script and style elements
-        for script in soup(["script", "style"]):
-            script.decompose()
-        return soup.get_text(strip=True)
+            self.breaker.record_failure(str(e))
+            return None, None, None
+        finally:
+            MEDIUM_FETCH_DURATION.labels(self.medium_username, outcome).observe(time.perf_counter() - start)
     
     def calculate_reading_time(self, content: str) -> str:
         """Calculate reading time using Medium's algorithm with fallbacks."""
         try:
-            # Primary method using readtime package
-            clean_content = self.clean_html_content(content)
-            if clean_content.strip():
-                result = readtime.of_text(clean_content)
-                return result.text
+            # Single streaming pass over the HTML; no DOM or joined text is built
+            return self.reading_time_for_words(count_html_words(content))
         except Exception as e:
-            logger.warning(f"readtime calculation failed: {e}")
-        
-        try:
-            # Fallback: Manual calculation using Medium's algorithm
-            clean_content = self.clean_html_content(content)
-            word_count = len(clean_content.split())
-            # Medium uses ~265 WPM average
-            minutes = max(1, round(word_count / 265))
-            return f"{minutes} min read"
-        except Exception as e:
-            logger.warning(f"Manual reading time calculation failed: {e}")
+            logger.warning(f"Reading time calculation failed: {e}")
         
         # Ultimate fallback
         return "1 min read"
     
-    def parse_feed_entry(self, entry) -> Optional[MediumArticle]:
-        """Parse individual RSS feed entry into MediumArticle model."""
+    @staticmethod
+    def reading_time_for_words(word_count: int) -> str:
+        if word_count:
+            # Same rounding as readtime: whole seconds, then whole minutes
+            seconds = math.ceil(word_count / READING_WPM * 60)
+            return f"{max(1, math.ceil(seconds / 60))} min"
+        return "1 min read"
+    
+    def parse_feed_entry(self, entry, word_count: Optional[int] = None) -> Optional[ArticleRecord]:
+        """
+        Parse individual RSS feed entry into an ArticleRecord.
+        
+        ``word_count`` of the entry's HTML, when the caller already has it,
+        saves parsing the HTML again for the reading time.
+        """
         try:
             # Extract basic information
             title = getattr(entry, 'title', 'Untitled')
@@ -83,6 +179,7 @@ class MediumService:
                 published_date = datetime(*entry.published_parsed[:6])
             elif hasattr(entry, 'published'):
                 try:
+                    from dateutil import parser as date_parser
                     published_date = date_parser.parse(entry.published)
                 except:
                     pass
@@ -94,48 +191,278 @@ class MediumService:
             
             # Calculate reading time from content
             reading_time = "1 min read"  # Default fallback
-            if hasattr(entry, 'content') and entry.content:
+            if word_count is not None:
+                reading_time = self.reading_time_for_words(word_count)
+            elif hasattr(entry, 'content') and entry.content:
                 content = entry.content[0].value
                 reading_time = self.calculate_reading_time(content)
             elif description:
                 reading_time = self.calculate_reading_time(description)
             
-            return MediumArticle(
-                title=title,
-                description=description,
-                url=url,
-                published_date=published_date,
-                reading_time=reading_time,
-                tags=tags
-            )
+            # Cheap stand-in for MediumArticle's HttpUrl validation
+            parts = urlsplit(url)
+            if parts.scheme not in ("http", "https") or not parts.netloc:
+                raise ValueError(f"Invalid article URL: {url!r}")
+            
+            return ArticleRecord(title, url, published_date, description, reading_time, tuple(tags))
         
         except Exception as e:
             logger.error(f"Error parsing feed entry: {str(e)}")
             return None
     
-    async def get_articles(self) -> List[MediumArticle]:
-        """Fetch and parse all articles from Medium RSS feed."""
-        rss_data = await self.fetch_rss_data()
+    @staticmethod
+    def entry_fingerprint(entry) -> Tuple[str, str]:
+        """Return (guid, content hash) identifying an entry and its current revision."""
+        link = getattr(entry, 'link', '')
+        guid = getattr(entry, 'id', '') or link
+        digest = hashlib.sha256()
+        content = entry.content[0].value if getattr(entry, 'content', None) else ''
+        tags = [getattr(tag, 'term', '') for tag in getattr(entry, 'tags', [])]
+        for part in (
+            getattr(entry, 'title', ''),
+            getattr(entry, 'summary', ''),
+            link,
+            getattr(entry, 'published', ''),
+            # dict.get skips feedparser's deprecated updated->published fallback
+            dict.get(entry, 'updated', ''),
+            "\x1f".join(tags),
+            content,
+        ):
+            digest.update((part or '').encode('utf-8'))
+            digest.update(b"\x00")
+        return guid, digest.hexdigest()
+    
+    def analyze_entry_html(self, entry) -> Tuple[Optional[int], str]:
+        """
+        (word count, plain body text) of an entry's HTML in one streaming pass.
+        
+        The same HTML (content, else summary) feeds the reading time and the
+        search index; the word count is None if the HTML could not be read.
+        """
+        try:
+            if getattr(entry, 'content', None):
+                html = entry.content[0].value
+            else:
+                html = getattr(entry, 'summary', '') or ''
+            return html_words_and_text(html)
+        except Exception as e:
+            logger.warning(f"Could not extract entry text: {e}")
+            return None, ""
+    
+    def parse_feed_batch(self, entries) -> List[Tuple[Optional[ArticleRecord], str]]:
+        """Parse a batch of entries into (article, body text); runs inside the parse executor."""
+        results = []
+        for entry in entries:
+            word_count, text = self.analyze_entry_html(entry)
+            results.append((self.parse_feed_entry(entry, word_count), text))
+        return results
+    
+    async def run_in_executor(self, func, *args):
+        """Run CPU-bound work off the event loop."""
+        loop = asyncio.get_running_loop()
+        return await loop.run_in_executor(self.executor, func, *args)
+    
+    async def parse_entries(self, entries, fingerprints=None) -> List[ArticleRecord]:
+        """
+        Parse feed entries, reusing articles whose fingerprint is unchanged.
+        
+        Only new or edited entries go through ``parse_feed_entry``, in parallel
+        batches on the executor; the entry cache is replaced so it never
+        outgrows the current feed.
+        """
+        if fingerprints is None:
+            fingerprints = [self.entry_fingerprint(entry) for entry in entries]
+        
+        results: List[Optional[ArticleRecord]] = [None] * len(entries)
+        texts: Dict[int, str] = {}
+        pending = []
+        for index, (entry, (guid, fingerprint)) in enumerate(zip(entries, fingerprints)):
+            cached = self._entry_cache.get(guid)
+            if cached and cached[0] == fingerprint:
+                results[index] = cached[1]
+                texts[index] = cached[2]
+            else:
+                pending.append(index)
+        
+        size = max(1, self.parse_batch_size)
+        batches = [pending[i:i + size] for i in range(0, len(pending), size)]
+        parsed_batches = await asyncio.gather(*(
+            self.run_in_executor(self.parse_feed_batch, [entries[i] for i in batch])
+            for batch in batches
+        ))
+        reparsed = set()
+        for batch, parsed in zip(batches, parsed_batches):
+            for index, (article, text) in zip(batch, parsed):
+                results[index] = article
+                texts[index] = text
+                reparsed.add(index)
+        
+        entry_cache: Dict[str, Tuple[str, ArticleRecord, str]] = {}
+        articles = []
+        for index, ((guid, fingerprint), article) in enumerate(zip(fingerprints, results)):
+            if article:
+                articles.append(article)
+                entry_cache[guid] = (fingerprint, article, texts[index])
+                # Only new or edited entries are (re)indexed
+                if index in reparsed or guid not in self.search_index:
+                    self.search_index.add(guid, article, texts[index])
+        
+        self._entry_cache = entry_cache
+        self.search_index.retain(entry_cache)
+        logger.info(f"Parsed {len(pending)} new or changed feed entries, reused {len(entries) - len(pending)}")
+        return articles
+    
+    async def load_articles(self) -> Optional[List[ArticleRecord]]:
+        """Fetch and parse all articles from Medium RSS feed. Returns None on failure."""
+        # Only revalidate when there are parsed articles to fall back on
+        rss_data, etag, last_modified = await self.fetch_feed(conditional=self._articles is not None)
+        if rss_data is NOT_MODIFIED:
+            logger.info("Medium RSS feed not modified, reusing parsed articles")
+            return self._articles
         if not rss_data:
-            logger.warning("Failed to fetch RSS data, returning empty list")
-            return []
+            logger.warning("Failed to fetch RSS data")
+            return None
         
         try:
-            feed = feedparser.parse(rss_data)
-            articles = []
-            
-            for entry in feed.entries:
-                article = self.parse_feed_entry(entry)
-                if article:
-                    articles.append(article)
+            start = time.perf_counter()
+            entries, fingerprints = await self.run_in_executor(parse_feed, rss_data)
+            articles = await self.parse_entries(entries, fingerprints)
+            MEDIUM_PARSE_DURATION.labels(self.medium_username).observe(time.perf_counter() - start)
             
             # Sort articles by publication date (newest first)
             articles.sort(key=lambda x: x.published_date, reverse=True)
-            return articles
-        
         except Exception as e:
             logger.error(f"Error parsing RSS feed: {str(e)}")
-            return []
+            # Keep the validators of the articles still being served
+            return None
+        
+        # Only a parsed body may be revalidated against later
+        self._etag = etag
+        self._last_modified = last_modified
+        return articles
+    
+    async def refresh_articles(self) -> Optional[List[ArticleRecord]]:
+        """
+        Reload the feed and replace the cached articles on success.
+        
+        Concurrent callers share one in-flight refresh (single flight), so a
+        burst of requests causes a single upstream fetch and parse.
+        """
+        # Shield so a cancelled waiter does not cancel the shared refresh
+        return await asyncio.shield(self._start_refresh())
+    
+    def _start_refresh(self) -> asyncio.Task:
+        """Return the in-flight refresh task, starting one if none is running."""
+        if self._refresh_task is None or self._refresh_task.done():
+            self._refresh_task = asyncio.create_task(self._run_refresh())
+        return self._refresh_task
+    
+    async def _run_refresh(self) -> Optional[List[ArticleRecord]]:
+        try:
+            articles = await self.load_articles()
+        except Exception as e:
+            logger.error(f"Article refresh failed: {str(e)}")
+            return None
+        if articles is not None:
+            changed = articles is not self._articles
+            self._articles = articles
+            self._fetched_at = time.monotonic()
+            if changed and self.snapshot_path:
+                await self.save_snapshot()
+        return articles
+    
+    async def save_snapshot(self) -> None:
+        """Write the parsed feed to ``snapshot_path`` off the event loop."""
+        try:
+            await asyncio.to_thread(
+                write_snapshot,
+                self.snapshot_path,
+                self.rss_url,
+                dict(self._entry_cache),
+                self._etag,
+                self._last_modified,
+            )
+        except Exception as e:
+            logger.error(f"Could not write feed snapshot {self.snapshot_path}: {str(e)}")
+    
+    def load_snapshot(self) -> bool:
+        """
+        Restore parsed articles, entry cache, search index and validators
+        from ``snapshot_path``. The restored articles keep their real age, so
+        a stale snapshot is served at once while a background refresh runs.
+        """
+        if not self.snapshot_path:
+            return False
+        try:
+            snapshot = read_snapshot(self.snapshot_path, self.rss_url)
+        except Exception as e:
+            logger.error(f"Could not read feed snapshot {self.snapshot_path}: {str(e)}")
+            return False
+        if snapshot is None:
+            return False
+        
+        self._entry_cache = snapshot.entries
+        self.search_index = SearchIndex()
+        for guid, (_, article, text) in snapshot.entries.items():
+            self.search_index.add(guid, article, text)
+        self._articles = sorted(
+            (article for _, article, _ in snapshot.entries.values()),
+            key=lambda x: x.published_date,
+            reverse=True,
+        )
+        self._etag = snapshot.etag
+        self._last_modified = snapshot.last_modified
+        self._fetched_at = time.monotonic() - max(0.0, time.time() - snapshot.saved_at)
+        logger.info(f"Loaded {len(self._articles)} articles from snapshot {self.snapshot_path}")
+        return True
+    
+    @property
+    def cached_articles(self) -> Optional[List[ArticleRecord]]:
+        """Last successfully parsed articles, if any."""
+        return self._articles
+    
+    @property
+    def parsed_entries(self) -> Dict[str, Tuple[str, ArticleRecord, str]]:
+        """guid -> (content fingerprint, article, body text) for the current feed."""
+        return self._entry_cache
+    
+    def is_cache_fresh(self) -> bool:
+        return self._articles is not None and time.monotonic() - self._fetched_at < self.cache_ttl
+    
+    def _schedule_refresh(self) -> None:
+        """Start a single background refresh unless one is already running."""
+        self._start_refresh()
+    
+    def invalidate_cache(self) -> None:
+        """Drop cached articles so the next call refetches the feed."""
+        self._articles = None
+        self._fetched_at = 0.0
+    
+    async def get_articles(self) -> List[ArticleRecord]:
+        """
+        Return cached articles, refreshing from Medium when the TTL expires.
+        
+        Stale articles keep being served while one background refresh runs,
+        so only the very first call waits on the upstream feed.
+        """
+        if self._articles is None:
+            articles = await self.refresh_articles()
+            if articles is None:
+                logger.warning("Failed to fetch RSS data, returning empty list")
+                return []
+            return articles
+        
+        if not self.is_cache_fresh():
+            self._schedule_refresh()
+        return self._articles
+
+def parse_feed(rss_data: str):
+    """Parse an RSS document and fingerprint its entries (executor-side)."""
+    # Loaded on first parse so server start does not pay for it
+    import feedparser
+    
+    entries = feedparser.parse(rss_data).entries
+    return entries, [MediumService.entry_fingerprint(entry) for entry in entries]
 
 # Create service instance
 medium_service = MediumService()
\ No newline at end of file
@@ -0,0 +1,139 @@
+import time
+from typing import Dict, Optional
+from prometheus_client import CollectorRegistry, Counter, Histogram
+from pymongo import monitoring
+
+# Seconds; covers sub-millisecond Mongo commands up to slow upstream fetches
+DEFAULT_BUCKETS = (0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0, 30.0)
+
+# Application metrics only; /metrics renders it with prometheus_client.generate_latest
+registry = CollectorRegistry()
+
+HTTP_REQUEST_DURATION = Histogram(
+    "http_request_duration_seconds",
+    "HTTP request duration by route template",
+    ("method", "route"),
+    buckets=DEFAULT_BUCKETS,
+    registry=registry,
+)
+HTTP_REQUESTS = Counter(
+    "http_requests_total",
+    "HTTP responses by route template and status code",
+    ("method", "route", "status"),
+    registry=registry,
+)
+MEDIUM_FETCH_DURATION = Histogram(
+    "medium_fetch_duration_seconds",
+    "Medium RSS fetch duration by feed and outcome",
+    ("feed", "outcome"),
+    buckets=DEFAULT_BUCKETS,
+    registry=registry,
+)
+MEDIUM_PARSE_DURATION = Histogram(
+    "medium_parse_duration_seconds",
+    "Medium RSS parse duration (feedparser and entry parsing) by feed",
+    ("feed",),
+    buckets=DEFAULT_BUCKETS,
+    registry=registry,
+)
+RESEND_REQUEST_DURATION = Histogram(
+    "resend_request_duration_seconds",
+    "Resend API call duration by endpoint and outcome",
+    ("endpoint", "outcome"),
+    buckets=DEFAULT_BUCKETS,
+    registry=registry,
+)
+MONGO_COMMAND_DURATION = Histogram(
+    "mongodb_command_duration_seconds",
+    "MongoDB command duration by command name and outcome",
+    ("command", "outcome"),
+    buckets=DEFAULT_BUCKETS,
+    registry=registry,
+)
+WRITE_BEHIND_FLUSH_DURATION = Histogram(
+    "write_behind_flush_duration_seconds",
+    "Write-behind buffer insert_many duration by collection and outcome",
+    ("collection", "outcome"),
+    buckets=DEFAULT_BUCKETS,
+    registry=registry,
+)
+WRITE_BEHIND_BATCH_SIZE = Histogram(
+    "write_behind_batch_size",
+    "Documents per write-behind flush by collection",
+    ("collection",),
+    buckets=(1, 2, 5, 10, 25, 50, 100, 250, 500, 1000, 5000),
+    registry=registry,
+)
+
+class MongoCommandMetrics(monitoring.CommandListener):
+    """
+    pymongo command listener feeding ``MONGO_COMMAND_DURATION``.
+    
+    Durations come from the driver's own ``duration_micros``, so nothing is
+    tracked between the started and finished events.
+    """
+    
+    def __init__(self, histogram: Histogram = MONGO_COMMAND_DURATION):
+        self.histogram = histogram
+    
+    def started(self, event) -> None:
+        pass
+    
+    def succeeded(self, event) -> None:
+        self.histogram.labels(event.command_name, "success").observe(event.duration_micros / 1e6)
+    
+    def failed(self, event) -> None:
+        self.histogram.labels(event.command_name, "failure").observe(event.duration_micros / 1e6)
+
+class MetricsMiddleware:
+    """
+    ASGI middleware timing every HTTP request.
+    
+    Requests are labelled with the matched route template (``/api/articles/{id}``
+    style) rather than the raw path, so label cardinality stays bounded;
+    unmatched paths share the ``unmatched`` label.
+    """
+    
+    def __init__(self, app, duration: Histogram = HTTP_REQUEST_DURATION, requests: Counter = HTTP_REQUESTS):
+        self.app = app
+        self.duration = duration
+        self.requests = requests
+        self._route_paths: Dict[object, str] = {}
+        self._route_count: Optional[int] = None
+    
+    def _route_label(self, scope) -> str:
+        endpoint = scope.get("endpoint")
+        app = scope.get("app")
+        if endpoint is None or app is None:
+            return "unmatched"
+        routes = app.routes
+        if self._route_count != len(routes):
+            # Built once (and again only if routes are added later)
+            self._route_paths = {
+                route.endpoint: route.path for route in routes if hasattr(route, "endpoint")
+            }
+            self._route_count = len(routes)
+        return self._route_paths.get(endpoint, "unmatched")
+    
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+        
+        status = 500
+        
+        async def send_wrapper(message):
+            nonlocal status
+            if message["type"] == "http.response.start":
+                status = message["status"]
+            await send(message)
+        
+        start = time.perf_counter()
+        try:
+            await self.app(scope, receive, send_wrapper)
+        finally:
+            elapsed = time.perf_counter() - start
+            method = scope["method"]
+            route = self._route_label(scope)
+            self.duration.labels(method, route).observe(elapsed)
+            self.requests.labels(method, route, str(status)).inc()
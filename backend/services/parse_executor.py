@@ -0,0 +1,14 @@
+import os
+from concurrent.futures import Executor, ProcessPoolExecutor, ThreadPoolExecutor
+
+# Where CPU-bound feed parsing runs: "thread" or "process"
+FEED_PARSE_EXECUTOR = os.getenv("FEED_PARSE_EXECUTOR", "thread").lower()
+FEED_PARSE_WORKERS = int(os.getenv("FEED_PARSE_WORKERS", str(min(4, os.cpu_count() or 1))))
+
+def create_parse_executor(kind: str = FEED_PARSE_EXECUTOR, workers: int = FEED_PARSE_WORKERS) -> Executor:
+    """Build the executor used for feed parsing. Caller owns shutting it down."""
+    if kind == "process":
+        return ProcessPoolExecutor(max_workers=workers)
+    if kind == "thread":
+        return ThreadPoolExecutor(max_workers=workers, thread_name_prefix="feed-parse")
+    raise ValueError(f"Unknown FEED_PARSE_EXECUTOR: {kind}")
@@ -0,0 +1,159 @@
+import ipaddress
+import math
+import os
+import time
+from collections import OrderedDict
+from typing import List, Optional, Sequence, Union
+from pymongo import ReturnDocument
+
+# Contact form: CONTACT_RATE_LIMIT requests per CONTACT_RATE_PERIOD seconds per client
+CONTACT_RATE_LIMIT = int(os.getenv("CONTACT_RATE_LIMIT", "5"))
+CONTACT_RATE_PERIOD = float(os.getenv("CONTACT_RATE_PERIOD", "3600"))
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory").lower()
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "10000"))
+# Peers allowed to set X-Forwarded-For (nginx containers live on private networks)
+TRUSTED_PROXIES = os.getenv("TRUSTED_PROXIES", "127.0.0.0/8,::1,10.0.0.0/8,172.16.0.0/12,192.168.0.0/16")
+
+RATE_LIMIT_COLLECTION = "rate_limits"
+
+Network = Union[ipaddress.IPv4Network, ipaddress.IPv6Network]
+
+def parse_networks(spec: str) -> List[Network]:
+    return [ipaddress.ip_network(part.strip(), strict=False) for part in spec.split(",") if part.strip()]
+
+def is_trusted(address: str, trusted: Sequence[Network]) -> bool:
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return False
+    return any(ip in network for network in trusted)
+
+def client_ip(peer: Optional[str], forwarded_for: Optional[str], trusted: Sequence[Network]) -> str:
+    """
+    Resolve the originating client address.
+    
+    X-Forwarded-For is only honoured when the direct peer is a trusted
+    proxy; it is walked right to left and the first untrusted hop wins, so a
+    client cannot spoof its address by sending the header itself.
+    """
+    address = peer or "unknown"
+    if not forwarded_for or not is_trusted(address, trusted):
+        return address
+    for hop in reversed([part.strip() for part in forwarded_for.split(",") if part.strip()]):
+        address = hop
+        if not is_trusted(hop, trusted):
+            break
+    return address
+
+def rate_limit_key(address: str) -> str:
+    """
+    Limiter key for a client address.
+    
+    IPv6 clients are keyed by their /64: one end site usually gets at least
+    a /64, so rotating addresses inside it must not mint fresh buckets.
+    """
+    try:
+        ip = ipaddress.ip_address(address)
+    except ValueError:
+        return address
+    if ip.version == 6:
+        if ip.ipv4_mapped is not None:
+            return str(ip.ipv4_mapped)
+        return str(ipaddress.ip_network(f"{ip}/64", strict=False))
+    return str(ip)
+
+class TokenBucketLimiter:
+    """
+    In-process token buckets, one per key.
+    
+    Buckets live in an LRU map capped at ``max_keys``; the least recently
+    used one is evicted in O(1). Evicting a bucket that is still partly
+    drained resets it, so a flood of distinct keys can hand an evicted client
+    a fresh quota; size ``max_keys`` well above the expected active clients
+    (keys are per IPv4 address or IPv6 /64, see ``rate_limit_key``).
+    """
+    
+    def __init__(self, rate: int = CONTACT_RATE_LIMIT, period: float = CONTACT_RATE_PERIOD, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.capacity = float(rate)
+        self.refill_per_second = rate / period
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, List[float]]" = OrderedDict()
+    
+    def __len__(self) -> int:
+        return len(self._buckets)
+    
+    async def hit(self, key: str) -> float:
+        """Consume one token. Returns 0 if allowed, else seconds until a token is available."""
+        now = time.monotonic()
+        bucket = self._buckets.get(key)
+        if bucket is None:
+            bucket = [self.capacity, now]
+            self._buckets[key] = bucket
+            if len(self._buckets) > self.max_keys:
+                self._buckets.popitem(last=False)
+        else:
+            self._buckets.move_to_end(key)
+            tokens, last = bucket
+            bucket[0] = min(self.capacity, tokens + (now - last) * self.refill_per_second)
+            bucket[1] = now
+        
+        if bucket[0] >= 1:
+            bucket[0] -= 1
+            return 0.0
+        return (1 - bucket[0]) / self.refill_per_second
+
+class MongoRateLimiter:
+    """
+    Token buckets in MongoDB, shared by every uvicorn worker.
+    
+    Same refill rule as ``TokenBucketLimiter`` (no 2x burst across a window
+    boundary as with fixed windows). Each request is one atomic upsert with
+    a pipeline update that refills, then takes a token if there is one; a TTL
+    index drops a bucket once it would be full again.
+    """
+    
+    def __init__(self, db, rate: int = CONTACT_RATE_LIMIT, period: float = CONTACT_RATE_PERIOD):
+        self.collection = db[RATE_LIMIT_COLLECTION]
+        self.rate = rate
+        self.period = period
+    
+    async def ensure_indexes(self) -> None:
+        await self.collection.create_index("expires_at", expireAfterSeconds=0)
+    
+    async def hit(self, key: str) -> float:
+        """Consume one token. Returns 0 if allowed, else seconds until a token is available."""
+        now = time.time()
+        capacity = float(self.rate)
+        refill = self.rate / self.period
+        elapsed = {"$max": [0, {"$subtract": [now, {"$ifNull": ["$updated", now]}]}]}
+        pipeline = [
+            {"$set": {
+                "tokens": {"$min": [capacity, {"$add": [{"$ifNull": ["$tokens", capacity]}, {"$multiply": [elapsed, refill]}]}]},
+                "updated": now,
+            }},
+            {"$set": {"allowed": {"$gte": ["$tokens", 1]}}},
+            {"$set": {"tokens": {"$cond": ["$allowed", {"$subtract": ["$tokens", 1]}, "$tokens"]}}},
+            # Full again (and safe to forget) after (capacity - tokens) / refill seconds
+            {"$set": {"expires_at": {"$toDate": {"$multiply": [
+                {"$add": [now, {"$divide": [{"$subtract": [capacity, "$tokens"]}, refill]}]}, 1000,
+            ]}}}},
+        ]
+        doc = await self.collection.find_one_and_update(
+            {"_id": key}, pipeline, upsert=True, return_document=ReturnDocument.AFTER,
+        )
+        if doc["allowed"]:
+            return 0.0
+        return (1 - doc["tokens"]) / refill
+
+def create_rate_limiter(db=None, backend: str = RATE_LIMIT_BACKEND):
+    """Contact form limiter for the configured backend."""
+    if backend == "mongo":
+        if db is None:
+            raise ValueError("RATE_LIMIT_BACKEND=mongo needs a database")
+        return MongoRateLimiter(db)
+    if backend == "memory":
+        return TokenBucketLimiter()
+    raise ValueError(f"Unknown RATE_LIMIT_BACKEND: {backend}")
+
+def retry_after_header(seconds: float) -> str:
+    return str(max(1, math.ceil(seconds)))
@@ -0,0 +1,116 @@
+import asyncio
+import gzip
+import hashlib
+import logging
+import os
+from datetime import datetime
+from typing import Dict, Optional, Tuple
+
+from models.article import dump_json
+
+try:
+    import brotli
+except ImportError:  # optional: only gzip variants are served without it
+    brotli = None
+
+logger = logging.getLogger(__name__)
+
+ARTICLES_CACHE_MAX_AGE = int(os.getenv("ARTICLES_CACHE_MAX_AGE", "60"))
+ARTICLES_CACHE_CONTROL = os.getenv(
+    "ARTICLES_CACHE_CONTROL",
+    f"public, max-age={ARTICLES_CACHE_MAX_AGE}, stale-while-revalidate={ARTICLES_CACHE_MAX_AGE * 5}",
+)
+
+class SerializedResponse:
+    """JSON body of one feed version plus its compressed variants and ETag."""
+    
+    __slots__ = ("version", "etag", "bodies")
+    
+    def __init__(self, version: int, body: bytes):
+        self.version = version
+        digest = hashlib.sha256(body).hexdigest()[:32]
+        self.etag = f'"{digest}"'
+        # encoding -> (bytes, representation ETag); each variant needs its own strong tag
+        self.bodies: Dict[str, Tuple[bytes, str]] = {"identity": (body, self.etag)}
+        self.bodies["gzip"] = (gzip.compress(body, compresslevel=9, mtime=0), f'"{digest}-gzip"')
+        if brotli is not None:
+            self.bodies["br"] = (brotli.compress(body, quality=11), f'"{digest}-br"')
+    
+    def select(self, accept_encoding: Optional[str]) -> Tuple[str, bytes, str]:
+        """Pick the best encoding the client accepts: (encoding, body, etag)."""
+        encoding = negotiate_encoding(accept_encoding, self.bodies)
+        body, etag = self.bodies[encoding]
+        return encoding, body, etag
+    
+    def matches(self, if_none_match: Optional[str]) -> bool:
+        """Weak comparison of If-None-Match against any variant of this version."""
+        if not if_none_match:
+            return False
+        if if_none_match.strip() == "*":
+            return True
+        tags = {etag for _, etag in self.bodies.values()}
+        for candidate in if_none_match.split(","):
+            candidate = candidate.strip()
+            if candidate.startswith("W/"):
+                candidate = candidate[2:]
+            if candidate in tags:
+                return True
+        return False
+
+def negotiate_encoding(accept_encoding: Optional[str], available) -> str:
+    """Choose br > gzip > identity among ``available`` per the Accept-Encoding header."""
+    if not accept_encoding:
+        return "identity"
+    accepted = {}
+    for part in accept_encoding.split(","):
+        name, _, params = part.strip().partition(";")
+        quality = 1.0
+        params = params.strip()
+        if params.startswith("q="):
+            try:
+                quality = float(params[2:])
+            except ValueError:
+                quality = 0.0
+        accepted[name.strip().lower()] = quality
+    for encoding in ("br", "gzip"):
+        quality = accepted.get(encoding, accepted.get("*", 0.0))
+        if encoding in available and quality > 0:
+            return encoding
+    return "identity"
+
+class ArticlesResponseCache:
+    """
+    Serialized ``ArticlesResponse`` for the current feed version.
+    
+    Each request costs one lookup of the feed version; the article list is
+    only read, serialized and compressed again when that version changes.
+    """
+    
+    def __init__(self, store):
+        self.store = store
+        self._current: Optional[SerializedResponse] = None
+        self._lock = asyncio.Lock()
+    
+    async def get(self) -> SerializedResponse:
+        version, updated_at = await self.store.get_version()
+        current = self._current
+        if current is not None and current.version == version:
+            return current
+        async with self._lock:
+            # Another request may have rebuilt it while we waited
+            if self._current is not None and self._current.version == version:
+                return self._current
+            self._current = await self._build(version, updated_at)
+            return self._current
+    
+    async def _build(self, version: int, updated_at: Optional[datetime]) -> SerializedResponse:
+        articles = await self.store.list_articles()
+        # Same shape as ArticlesResponse, dumped from records without building models
+        body = dump_json({
+            "articles": [article.to_document() for article in articles],
+            "total_count": len(articles),
+            "last_updated": updated_at or datetime.now(),
+            "source": "Medium RSS Feed",
+        })
+        logger.info(f"Serialized {len(articles)} articles for feed version {version}")
+        return SerializedResponse(version, body)
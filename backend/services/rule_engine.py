@@ -0,0 +1,287 @@
+import hashlib
+import math
+import operator
+import os
+import re
+from collections import OrderedDict
+from typing import Any, Callable, Dict, List, NamedTuple, Optional, Sequence, Tuple
+
+from pydantic_core import to_json
+
+# Compiled rule sets kept in memory, keyed by the hash of their content
+RULESET_CACHE_SIZE = int(os.getenv("RULESET_CACHE_SIZE", "128"))
+
+class _Undefined:
+    """JavaScript ``undefined``: a missing path segment or rule value (``None`` is ``null``)."""
+    
+    __slots__ = ()
+    
+    def __repr__(self) -> str:
+        return "undefined"
+
+UNDEFINED = _Undefined()
+
+# The edge function's semantics are JavaScript's; these helpers reproduce the
+# coercions its operators rely on for JSON values.
+
+def js_string(value: Any) -> str:
+    """``String(value)`` for JSON values."""
+    if value is UNDEFINED:
+        return "undefined"
+    if value is None:
+        return "null"
+    if value is True:
+        return "true"
+    if value is False:
+        return "false"
+    if isinstance(value, float):
+        if math.isnan(value):
+            return "NaN"
+        if math.isinf(value):
+            return "Infinity" if value > 0 else "-Infinity"
+        if value.is_integer() and abs(value) < 1e21:
+            return str(int(value))
+        return repr(value)
+    if isinstance(value, list):
+        return ",".join("" if item is None or item is UNDEFINED else js_string(item) for item in value)
+    if isinstance(value, dict):
+        return "[object Object]"
+    return str(value)
+
+def js_number(value: Any) -> float:
+    """``Number(value)`` for JSON values (NaN when not numeric)."""
+    if value is None:
+        return 0.0
+    if isinstance(value, bool):
+        return 1.0 if value else 0.0
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        text = value.strip()
+        if not text:
+            return 0.0
+        try:
+            return float(int(text, 16)) if text.lower().startswith("0x") else float(text)
+        except ValueError:
+            return math.nan
+    if isinstance(value, list):
+        return js_number(js_string(value))
+    return math.nan
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, (int, float)) and not isinstance(value, bool)
+
+def loose_equals(a: Any, b: Any) -> bool:
+    """JavaScript ``==`` for JSON values."""
+    a_nullish = a is None or a is UNDEFINED
+    b_nullish = b is None or b is UNDEFINED
+    if a_nullish or b_nullish:
+        return a_nullish and b_nullish
+    if isinstance(a, (dict, list)) or isinstance(b, (dict, list)):
+        if isinstance(a, (dict, list)) and isinstance(b, (dict, list)):
+            return a is b
+        # Objects compare through their primitive (string) value
+        primitive = js_string(a) if isinstance(a, (dict, list)) else a
+        other = js_string(b) if isinstance(b, (dict, list)) else b
+        return loose_equals(primitive, other)
+    if isinstance(a, str) and isinstance(b, str):
+        return a == b
+    return js_number(a) == js_number(b)
+
+def strict_equals(a: Any, b: Any) -> bool:
+    """JavaScript ``===`` for JSON values."""
+    if _is_number(a) and _is_number(b):
+        return a == b
+    if type(a) is not type(b):
+        return False
+    if isinstance(a, (dict, list)):
+        return a is b
+    return a == b
+
+def _relational(op: Callable[[Any, Any], bool]) -> Callable[[Any, Any], bool]:
+    """JavaScript ``<``/``>``/``<=``/``>=``: strings compare as strings, anything else as numbers."""
+    def compare(a: Any, b: Any) -> bool:
+        if isinstance(a, (dict, list)):
+            a = js_string(a)
+        if isinstance(b, (dict, list)):
+            b = js_string(b)
+        if isinstance(a, str) and isinstance(b, str):
+            return op(a, b)
+        x, y = js_number(a), js_number(b)
+        if math.isnan(x) or math.isnan(y):
+            return False
+        return op(x, y)
+    return compare
+
+RELATIONAL_OPERATORS = {
+    ">": operator.gt,
+    "greaterThan": operator.gt,
+    "<": operator.lt,
+    "lessThan": operator.lt,
+    ">=": operator.ge,
+    "<=": operator.le,
+}
+
+def compile_path(path: str) -> Callable[[Any], Any]:
+    """
+    Accessor for a dotted path, split once.
+    
+    Matches the edge function's ``resolvePath``: only objects and arrays
+    (empty ones included) are descended into, anything else resolves to
+    ``UNDEFINED``. Arrays take canonical indexes and ``length``; strings are
+    not objects there, so ``"abc".length`` is undefined too.
+    """
+    parts = tuple(path.split("."))
+    
+    def resolve(obj: Any) -> Any:
+        value = obj
+        for part in parts:
+            if isinstance(value, dict):
+                value = value.get(part, UNDEFINED)
+            elif isinstance(value, list):
+                if part == "length":
+                    value = len(value)
+                elif part.isdigit() and str(int(part)) == part and int(part) < len(value):
+                    value = value[int(part)]
+                else:
+                    value = UNDEFINED
+            else:
+                return UNDEFINED
+        return value
+    
+    if len(parts) == 1:
+        key = parts[0]
+        # Single segment: one dict lookup, no loop
+        return lambda obj: obj.get(key, UNDEFINED) if isinstance(obj, dict) else UNDEFINED
+    return resolve
+
+def compile_operator(name: str, expected: Any) -> Callable[[Any], bool]:
+    """Predicate on the resolved value, with everything derived from ``expected`` precomputed."""
+    if name in RELATIONAL_OPERATORS:
+        op = RELATIONAL_OPERATORS[name]
+        compare = _relational(op)
+        if _is_number(expected):
+            # Common case (amount > 0): plain numbers skip the coercion helpers
+            return lambda actual: op(actual, expected) if type(actual) in (int, float) else compare(actual, expected)
+        return lambda actual: compare(actual, expected)
+    if name in ("==", "equals"):
+        return lambda actual: loose_equals(actual, expected)
+    if name == "===":
+        return lambda actual: strict_equals(actual, expected)
+    if name == "!=":
+        return lambda actual: not loose_equals(actual, expected)
+    if name == "!==":
+        return lambda actual: not strict_equals(actual, expected)
+    if name == "notEmpty":
+        return lambda actual: actual is not None and actual is not UNDEFINED and js_string(actual).strip() != ""
+    if name == "contains":
+        needle = js_string(expected)
+        return lambda actual: needle in js_string("" if actual is None or actual is UNDEFINED else actual)
+    if name == "matches":
+        # Python ``re``, not JavaScript ``RegExp``: ``(?<name>...)`` groups do
+        # not compile (the rule fails) and ``\d``/``\w`` also match non-ASCII
+        # digits and letters. Backtracking is unbounded, see services.rule_runner.
+        try:
+            pattern = re.compile(js_string(expected))
+        except re.error:
+            # An invalid pattern fails the rule, as the edge function's try/catch does
+            return lambda actual: False
+        return lambda actual: pattern.search(js_string("" if actual is None or actual is UNDEFINED else actual)) is not None
+    # Unknown operators never pass
+    return lambda actual: False
+
+class CompiledRule(NamedTuple):
+    resolve: Callable[[Any], Any]
+    check: Callable[[Any], bool]
+    message: str
+    is_warning: bool
+
+class CompiledRuleSet:
+    """A rule set compiled once into accessors, predicates and failure messages."""
+    
+    __slots__ = ("digest", "rules", "has_patterns")
+    
+    def __init__(self, digest: str, rules: Sequence[CompiledRule], has_patterns: bool = False):
+        self.digest = digest
+        self.rules = tuple(rules)
+        # Regexes come from the request and may backtrack without bound
+        self.has_patterns = has_patterns
+    
+    def __len__(self) -> int:
+        return len(self.rules)
+    
+    def validate(self, invoice: Dict[str, Any]) -> Dict[str, Any]:
+        """Evaluate every rule; same result shape as the ``validate-rules`` edge function."""
+        errors: List[str] = []
+        warnings: List[str] = []
+        rule_log = []
+        for number, rule in enumerate(self.rules, 1):
+            passed = rule.check(rule.resolve(invoice))
+            rule_log.append({"rule": number, "passed": passed})
+            if not passed:
+                (warnings if rule.is_warning else errors).append(rule.message)
+        return {"isValid": not errors, "errors": errors, "warnings": warnings, "ruleLog": rule_log}
+
+def rule_set_digest(rules: Sequence[Dict[str, Any]]) -> str:
+    """
+    Content hash of a rule set; key order inside each rule does not matter.
+    
+    Only the keys the compiler reads are hashed, as fixed-position rows, so
+    no key sorting is needed. The hash runs on every request and costs about
+    as much as evaluating the rules, so keep it cheap.
+    """
+    rows = [
+        (rule.get("field"), rule.get("operator"), "value" in rule, rule.get("value"), rule.get("action"))
+        for rule in rules
+    ]
+    return hashlib.sha256(to_json(rows, fallback=str)).hexdigest()
+
+def compile_rule_set(rules: Sequence[Dict[str, Any]], digest: Optional[str] = None) -> CompiledRuleSet:
+    """Compile raw rules (``field``, ``operator``, optional ``value`` and ``action``)."""
+    compiled = []
+    for rule in rules:
+        field = rule["field"]
+        op_name = rule["operator"]
+        # An omitted value is undefined, not null (it shows up in messages)
+        expected = rule.get("value", UNDEFINED)
+        compiled.append(CompiledRule(
+            resolve=compile_path(field),
+            check=compile_operator(op_name, expected),
+            message=f"Rule failed: {field} {op_name} {js_string(expected)}",
+            is_warning=rule.get("action") == "warning",
+        ))
+    has_patterns = any(rule["operator"] == "matches" for rule in rules)
+    return CompiledRuleSet(digest or rule_set_digest(rules), compiled, has_patterns)
+
+class RuleSetCache:
+    """LRU of compiled rule sets keyed by content hash."""
+    
+    def __init__(self, max_size: int = RULESET_CACHE_SIZE):
+        self.max_size = max_size
+        self._sets: "OrderedDict[str, CompiledRuleSet]" = OrderedDict()
+        self.hits = 0
+        self.misses = 0
+    
+    def __len__(self) -> int:
+        return len(self._sets)
+    
+    def get(self, rules: Sequence[Dict[str, Any]]) -> Tuple[CompiledRuleSet, bool]:
+        """Return (compiled rule set, cache hit)."""
+        digest = rule_set_digest(rules)
+        compiled = self._sets.get(digest)
+        if compiled is not None:
+            self._sets.move_to_end(digest)
+            self.hits += 1
+            return compiled, True
+        self.misses += 1
+        compiled = compile_rule_set(rules, digest)
+        self._sets[digest] = compiled
+        if len(self._sets) > self.max_size:
+            self._sets.popitem(last=False)
+        return compiled, False
+    
+    def stats(self) -> Dict[str, int]:
+        return {"size": len(self._sets), "max_size": self.max_size, "hits": self.hits, "misses": self.misses}
+
+# Shared by the invoice routes
+rule_set_cache = RuleSetCache()
@@ -0,0 +1,90 @@
+import asyncio
+import logging
+import multiprocessing
+import os
+from typing import Any, Dict, Optional, Sequence, Set
+
+from services.rule_engine import CompiledRuleSet, rule_set_cache
+
+logger = logging.getLogger(__name__)
+
+# Hard budget (seconds) for one rule set that uses `matches`
+RULE_EVAL_TIMEOUT = float(os.getenv("RULE_EVAL_TIMEOUT", "2"))
+RULE_EVAL_WORKERS = int(os.getenv("RULE_EVAL_WORKERS", "2"))
+
+class RuleEvaluationError(Exception):
+    """A rule set could not be evaluated within its budget."""
+
+def evaluate_rules(rules: Sequence[Dict[str, Any]], invoice: Dict[str, Any]) -> Dict[str, Any]:
+    """Worker side: compile (cached per worker) and evaluate."""
+    compiled, _ = rule_set_cache.get(rules)
+    return compiled.validate(invoice)
+
+class RuleRunner:
+    """
+    Evaluates rule sets without letting a request's regex stall the server.
+    
+    Patterns come from the request and Python's ``re`` backtracks: a pattern
+    like ``^(a+)+$`` takes exponential time and holds the GIL while it runs,
+    so a thread pool does not help. Rule sets with ``matches`` rules run in
+    worker processes instead; one that overruns ``timeout`` gets the pool
+    terminated (and respawned on next use). Rule sets without patterns are
+    linear in the invoice and run inline.
+    """
+    
+    def __init__(self, timeout: float = RULE_EVAL_TIMEOUT, workers: int = RULE_EVAL_WORKERS):
+        self.timeout = timeout
+        self.workers = workers
+        self._pool = None
+        self._pending: Set[asyncio.Future] = set()
+    
+    def _get_pool(self):
+        if self._pool is None:
+            # spawn: forking a process that runs Motor/httpx threads is unsafe
+            self._pool = multiprocessing.get_context("spawn").Pool(self.workers)
+        return self._pool
+    
+    async def validate(self, compiled: CompiledRuleSet, rules: Sequence[Dict[str, Any]], invoice: Dict[str, Any]) -> Dict[str, Any]:
+        if not compiled.has_patterns:
+            return compiled.validate(invoice)
+        
+        loop = asyncio.get_running_loop()
+        future = loop.create_future()
+        
+        def settle(result=None, error=None):
+            if not future.done():
+                future.set_exception(error) if error is not None else future.set_result(result)
+        
+        self._get_pool().apply_async(
+            evaluate_rules,
+            (list(rules), invoice),
+            callback=lambda result: loop.call_soon_threadsafe(settle, result),
+            error_callback=lambda error: loop.call_soon_threadsafe(settle, None, error),
+        )
+        self._pending.add(future)
+        try:
+            return await asyncio.wait_for(asyncio.shield(future), self.timeout)
+        except asyncio.TimeoutError:
+            self._pending.discard(future)
+            logger.warning(f"Rule set {compiled.digest[:12]} exceeded {self.timeout}s, restarting rule workers")
+            await self._restart()
+            raise RuleEvaluationError(f"Rule evaluation exceeded {self.timeout:g}s")
+        finally:
+            self._pending.discard(future)
+    
+    async def _restart(self) -> None:
+        """Kill the workers (the runaway match included) and fail whatever else was in flight."""
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            await asyncio.to_thread(pool.terminate)
+        for future in list(self._pending):
+            if not future.done():
+                future.set_exception(RuleEvaluationError("Rule evaluation interrupted by a worker restart"))
+    
+    def close(self) -> None:
+        pool, self._pool = self._pool, None
+        if pool is not None:
+            pool.terminate()
+
+# Shared by the invoice routes
+rule_runner = RuleRunner()
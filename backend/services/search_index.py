@@ -0,0 +1,133 @@
+import heapq
+import math
+import re
+from bisect import bisect_left
+from collections import Counter
+from typing import Dict, Iterable, List, Optional, Tuple
+from models.article import ArticleRecord
+
+TOKEN_RE = re.compile(r"\w+")
+
+# Field boosts applied to term frequencies
+FIELD_WEIGHTS = {"title": 3.0, "tags": 2.0, "description": 1.0, "body": 1.0}
+# Score multiplier for terms reached through prefix expansion
+PREFIX_WEIGHT = 0.5
+MAX_PREFIX_EXPANSIONS = 50
+
+def tokenize(text: Optional[str]) -> List[str]:
+    return TOKEN_RE.findall(text.lower()) if text else []
+
+class SearchIndex:
+    """
+    In-memory inverted index over articles with BM25 ranking.
+    
+    Documents are added and removed individually, so a feed refresh only
+    touches the postings of new, edited or deleted articles. Prefix matching
+    walks a sorted term list, built lazily after the index changes.
+    """
+    
+    def __init__(self, k1: float = 1.2, b: float = 0.75):
+        self.k1 = k1
+        self.b = b
+        self._postings: Dict[str, Dict[str, float]] = {}
+        self._doc_terms: Dict[str, Dict[str, float]] = {}
+        self._doc_len: Dict[str, float] = {}
+        self._total_len = 0.0
+        self._articles: Dict[str, ArticleRecord] = {}
+        self._sorted_terms: Optional[List[str]] = None
+        # Bumped on every add/remove so readers can tell the index changed
+        self.version = 0
+    
+    def __len__(self) -> int:
+        return len(self._articles)
+    
+    def __contains__(self, doc_id: str) -> bool:
+        return doc_id in self._articles
+    
+    def add(self, doc_id: str, article: ArticleRecord, body: str = "") -> None:
+        """Index (or re-index) one article under ``doc_id``."""
+        if doc_id in self._articles:
+            self.remove(doc_id)
+        
+        weighted: Counter = Counter()
+        fields = (
+            ("title", article.title),
+            ("description", article.description),
+            ("tags", " ".join(article.tags or [])),
+            ("body", body),
+        )
+        for field, text in fields:
+            weight = FIELD_WEIGHTS[field]
+            for token in tokenize(text):
+                weighted[token] += weight
+        
+        terms = dict(weighted)
+        for term, tf in terms.items():
+            postings = self._postings.get(term)
+            if postings is None:
+                postings = self._postings[term] = {}
+                self._sorted_terms = None
+            postings[doc_id] = tf
+        length = sum(terms.values())
+        self._doc_terms[doc_id] = terms
+        self._doc_len[doc_id] = length
+        self._total_len += length
+        self._articles[doc_id] = article
+        self.version += 1
+    
+    def remove(self, doc_id: str) -> None:
+        terms = self._doc_terms.pop(doc_id, None)
+        if terms is None:
+            return
+        for term in terms:
+            postings = self._postings[term]
+            del postings[doc_id]
+            if not postings:
+                del self._postings[term]
+                self._sorted_terms = None
+        self._total_len -= self._doc_len.pop(doc_id)
+        del self._articles[doc_id]
+        self.version += 1
+    
+    def retain(self, doc_ids: Iterable[str]) -> None:
+        """Drop every document not in ``doc_ids``."""
+        keep = set(doc_ids)
+        for doc_id in [d for d in self._articles if d not in keep]:
+            self.remove(doc_id)
+    
+    def _expand(self, token: str, prefix: bool) -> List[Tuple[str, float]]:
+        matches = []
+        if token in self._postings:
+            matches.append((token, 1.0))
+        if prefix:
+            if self._sorted_terms is None:
+                self._sorted_terms = sorted(self._postings)
+            terms = self._sorted_terms
+            i = bisect_left(terms, token)
+            expanded = 0
+            while i < len(terms) and terms[i].startswith(token) and expanded < MAX_PREFIX_EXPANSIONS:
+                if terms[i] != token:
+                    matches.append((terms[i], PREFIX_WEIGHT))
+                    expanded += 1
+                i += 1
+        return matches
+    
+    def search(self, query: str, limit: int = 10, prefix: bool = True) -> List[Tuple[ArticleRecord, float]]:
+        """Return up to ``limit`` (article, score) pairs, best first."""
+        n_docs = len(self._articles)
+        if not n_docs:
+            return []
+        avg_len = self._total_len / n_docs or 1.0
+        scores: Dict[str, float] = {}
+        
+        for token in set(tokenize(query)):
+            for term, boost in self._expand(token, prefix):
+                postings = self._postings[term]
+                df = len(postings)
+                idf = math.log(1 + (n_docs - df + 0.5) / (df + 0.5))
+                for doc_id, tf in postings.items():
+                    norm = self.k1 * (1 - self.b + self.b * self._doc_len[doc_id] / avg_len)
+                    scores[doc_id] = scores.get(doc_id, 0.0) + boost * idf * tf * (self.k1 + 1) / (tf + norm)
+        
+        best = heapq.nlargest(limit, scores.items(), key=lambda item: item[1])
+        return [(self._articles[doc_id], score) for doc_id, score in best]
@@ -0,0 +1,130 @@
+import asyncio
+import logging
+import os
+import time
+from typing import Dict, List, Optional
+
+from services.metrics import WRITE_BEHIND_BATCH_SIZE, WRITE_BEHIND_FLUSH_DURATION
+
+logger = logging.getLogger(__name__)
+
+STATUS_BATCH_SIZE = int(os.getenv("STATUS_BATCH_SIZE", "100"))
+STATUS_FLUSH_INTERVAL_MS = float(os.getenv("STATUS_FLUSH_INTERVAL_MS", "200"))
+STATUS_MAX_PENDING = int(os.getenv("STATUS_MAX_PENDING", "5000"))
+
+class WriteBehindBuffer:
+    """
+    Collects documents and writes them with unordered ``insert_many``.
+    
+    A batch is flushed when ``batch_size`` documents are waiting or every
+    ``flush_interval_ms``, whichever comes first. ``add`` blocks once
+    ``max_pending`` documents are buffered or in flight (backpressure).
+    Writes are best effort: a failed batch is logged and dropped. Flush
+    latency and batch sizes are exported through ``services.metrics``.
+    """
+    
+    def __init__(
+        self,
+        collection,
+        batch_size: int = STATUS_BATCH_SIZE,
+        flush_interval_ms: float = STATUS_FLUSH_INTERVAL_MS,
+        max_pending: int = STATUS_MAX_PENDING,
+    ):
+        self.collection = collection
+        # Metrics label; Motor collections know their own name
+        self.name = getattr(collection, "name", None) or "unknown"
+        self.batch_size = batch_size
+        self.flush_interval = flush_interval_ms / 1000
+        self._buffer: List[Dict] = []
+        self._slots = asyncio.Semaphore(max_pending)
+        self._batch_ready = asyncio.Event()
+        self._task: Optional[asyncio.Task] = None
+        self._stopping = False
+        self._flush_lock = asyncio.Lock()
+        
+        # Flush statistics
+        self.flushes = 0
+        self.documents_written = 0
+        self.failed_batches = 0
+        self.max_batch = 0
+        self.last_batch = 0
+        self.last_flush_ms = 0.0
+        self.total_flush_ms = 0.0
+    
+    async def add(self, doc: Dict) -> None:
+        await self._slots.acquire()
+        self._buffer.append(doc)
+        if len(self._buffer) >= self.batch_size:
+            self._batch_ready.set()
+    
+    async def flush(self) -> int:
+        """Write everything currently buffered. Returns the number of documents flushed."""
+        async with self._flush_lock:
+            batch, self._buffer = self._buffer, []
+            if not batch:
+                return 0
+            start = time.perf_counter()
+            outcome = "success"
+            try:
+                await self.collection.insert_many(batch, ordered=False)
+                self.documents_written += len(batch)
+            except Exception as e:
+                outcome = "failure"
+                self.failed_batches += 1
+                logger.warning(f"Could not write {len(batch)} buffered documents: {e}")
+            finally:
+                for _ in batch:
+                    self._slots.release()
+            elapsed = time.perf_counter() - start
+            WRITE_BEHIND_FLUSH_DURATION.labels(self.name, outcome).observe(elapsed)
+            WRITE_BEHIND_BATCH_SIZE.labels(self.name).observe(len(batch))
+            elapsed_ms = elapsed * 1000
+            self.flushes += 1
+            self.last_batch = len(batch)
+            self.max_batch = max(self.max_batch, len(batch))
+            self.last_flush_ms = elapsed_ms
+            self.total_flush_ms += elapsed_ms
+            logger.debug(f"Flushed {len(batch)} documents in {elapsed_ms:.1f} ms")
+            return len(batch)
+    
+    async def _run(self) -> None:
+        while not self._stopping:
+            try:
+                await asyncio.wait_for(self._batch_ready.wait(), self.flush_interval)
+            except asyncio.TimeoutError:
+                pass
+            self._batch_ready.clear()
+            await self.flush()
+    
+    def stats(self) -> Dict:
+        return {
+            "pending": len(self._buffer),
+            "flushes": self.flushes,
+            "documents_written": self.documents_written,
+            "failed_batches": self.failed_batches,
+            "last_batch_size": self.last_batch,
+            "max_batch_size": self.max_batch,
+            "avg_batch_size": round(self.documents_written / self.flushes, 2) if self.flushes else 0,
+            "last_flush_ms": round(self.last_flush_ms, 3),
+            "avg_flush_ms": round(self.total_flush_ms / self.flushes, 3) if self.flushes else 0,
+        }
+    
+    def start(self) -> None:
+        if self._task is None or self._task.done():
+            self._stopping = False
+            self._task = asyncio.create_task(self._run())
+    
+    async def stop(self) -> None:
+        """Stop the flusher and write whatever is still buffered."""
+        if self._task is not None:
+            # Let the loop finish its current flush and exit rather than
+            # cancelling it: a cancelled flush has already taken its batch
+            # out of the buffer and would lose it.
+            self._stopping = True
+            self._batch_ready.set()
+            try:
+                await self._task
+            except Exception as e:
+                logger.error(f"Write-behind flusher for {self.name} failed: {e}")
+            self._task = None
+        await self.flush()
@@ -4,12 +4,18 @@ Backend Test Suite for Medium RSS Integration
 Tests the new Medium RSS integration endpoints for Adrian Pop's portfolio.
 """
 
+import argparse
 import asyncio
 import httpx
 import json
+import math
+import random
+import threading
 import time
+from collections import Counter
 from datetime import datetime
-from typing import Dict, List, Any
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List, Any, Optional
 import os
 from dotenv import load_dotenv
 
@@ -405,8 +411,245 @@ class MediumRSSIntegrationTester:
         
         return passed, failed, errors
 
+# -----------------------------------------------------------------------------
+# Load generator
+# -----------------------------------------------------------------------------
+# name -> (method, path, JSON body factory)
+LOAD_ENDPOINTS = {
+    "articles": ("GET", "/api/articles/", None),
+    "latest": ("GET", "/api/articles/latest?limit=5", None),
+    "status": ("POST", "/api/status", lambda i: {"client_name": f"load-{i}"}),
+    "ready": ("GET", "/ready", None),
+    "contact": ("POST", "/api/contact/send-email", lambda i: {
+        "name": f"Load Test {i}",
+        "email": f"load{i}@example.com",
+        "message": "Load generator message",
+    }),
+}
+
+def percentile(sorted_values: List[float], pct: float) -> float:
+    """Nearest-rank percentile of an already sorted list (0 when empty)."""
+    if not sorted_values:
+        return 0.0
+    rank = max(1, math.ceil(pct / 100 * len(sorted_values)))
+    return sorted_values[rank - 1]
+
+def summarize(samples: List[Dict[str, Any]], elapsed: float) -> Dict[str, Any]:
+    """Latency percentiles (ms), throughput and error rate for a list of samples."""
+    latencies = sorted(sample["latency"] for sample in samples)
+    errors = sum(1 for sample in samples if not sample["ok"])
+    return {
+        "requests": len(samples),
+        "errors": errors,
+        "error_rate": round(errors / len(samples), 4) if samples else 0.0,
+        "throughput_rps": round(len(samples) / elapsed, 2) if elapsed > 0 else 0.0,
+        "latency_ms": {
+            "p50": round(percentile(latencies, 50) * 1000, 2),
+            "p95": round(percentile(latencies, 95) * 1000, 2),
+            "p99": round(percentile(latencies, 99) * 1000, 2),
+            "mean": round(sum(latencies) / len(latencies) * 1000, 2) if latencies else 0.0,
+            "max": round(latencies[-1] * 1000, 2) if latencies else 0.0,
+        },
+        "statuses": dict(Counter(str(sample["status"]) for sample in samples)),
+    }
+
+class ResendStub:
+    """In-process stand-in for the Resend API; point the backend's RESEND_API_BASE at it."""
+    
+    def __init__(self, host: str = "127.0.0.1", port: int = 0):
+        stub = self
+        self.received = 0
+        
+        class Handler(BaseHTTPRequestHandler):
+            def do_POST(self):
+                self.rfile.read(int(self.headers.get("Content-Length", 0)))
+                stub.received += 1
+                body = b'{"data": [{"id": "stub"}]}' if self.path.endswith("/batch") else b'{"id": "stub"}'
+                self.send_response(200)
+                self.send_header("Content-Type", "application/json")
+                self.send_header("Content-Length", str(len(body)))
+                self.end_headers()
+                self.wfile.write(body)
+            
+            def log_message(self, *args):
+                pass
+        
+        self.server = ThreadingHTTPServer((host, port), Handler)
+        self.thread = threading.Thread(target=self.server.serve_forever, daemon=True)
+    
+    @property
+    def url(self) -> str:
+        host, port = self.server.server_address[:2]
+        return f"http://{host}:{port}"
+    
+    def __enter__(self):
+        self.thread.start()
+        return self
+    
+    def __exit__(self, *exc):
+        self.server.shutdown()
+        self.server.server_close()
+
+class LoadGenerator:
+    """
+    Drives a weighted mix of endpoints with ``concurrency`` workers.
+    
+    With ``rate`` > 0 request start times are scheduled at a fixed total rate
+    (open loop, so a slow server shows up as latency rather than as a lower
+    offered load); with ``rate`` = 0 every worker sends back to back.
+    """
+    
+    def __init__(
+        self,
+        base_url: str,
+        endpoints: Dict[str, float],
+        concurrency: int = 10,
+        rate: float = 0.0,
+        duration: float = 30.0,
+        max_requests: Optional[int] = None,
+        timeout: float = 30.0,
+        seed: int = 1,
+    ):
+        unknown = set(endpoints) - set(LOAD_ENDPOINTS)
+        if unknown:
+            raise ValueError(f"Unknown endpoints: {sorted(unknown)}")
+        self.base_url = base_url.rstrip("/")
+        self.endpoints = endpoints
+        self.concurrency = concurrency
+        self.rate = rate
+        self.duration = duration
+        self.max_requests = max_requests
+        self.timeout = timeout
+        self.random = random.Random(seed)
+        self.samples: List[Dict[str, Any]] = []
+        self._issued = 0
+    
+    def _next_slot(self, started: float) -> Optional[tuple]:
+        """Claim the next request number and its scheduled start time, or None when done."""
+        index = self._issued
+        if self.max_requests is not None and index >= self.max_requests:
+            return None
+        scheduled = started + index / self.rate if self.rate > 0 else time.perf_counter()
+        if scheduled - started >= self.duration:
+            return None
+        self._issued += 1
+        return index, scheduled
+    
+    async def _worker(self, client: httpx.AsyncClient, started: float) -> None:
+        names = list(self.endpoints)
+        weights = [self.endpoints[name] for name in names]
+        while True:
+            slot = self._next_slot(started)
+            if slot is None:
+                return
+            index, scheduled = slot
+            delay = scheduled - time.perf_counter()
+            if delay > 0:
+                await asyncio.sleep(delay)
+            name = self.random.choices(names, weights)[0]
+            method, path, body = LOAD_ENDPOINTS[name]
+            request_start = time.perf_counter()
+            try:
+                response = await client.request(method, path, json=body(index) if body else None)
+                status = response.status_code
+                ok = response.is_success
+            except httpx.HTTPError as e:
+                status = type(e).__name__
+                ok = False
+            # Latency counts from the scheduled start so queueing delay is included
+            self.samples.append({
+                "endpoint": name,
+                "status": status,
+                "ok": ok,
+                "latency": time.perf_counter() - (scheduled if self.rate > 0 else request_start),
+            })
+    
+    async def run(self) -> Dict[str, Any]:
+        self.samples = []
+        self._issued = 0
+        limits = httpx.Limits(max_connections=self.concurrency, max_keepalive_connections=self.concurrency)
+        async with httpx.AsyncClient(base_url=self.base_url, timeout=self.timeout, limits=limits) as client:
+            started = time.perf_counter()
+            await asyncio.gather(*(self._worker(client, started) for _ in range(self.concurrency)))
+            elapsed = time.perf_counter() - started
+        
+        by_endpoint = {}
+        for name in self.endpoints:
+            samples = [sample for sample in self.samples if sample["endpoint"] == name]
+            if samples:
+                by_endpoint[name] = summarize(samples, elapsed)
+        return {
+            "config": {
+                "base_url": self.base_url,
+                "endpoints": self.endpoints,
+                "concurrency": self.concurrency,
+                "rate": self.rate,
+                "duration": self.duration,
+                "max_requests": self.max_requests,
+            },
+            "elapsed_s": round(elapsed, 3),
+            "overall": summarize(self.samples, elapsed),
+            "endpoints": by_endpoint,
+            "timestamp": datetime.now().isoformat(),
+        }
+
+def parse_endpoint_weights(spec: str) -> Dict[str, float]:
+    """Parse "articles=5,latest=3,ready" into {"articles": 5.0, "latest": 3.0, "ready": 1.0}."""
+    weights = {}
+    for part in spec.split(","):
+        if not part.strip():
+            continue
+        name, _, weight = part.partition("=")
+        weights[name.strip()] = float(weight) if weight else 1.0
+    return weights
+
+async def run_load(args) -> int:
+    """Run the load generator from CLI arguments and print the JSON report."""
+    base_url = args.base_url or os.getenv('REACT_APP_BACKEND_URL', 'http://localhost:8001')
+    generator = LoadGenerator(
+        base_url,
+        parse_endpoint_weights(args.endpoints),
+        concurrency=args.concurrency,
+        rate=args.rate,
+        duration=args.duration,
+        max_requests=args.requests,
+        timeout=args.timeout,
+    )
+    report = await generator.run()
+    output = json.dumps(report, indent=2)
+    if args.output:
+        with open(args.output, "w") as f:
+            f.write(output + "\n")
+    print(output)
+    return 0 if report["overall"]["error_rate"] <= args.max_error_rate else 1
+
+def parse_args():
+    parser = argparse.ArgumentParser(description="Backend functional tests and load generator")
+    parser.add_argument("--load", action="store_true", help="run the concurrent load generator instead of the functional tests")
+    parser.add_argument("--base-url", help="backend URL (default: REACT_APP_BACKEND_URL)")
+    parser.add_argument("--endpoints", default="articles=4,latest=3,status=1,ready=1,contact=1",
+                        help=f"weighted mix of {','.join(LOAD_ENDPOINTS)} as name=weight")
+    parser.add_argument("--concurrency", type=int, default=10)
+    parser.add_argument("--rate", type=float, default=0.0, help="total requests/s (0 = as fast as possible)")
+    parser.add_argument("--duration", type=float, default=30.0, help="seconds to run")
+    parser.add_argument("--requests", type=int, help="stop after this many requests")
+    parser.add_argument("--timeout", type=float, default=30.0)
+    parser.add_argument("--output", help="also write the JSON report to this file")
+    parser.add_argument("--max-error-rate", type=float, default=0.01, help="exit non-zero above this error rate")
+    parser.add_argument("--resend-stub-port", type=int,
+                        help="serve a local Resend stub on this port for the run "
+                             "(start the backend with RESEND_API_BASE=http://127.0.0.1:<port>)")
+    return parser.parse_args()
+
 async def main():
     """Main test runner"""
+    args = parse_args()
+    if args.load:
+        if args.resend_stub_port is not None:
+            with ResendStub(port=args.resend_stub_port):
+                exit(await run_load(args))
+        exit(await run_load(args))
+    
     tester = MediumRSSIntegrationTester()
     passed, failed, errors = await tester.run_all_tests()
     
@@ -0,0 +1,80 @@
+import os
+import sys
+import uuid
+from datetime import datetime
+
+import pytest
+
+# Backend modules import each other as top-level packages (models, routes, services)
+BACKEND_DIR = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "backend")
+if BACKEND_DIR not in sys.path:
+    sys.path.insert(0, BACKEND_DIR)
+
+
+@pytest.fixture
+def backend_dir():
+    """Directory the backend runs from (its modules import as top-level packages)."""
+    return BACKEND_DIR
+
+
+@pytest.fixture
+def make_article():
+    """
+    Factory for ``ArticleRecord`` test data.
+
+    The URL is built from ``slug`` (default: the lower-cased title with
+    dashes), so distinct titles give distinct URLs.
+    """
+    from models.article import ArticleRecord
+
+    def factory(title="Post", published_date=datetime(2025, 1, 1), *, slug=None, tags=(), **fields):
+        slug = slug or title.lower().replace(" ", "-")
+        return ArticleRecord(
+            title=title,
+            url=f"https://medium.com/@adrian.c.pop/{slug}",
+            published_date=published_date,
+            tags=tuple(tags),
+            **fields,
+        )
+
+    return factory
+
+
+# MongoDB used by tests that exercise the real Motor-backed classes
+TEST_MONGO_URL = os.getenv("TEST_MONGO_URL", "mongodb://localhost:27017")
+
+
+@pytest.fixture
+def mongo_db():
+    """
+    Factory for a throwaway Motor database on ``TEST_MONGO_URL``.
+
+    Call it inside the test's event loop (Motor binds to the loop it is first
+    used on). The database is dropped afterwards; the test is skipped when no
+    server answers.
+    """
+    from pymongo import MongoClient
+    from pymongo.errors import PyMongoError
+
+    sync_client = MongoClient(TEST_MONGO_URL, serverSelectionTimeoutMS=500)
+    try:
+        sync_client.admin.command("ping")
+    except PyMongoError:
+        sync_client.close()
+        pytest.skip(f"MongoDB not reachable at {TEST_MONGO_URL}")
+
+    name = f"test_{uuid.uuid4().hex[:12]}"
+    clients = []
+
+    def factory():
+        from motor.motor_asyncio import AsyncIOMotorClient
+
+        client = AsyncIOMotorClient(TEST_MONGO_URL, serverSelectionTimeoutMS=2000)
+        clients.append(client)
+        return client[name]
+
+    yield factory
+    for client in clients:
+        client.close()
+    sync_client.drop_database(name)
+    sync_client.close()
@@ -0,0 +1,86 @@
+"""Local stand-in for the Medium RSS endpoint used by the service tests."""
+import threading
+from email.utils import formatdate
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+
+def build_rss(count: int = 3, body_words: int = 50) -> str:
+    """Render a Medium-like RSS 2.0 document with ``count`` entries."""
+    items = []
+    for i in range(count):
+        body = " ".join(f"word{j}" for j in range(body_words))
+        items.append(
+            f"""<item>
+<title>Post {i}</title>
+<link>https://medium.com/@adrian.c.pop/post-{i}</link>
+<guid isPermaLink="false">https://medium.com/p/{i:08x}</guid>
+<category>tag{i % 3}</category>
+<pubDate>{formatdate(1735689600 + i * 86400, usegmt=True)}</pubDate>
+<content:encoded><![CDATA[<p>{body}</p><script>ignored()</script>]]></content:encoded>
+</item>"""
+        )
+    return (
+        '<?xml version="1.0" encoding="UTF-8"?>'
+        '<rss version="2.0" xmlns:content="http://purl.org/rss/1.0/modules/content/">'
+        "<channel><title>Stub feed</title><link>https://medium.com/@adrian.c.pop</link>"
+        + "".join(items)
+        + "</channel></rss>"
+    )
+
+
+class FeedStubServer:
+    """Threaded HTTP server that serves one feed body and honours ETag validators."""
+
+    def __init__(self, body: str, etag: str = '"v1"', last_modified: str = "Wed, 01 Jan 2025 00:00:00 GMT"):
+        self.body = body
+        self.etag = etag
+        self.last_modified = last_modified
+        self.requests = []
+        self.delay = 0.0
+        self.status = 200
+        stub = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                stub.requests.append(dict(self.headers))
+                if stub.delay:
+                    threading.Event().wait(stub.delay)
+                if stub.status != 200:
+                    self.send_response(stub.status)
+                    self.send_header("Content-Length", "0")
+                    self.end_headers()
+                    return
+                if stub.etag and self.headers.get("If-None-Match") == stub.etag:
+                    self.send_response(304)
+                    self.send_header("ETag", stub.etag)
+                    self.end_headers()
+                    return
+                payload = stub.body.encode("utf-8")
+                self.send_response(200)
+                self.send_header("Content-Type", "application/rss+xml; charset=utf-8")
+                self.send_header("Content-Length", str(len(payload)))
+                if stub.etag:
+                    self.send_header("ETag", stub.etag)
+                if stub.last_modified:
+                    self.send_header("Last-Modified", stub.last_modified)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                pass
+
+        self._server = ThreadingHTTPServer(("127.0.0.1", 0), Handler)
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+
+    @property
+    def url(self) -> str:
+        host, port = self._server.server_address[:2]
+        return f"http://{host}:{port}/feed"
+
+    def __enter__(self):
+        self._thread.start()
+        return self
+
+    def __exit__(self, *exc):
+        self._server.shutdown()
+        self._server.server_close()
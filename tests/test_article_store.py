@@ -0,0 +1,38 @@
+from datetime import datetime
+
+import pytest
+
+from services.article_store import build_query, decode_cursor, encode_cursor
+
+
+@pytest.fixture
+def article(make_article):
+    return make_article("Post", datetime(2025, 3, 1, 12, 30), slug="post|with-pipe")
+
+
+def test_cursor_round_trip(article):
+    published, url = decode_cursor(encode_cursor(article))
+    assert published == article.published_date
+    assert url == str(article.url)
+
+
+def test_decode_cursor_rejects_garbage():
+    with pytest.raises(ValueError):
+        decode_cursor("not a cursor")
+
+
+def test_build_query_without_filters_matches_everything():
+    assert build_query() == {}
+
+
+def test_build_query_combines_filters_and_keyset(article):
+    since, until = datetime(2025, 1, 1), datetime(2025, 6, 1)
+    query = build_query(cursor=encode_cursor(article), tag="ai", since=since, until=until)
+    assert query == {"$and": [
+        {"tags": "ai"},
+        {"published_date": {"$gte": since, "$lt": until}},
+        {"$or": [
+            {"published_date": {"$lt": article.published_date}},
+            {"published_date": article.published_date, "url": {"$lt": str(article.url)}},
+        ]},
+    ]}
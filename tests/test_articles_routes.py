@@ -0,0 +1,143 @@
+import json
+from datetime import datetime
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from models.article import ArticleRecord, ArticlesResponse, MediumArticle, dump_json
+from routes.articles import router
+from services.response_cache import ArticlesResponseCache, negotiate_encoding
+
+
+class MemoryArticleStore:
+    """In-memory stand-in for ArticleStore."""
+
+    def __init__(self, articles):
+        self.articles = sorted(articles, key=lambda a: a.published_date, reverse=True)
+        self.version = 1
+        self.list_calls = 0
+
+    async def get_version(self):
+        return self.version, datetime(2025, 6, 1)
+
+    async def list_articles(self, limit=None):
+        self.list_calls += 1
+        return self.articles[:limit] if limit is not None else list(self.articles)
+
+    async def iter_articles(self, batch_size=50):
+        for article in self.articles:
+            yield article
+
+
+@pytest.fixture
+def store(make_article):
+    return MemoryArticleStore([
+        make_article(f"Post {i}", datetime(2025, 1, 1 + i), tags=["ai"]) for i in range(3)
+    ])
+
+
+@pytest.fixture
+def client(store):
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    app.state.article_store = store
+    app.state.articles_response_cache = ArticlesResponseCache(store)
+    return TestClient(app)
+
+
+def test_articles_are_serialized_once_per_version(client, store):
+    first = client.get("/api/articles/")
+    second = client.get("/api/articles/")
+    assert first.status_code == second.status_code == 200
+    assert first.content == second.content
+    assert store.list_calls == 1
+    assert first.json()["total_count"] == 3
+    assert first.headers["cache-control"].startswith("public")
+
+    store.version = 2
+    client.get("/api/articles/")
+    assert store.list_calls == 2
+
+
+def test_matching_etag_returns_304(client):
+    etag = client.get("/api/articles/").headers["etag"]
+    response = client.get("/api/articles/", headers={"If-None-Match": f"W/{etag}"})
+    assert response.status_code == 304
+    assert response.content == b""
+    assert response.headers["etag"] == etag
+
+
+def test_gzip_variant_is_served_when_accepted(client):
+    plain = client.get("/api/articles/", headers={"Accept-Encoding": "identity"})
+    response = client.get("/api/articles/", headers={"Accept-Encoding": "gzip"})
+    assert response.headers["content-encoding"] == "gzip"
+    assert response.headers["etag"] != plain.headers["etag"]
+    # httpx transparently decodes the body
+    assert json.loads(response.content) == plain.json()
+
+
+def test_negotiate_encoding_respects_quality():
+    available = {"identity": None, "gzip": None, "br": None}
+    assert negotiate_encoding(None, available) == "identity"
+    assert negotiate_encoding("gzip, br", available) == "br"
+    assert negotiate_encoding("gzip, br;q=0", available) == "gzip"
+    assert negotiate_encoding("br", {"identity": None, "gzip": None}) == "identity"
+    assert negotiate_encoding("*", available) == "br"
+
+
+@pytest.mark.parametrize("kwargs", [
+    {"params": {"stream": "1"}},
+    {"headers": {"Accept": "application/x-ndjson"}},
+])
+def test_ndjson_stream_yields_one_article_per_line(client, store, kwargs):
+    response = client.get("/api/articles/", **kwargs)
+    assert response.status_code == 200
+    assert response.headers["content-type"] == "application/x-ndjson"
+    lines = response.text.splitlines()
+    assert [json.loads(line)["title"] for line in lines] == ["Post 2", "Post 1", "Post 0"]
+    assert store.list_calls == 0
+
+
+def test_record_json_matches_pydantic_serialization(make_article):
+    record = make_article("Post 1", datetime(2025, 1, 2), tags=["ai", "peppol"])._replace(description="Über e-invoicing", reading_time="4 min")
+    model = MediumArticle(**record.to_document())
+    assert dump_json(record.to_document()) == model.model_dump_json().encode("utf-8")
+    assert ArticleRecord.from_model(model) == record
+
+    response = ArticlesResponse(articles=[model], total_count=1, last_updated=datetime(2025, 6, 1))
+    assert dump_json({
+        "articles": [record.to_document()],
+        "total_count": 1,
+        "last_updated": datetime(2025, 6, 1),
+        "source": "Medium RSS Feed",
+    }) == response.model_dump_json().encode("utf-8")
+
+
+def test_latest_serializes_records_directly(client):
+    response = client.get("/api/articles/latest", params={"limit": 2})
+    assert response.status_code == 200
+    assert [article["title"] for article in response.json()] == ["Post 2", "Post 1"]
+    assert response.json()[0]["tags"] == ["ai"]
+
+
+def test_health_reports_every_aggregated_feed(client, monkeypatch):
+    from services.feed_aggregator import feed_aggregator
+    from services.medium_service import MediumService
+    from tests.feed_stub import FeedStubServer, build_rss
+
+    with FeedStubServer(build_rss(count=1)) as up:
+        down = MediumService(rss_url="http://127.0.0.1:9/feed")
+        monkeypatch.setattr(feed_aggregator, "services", [MediumService(rss_url=up.url), down])
+        body = client.get("/api/articles/health").json()
+
+    assert body["status"] == "unhealthy"
+    assert body["message"] == "1 of 2 Medium RSS feeds are accessible"
+    assert [(f["rss_url"], f["accessible"]) for f in body["feeds"]] == [(up.url, True), (down.rss_url, False)]
+    assert body["feeds"][1]["circuit"]["consecutive_failures"] == 1
+
+
+@pytest.mark.parametrize("limit", [0, -3, 101])
+def test_latest_rejects_out_of_range_limit(client, limit):
+    # Mongo treats limit(0) as "no limit" and negative values as abs(limit)
+    assert client.get("/api/articles/latest", params={"limit": limit}).status_code == 422
@@ -0,0 +1,56 @@
+import asyncio
+import time
+
+from services.circuit_breaker import CLOSED, HALF_OPEN, OPEN, CircuitBreaker
+from services.medium_service import MediumService
+from tests.feed_stub import FeedStubServer, build_rss
+
+
+def test_opens_after_threshold_and_rejects_calls():
+    breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+    breaker.record_failure("boom")
+    assert breaker.state == CLOSED
+    breaker.record_failure("boom")
+    assert breaker.state == OPEN
+    assert not breaker.allow_request()
+    assert 59 < breaker.retry_in() <= 60
+
+
+def test_half_open_allows_one_trial_then_closes_or_reopens():
+    breaker = CircuitBreaker(failure_threshold=1, recovery_timeout=0.01)
+    breaker.record_failure()
+    time.sleep(0.02)
+    assert breaker.state == HALF_OPEN
+    assert breaker.allow_request()
+    assert not breaker.allow_request()
+    breaker.record_failure()
+    assert breaker.state == OPEN
+
+    time.sleep(0.02)
+    assert breaker.allow_request()
+    breaker.record_success()
+    assert breaker.state == CLOSED
+    assert breaker.failures == 0
+
+
+def test_open_circuit_serves_last_good_articles_without_calling_upstream():
+    with FeedStubServer(build_rss(count=2)) as stub:
+        async def run():
+            service = MediumService(rss_url=stub.url, cache_ttl=0)
+            service.breaker = CircuitBreaker(failure_threshold=2, recovery_timeout=60)
+            await service.refresh_articles()
+            stub.status = 500
+            await service.refresh_articles()
+            await service.refresh_articles()
+            hits_when_opened = len(stub.requests)
+            started = time.perf_counter()
+            articles = await service.get_articles()
+            await service._refresh_task
+            return service, hits_when_opened, articles, time.perf_counter() - started
+
+        service, hits_when_opened, articles, elapsed = asyncio.run(run())
+
+    assert service.breaker.state == OPEN
+    assert len(stub.requests) == hits_when_opened == 3
+    assert len(articles) == 2
+    assert elapsed < 0.5
@@ -0,0 +1,225 @@
+import asyncio
+from datetime import datetime
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routes.contact import router
+from services.email_queue import (
+    STATUS_DEAD,
+    STATUS_PENDING,
+    STATUS_SENDING,
+    STATUS_SENT,
+    EmailWorkerPool,
+    EmailOutbox,
+    ResendSender,
+    idempotency_key,
+    retry_delay,
+)
+from tests.resend_stub import ResendStubServer
+
+
+class MemoryOutbox:
+    """In-memory stand-in for EmailOutbox with the same state transitions."""
+
+    def __init__(self):
+        self.docs = {}
+
+    async def enqueue(self, message):
+        message_id = f"m{len(self.docs)}"
+        self.docs[message_id] = {
+            "_id": message_id,
+            "status": STATUS_PENDING,
+            "message": message,
+            "attempts": 0,
+            "next_attempt_at": datetime.utcnow(),
+        }
+        return message_id
+
+    async def claim(self, limit, lease_seconds=60):
+        now = datetime.utcnow()
+        due = [d for d in self.docs.values() if d["status"] == STATUS_PENDING and d["next_attempt_at"] <= now]
+        for doc in due[:limit]:
+            doc["status"] = STATUS_SENDING
+        return [dict(doc) for doc in due[:limit]]
+
+    async def mark_sent(self, message_ids):
+        for message_id in message_ids:
+            self.docs[message_id]["status"] = STATUS_SENT
+
+    async def mark_failed(self, failures):
+        for failure in failures:
+            doc = self.docs[failure["_id"]]
+            doc.update(status=failure["status"], attempts=failure["attempts"],
+                       next_attempt_at=failure["next_attempt_at"], last_error=failure["error"])
+
+
+def message(i):
+    return {"from": "a@example.com", "to": "b@example.com", "subject": f"s{i}", "html": "<p>hi</p>"}
+
+
+def run_batches(outbox, resend, times=1, **kwargs):
+    pool = EmailWorkerPool(outbox, ResendSender("test-key", base_url=resend.url), **kwargs)
+
+    async def run():
+        for _ in range(times):
+            await pool.process_batch()
+
+    asyncio.run(run())
+
+
+def test_queued_messages_are_delivered_in_one_batch():
+    outbox = MemoryOutbox()
+    for i in range(3):
+        asyncio.run(outbox.enqueue(message(i)))
+
+    with ResendStubServer() as resend:
+        run_batches(outbox, resend, batch_size=10)
+
+    assert len(resend.requests) == 1
+    assert resend.requests[0]["path"] == "/emails/batch"
+    assert resend.requests[0]["headers"]["Authorization"] == "Bearer test-key"
+    assert [m["subject"] for m in resend.requests[0]["json"]] == ["s0", "s1", "s2"]
+    assert all(doc["status"] == STATUS_SENT for doc in outbox.docs.values())
+
+
+def test_server_errors_are_retried_with_backoff():
+    outbox = MemoryOutbox()
+    asyncio.run(outbox.enqueue(message(0)))
+
+    with ResendStubServer(statuses=[503]) as resend:
+        run_batches(outbox, resend, backoff=lambda attempts: 0)
+        failed = dict(outbox.docs["m0"])
+        run_batches(outbox, resend, backoff=lambda attempts: 0)
+
+    assert failed["status"] == STATUS_PENDING
+    assert failed["attempts"] == 1
+    assert "503" in failed["last_error"]
+    assert outbox.docs["m0"]["status"] == STATUS_SENT
+
+
+def test_rejected_api_key_is_retried_not_dead_lettered():
+    outbox = MemoryOutbox()
+    asyncio.run(outbox.enqueue(message(0)))
+
+    with ResendStubServer(statuses=[401]) as resend:
+        run_batches(outbox, resend, backoff=lambda attempts: 0, max_attempts=5)
+        failed = dict(outbox.docs["m0"])
+        run_batches(outbox, resend, backoff=lambda attempts: 0, max_attempts=5)
+
+    assert failed["status"] == STATUS_PENDING
+    assert "401" in failed["last_error"]
+    assert outbox.docs["m0"]["status"] == STATUS_SENT
+
+
+def test_messages_are_dead_lettered():
+    outbox = MemoryOutbox()
+    asyncio.run(outbox.enqueue(message(0)))
+    asyncio.run(outbox.enqueue(message(1)))
+
+    with ResendStubServer(statuses=[500, 500]) as resend:
+        run_batches(outbox, resend, times=2, batch_size=1, max_attempts=1)
+    assert {doc["status"] for doc in outbox.docs.values()} == {STATUS_DEAD}
+
+    outbox = MemoryOutbox()
+    asyncio.run(outbox.enqueue(message(0)))
+    with ResendStubServer(statuses=[422]) as resend:
+        run_batches(outbox, resend, max_attempts=5)
+    assert outbox.docs["m0"]["status"] == STATUS_DEAD
+    assert outbox.docs["m0"]["attempts"] == 1
+
+
+def test_rejected_batch_is_split_so_valid_messages_are_delivered():
+    outbox = MemoryOutbox()
+    for i in range(3):
+        asyncio.run(outbox.enqueue(message(i)))
+
+    # Batch rejected, then m0 ok, m1 rejected on its own, m2 ok
+    with ResendStubServer(statuses=[422, 200, 422, 200]) as resend:
+        run_batches(outbox, resend, batch_size=10, max_attempts=5)
+
+    assert [len(r["json"]) for r in resend.requests] == [3, 1, 1, 1]
+    assert {k: d["status"] for k, d in outbox.docs.items()} == {
+        "m0": STATUS_SENT, "m1": STATUS_DEAD, "m2": STATUS_SENT,
+    }
+
+
+def test_deliveries_carry_an_idempotency_key_from_the_outbox_ids():
+    outbox = MemoryOutbox()
+    for i in range(2):
+        asyncio.run(outbox.enqueue(message(i)))
+
+    with ResendStubServer(statuses=[503]) as resend:
+        run_batches(outbox, resend, backoff=lambda attempts: 0)
+        run_batches(outbox, resend, backoff=lambda attempts: 0)
+
+    keys = [r["headers"]["Idempotency-Key"] for r in resend.requests]
+    # The retry of the same messages reuses the key
+    assert keys[0] == keys[1] == idempotency_key(["m1", "m0"])
+    assert idempotency_key(["m0"]) == "outbox-m0"
+
+
+def test_retry_delay_grows_exponentially_and_is_capped():
+    assert 4 <= retry_delay(1, base=5, maximum=100) <= 6
+    assert 32 <= retry_delay(4, base=5, maximum=100) <= 48
+    assert retry_delay(20, base=5, maximum=100) <= 120
+
+
+def test_send_email_endpoint_queues_and_returns_202(monkeypatch):
+    monkeypatch.setenv("RESEND_API_KEY", "test-key")
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    app.state.email_outbox = outbox = MemoryOutbox()
+
+    response = TestClient(app).post("/api/contact/send-email", json={
+        "name": "Ada <script>",
+        "email": "ada@example.com",
+        "message": "Hello, I would like to talk.",
+    })
+
+    assert response.status_code == 202
+    assert response.json()["success"] is True
+    queued = outbox.docs[response.json()["id"]]["message"]
+    assert queued["subject"] == "New message from Ada script"
+
+
+def test_mongo_outbox_claims_in_order_reclaims_expired_leases_and_records_failures(mongo_db):
+    from datetime import timedelta
+
+    async def run():
+        db = mongo_db()
+        outbox = EmailOutbox(db)
+        await outbox.ensure_indexes()
+        first = await outbox.enqueue(message(0))
+        second = await outbox.enqueue(message(1))
+        await outbox.collection.update_one(
+            {"_id": first}, {"$set": {"next_attempt_at": datetime.utcnow() - timedelta(minutes=1)}}
+        )
+
+        claimed = await outbox.claim(10)
+        nothing_left = await outbox.claim(10)
+        # An expired lease (crashed worker) is claimed again
+        await outbox.collection.update_one(
+            {"_id": second}, {"$set": {"lease_until": datetime.utcnow() - timedelta(seconds=1)}}
+        )
+        reclaimed = await outbox.claim(10)
+
+        await outbox.mark_sent([first])
+        await outbox.mark_failed([{
+            "_id": second, "status": STATUS_PENDING, "attempts": 1,
+            "next_attempt_at": datetime.utcnow() + timedelta(minutes=5), "error": "Resend error 503",
+        }])
+        docs = {doc["_id"]: doc async for doc in outbox.collection.find()}
+        return first, second, claimed, nothing_left, reclaimed, docs
+
+    first, second, claimed, nothing_left, reclaimed, docs = asyncio.run(run())
+
+    assert [doc["_id"] for doc in claimed] == [first, second]
+    assert all(doc["status"] == STATUS_SENDING and "lease_until" in doc for doc in claimed)
+    assert nothing_left == []
+    assert [doc["_id"] for doc in reclaimed] == [second]
+    assert docs[first]["status"] == STATUS_SENT and "lease_until" not in docs[first]
+    assert docs[second]["status"] == STATUS_PENDING
+    assert docs[second]["attempts"] == 1
+    assert docs[second]["last_error"] == "Resend error 503"
+    assert "lease_until" not in docs[second]
@@ -0,0 +1,126 @@
+import asyncio
+import time
+from datetime import datetime
+
+from services.feed_aggregator import FeedAggregator, merge_articles, service_for_feed
+from services.medium_service import MediumService
+
+
+class StubFeed(MediumService):
+    def __init__(self, articles=None, delay=0.0, fail=False, cached=None):
+        super().__init__(rss_url="http://stub.invalid/feed")
+        self.stub_articles = articles
+        self.delay = delay
+        self.fail = fail
+        self._articles = cached
+
+    async def load_articles(self):
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise RuntimeError("boom")
+        return self.stub_articles
+
+
+def test_merge_is_newest_first_and_deduplicated(make_article):
+    a = [make_article("a3", datetime(2025, 1, 3)), make_article("shared", datetime(2025, 1, 2))]
+    b = [
+        make_article("b4", datetime(2025, 1, 4)),
+        make_article("shared", datetime(2025, 1, 2)),
+        make_article("b1", datetime(2025, 1, 1)),
+    ]
+    assert [x.title for x in merge_articles([a, b])] == ["b4", "a3", "shared", "b1"]
+
+
+def test_slow_and_failing_feeds_do_not_hold_back_the_merge(make_article):
+    fast = StubFeed([make_article("fast", datetime(2025, 1, 5))])
+    slow = StubFeed(
+        [make_article("slow", datetime(2025, 1, 6))],
+        delay=5,
+        cached=[make_article("slow-cached", datetime(2025, 1, 1))],
+    )
+    broken = StubFeed(fail=True)
+    aggregator = FeedAggregator([fast, slow, broken], max_concurrency=3, feed_timeout=0.1)
+
+    start = time.perf_counter()
+    articles = asyncio.run(aggregator.refresh_articles())
+    elapsed = time.perf_counter() - start
+
+    assert elapsed < 1
+    assert [a.title for a in articles] == ["fast", "slow-cached"]
+
+
+def test_all_feeds_failing_returns_none():
+    aggregator = FeedAggregator([StubFeed(fail=True), StubFeed(fail=True)])
+    assert asyncio.run(aggregator.refresh_articles()) is None
+
+
+def test_concurrency_limit_is_respected():
+    running = 0
+    peak = 0
+
+    class CountingFeed(StubFeed):
+        async def load_articles(self):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.01)
+            running -= 1
+            return []
+
+    aggregator = FeedAggregator([CountingFeed() for _ in range(6)], max_concurrency=2)
+    asyncio.run(aggregator.refresh_articles())
+    assert peak == 2
+
+
+def test_feed_specs():
+    assert service_for_feed("@someone").rss_url == "https://medium.com/feed/@someone"
+    assert service_for_feed("some-publication").rss_url == "https://medium.com/feed/some-publication"
+    assert service_for_feed("https://example.com/atom.xml").rss_url == "https://example.com/atom.xml"
+
+
+def test_search_spans_feeds_once_per_url_with_shared_scoring():
+    import feedparser
+    from tests.feed_stub import build_rss
+
+    author, publication = StubFeed(), StubFeed()
+    asyncio.run(author.parse_entries(feedparser.parse(build_rss(count=3)).entries))
+    # The publication repeats the author's posts and adds unrelated ones
+    asyncio.run(publication.parse_entries(feedparser.parse(build_rss(count=6)).entries))
+    aggregator = FeedAggregator([author, publication])
+
+    hits = aggregator.search("post", limit=20)
+    urls = [article.url for article, _ in hits]
+    assert len(urls) == len(set(urls)) == 6
+
+    # Scores match a single index built over the six distinct articles
+    publication_hits = publication.search_index.search("post 4", limit=1)
+    assert aggregator.search("post 4", limit=1)[0][1] == publication_hits[0][1]
+
+    # Index follows feed changes
+    asyncio.run(publication.parse_entries(feedparser.parse(build_rss(count=2)).entries))
+    assert len(aggregator.search("post", limit=20)) == 3
+
+
+def test_timed_out_fetches_keep_their_concurrency_slot():
+    running = 0
+    peak = 0
+
+    class SlowFeed(StubFeed):
+        async def load_articles(self):
+            nonlocal running, peak
+            running += 1
+            peak = max(peak, running)
+            await asyncio.sleep(0.2)
+            running -= 1
+            return []
+
+    aggregator = FeedAggregator([SlowFeed() for _ in range(4)], max_concurrency=2, feed_timeout=0.05)
+
+    async def run():
+        # Two polls in a row, each giving up on its feeds long before they finish
+        await aggregator.refresh_articles()
+        await aggregator.refresh_articles()
+        await asyncio.sleep(0.5)
+
+    asyncio.run(run())
+    assert peak == 2
@@ -0,0 +1,68 @@
+import asyncio
+from datetime import datetime
+
+from services.article_store import ArticleStore
+from services.feed_poller import FeedPoller
+
+
+class StubService:
+    def __init__(self, results):
+        self.results = list(results)
+
+    async def refresh_articles(self):
+        return self.results.pop(0)
+
+
+class MemoryStore:
+    def __init__(self):
+        self.docs = {}
+
+    async def upsert_articles(self, articles):
+        for article in articles:
+            doc = ArticleStore.to_document(article)
+            self.docs[doc["url"]] = doc
+        return len(articles)
+
+
+def test_poll_once_upserts_by_url(make_article):
+    store = MemoryStore()
+    poller = FeedPoller(StubService([[make_article("a"), make_article("b")], [make_article("a")]]), store)
+
+    async def run():
+        await poller.poll_once()
+        await poller.poll_once()
+
+    asyncio.run(run())
+    assert sorted(store.docs) == [
+        "https://medium.com/@adrian.c.pop/a",
+        "https://medium.com/@adrian.c.pop/b",
+    ]
+
+
+def test_poll_once_skips_unavailable_feed():
+    store = MemoryStore()
+    poller = FeedPoller(StubService([None]), store)
+    assert asyncio.run(poller.poll_once()) == 0
+    assert store.docs == {}
+
+
+def test_document_round_trip(make_article):
+    article = make_article("c", tags=["ai"])
+    doc = ArticleStore.to_document(article)
+    assert isinstance(doc["url"], str)
+    assert isinstance(doc["published_date"], datetime)
+    assert ArticleStore.from_document(dict(doc, _id="x", first_seen_at=datetime.utcnow())) == article
+
+
+def test_start_and_stop_background_task(make_article):
+    store = MemoryStore()
+    poller = FeedPoller(StubService([[make_article("d")]] * 10), store, interval=0.01)
+
+    async def run():
+        poller.start()
+        await asyncio.sleep(0.05)
+        await poller.stop()
+
+    asyncio.run(run())
+    assert "https://medium.com/@adrian.c.pop/d" in store.docs
+    assert poller._task is None
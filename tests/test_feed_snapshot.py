@@ -0,0 +1,107 @@
+import asyncio
+import json
+import os
+import threading
+from datetime import datetime
+
+from services.feed_aggregator import FeedAggregator
+from models.article import ArticleRecord
+from services.feed_snapshot import read_snapshot, write_snapshot
+from services.medium_service import MediumService
+from tests.feed_stub import FeedStubServer, build_rss
+
+
+def test_refresh_writes_snapshot_and_new_process_warm_starts(tmp_path):
+    path = str(tmp_path / "feed.jsonl")
+    with FeedStubServer(build_rss(count=3)) as stub:
+        async def first_process():
+            service = MediumService(rss_url=stub.url, cache_ttl=0)
+            service.snapshot_path = path
+            return await service.refresh_articles()
+
+        async def second_process():
+            service = MediumService(rss_url=stub.url, cache_ttl=0)
+            service.snapshot_path = path
+            assert service.load_snapshot()
+            restored = service.cached_articles
+            refreshed = await service.refresh_articles()
+            return service, restored, refreshed
+
+        original = asyncio.run(first_process())
+        service, restored, refreshed = asyncio.run(second_process())
+
+    assert [a.url for a in restored] == [a.url for a in original]
+    assert restored[0].published_date == original[0].published_date
+    # The restored validators make the first upstream fetch a 304
+    assert stub.requests[1]["If-None-Match"] == '"v1"'
+    assert refreshed is restored
+    assert [a.title for a, _ in service.search_index.search("post 2", limit=1)] == ["Post 2"]
+    assert service.search_index.search("word3")
+
+
+def test_snapshot_for_other_feed_or_version_is_ignored(tmp_path):
+    path = str(tmp_path / "feed.jsonl")
+    with FeedStubServer(build_rss(count=2)) as stub:
+        service = MediumService(rss_url=stub.url)
+        service.snapshot_path = path
+        asyncio.run(service.refresh_articles())
+
+    assert read_snapshot(path, "https://example.com/other.xml") is None
+
+    with open(path, encoding="utf-8") as f:
+        lines = f.readlines()
+    header = json.loads(lines[0])
+    header["version"] = 0
+    with open(path, "w", encoding="utf-8") as f:
+        f.writelines([json.dumps(header) + "\n"] + lines[1:])
+
+    other = MediumService(rss_url=stub.url)
+    other.snapshot_path = path
+    assert not other.load_snapshot()
+    assert other.cached_articles is None
+
+
+def test_concurrent_writers_never_interleave(tmp_path):
+    path = str(tmp_path / "feed.jsonl")
+    url = "https://example.com/feed.xml"
+
+    def entries(worker):
+        return {
+            f"{worker}-{i}": (f"fp{i}", ArticleRecord(f"{worker} {i}", f"https://example.com/{worker}/{i}", datetime(2025, 1, 1)), "text " * 200)
+            for i in range(200)
+        }
+
+    errors = []
+
+    def write(worker):
+        try:
+            for _ in range(10):
+                write_snapshot(path, url, entries(worker), None, None)
+        except Exception as e:
+            errors.append(e)
+
+    threads = [threading.Thread(target=write, args=(worker,)) for worker in ("a", "b")]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert errors == []
+    snapshot = read_snapshot(path, url)
+    assert len(snapshot.entries) == 200
+    assert len({guid.split("-")[0] for guid in snapshot.entries}) == 1
+    assert os.listdir(tmp_path) == ["feed.jsonl"]
+
+
+def test_aggregator_assigns_snapshot_paths_per_feed(tmp_path):
+    services = [
+        MediumService(rss_url="https://example.com/a.xml"),
+        MediumService(rss_url="https://example.com/b.xml"),
+    ]
+    aggregator = FeedAggregator(services)
+
+    assert aggregator.load_snapshots(str(tmp_path)) == 0
+    paths = {service.snapshot_path for service in services}
+    assert len(paths) == 2
+    assert all(p.startswith(str(tmp_path)) for p in paths)
+    assert aggregator.load_snapshots("") == 0
@@ -0,0 +1,50 @@
+import asyncio
+
+from services.heartbeat import MongoHeartbeat
+
+
+class FakeDB:
+    def __init__(self, fail=False, delay=0.0):
+        self.fail = fail
+        self.delay = delay
+        self.pings = 0
+
+    async def command(self, name):
+        assert name == "ping"
+        self.pings += 1
+        await asyncio.sleep(self.delay)
+        if self.fail:
+            raise ConnectionError("connection refused")
+        return {"ok": 1}
+
+
+def test_not_ready_before_first_successful_ping():
+    heartbeat = MongoHeartbeat(FakeDB())
+    assert not heartbeat.is_ready()
+    assert heartbeat.not_ready_reason() == "No successful ping yet"
+
+
+def test_successful_ping_records_latency_and_readiness():
+    heartbeat = MongoHeartbeat(FakeDB())
+    assert asyncio.run(heartbeat.beat())
+    assert heartbeat.is_ready()
+    snapshot = heartbeat.snapshot()
+    assert snapshot["latency_ms"] >= 0
+    assert snapshot["consecutive_failures"] == 0
+
+
+def test_hanging_ping_times_out_and_stale_state_is_not_ready():
+    db = FakeDB()
+    heartbeat = MongoHeartbeat(db, timeout=0.01, max_staleness=0.0)
+    asyncio.run(heartbeat.beat())
+    db.delay = 1
+    assert not asyncio.run(heartbeat.beat())
+    assert heartbeat.consecutive_failures == 1
+    assert not heartbeat.is_ready()
+    assert heartbeat.not_ready_reason() == "TimeoutError"
+
+
+def test_failures_are_recorded():
+    heartbeat = MongoHeartbeat(FakeDB(fail=True))
+    asyncio.run(heartbeat.beat())
+    assert heartbeat.not_ready_reason() == "connection refused"
@@ -0,0 +1,56 @@
+import re
+
+import pytest
+import readtime
+from bs4 import BeautifulSoup
+
+from services.html_text import count_html_words, html_words_and_text
+from services.medium_service import MediumService
+
+
+def legacy_word_count(html: str) -> int:
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(["script", "style"]):
+        tag.decompose()
+    text = soup.get_text(strip=True)
+    if not text.strip():
+        return 0
+    return len(re.split(r"\W+", text.strip()))
+
+
+SAMPLES = [
+    "",
+    "<p>   </p>",
+    "<p>Hello world</p>",
+    "<p>Hello</p><p>world</p>",
+    "<p>Hello </p><p> world.</p>",
+    "<h1>Title:</h1><p>—intro, with punctuation!</p>",
+    "<p>a &amp; b &lt;c&gt; caf&eacute;</p>",
+    "<p>keep</p><script>var skipped = 1;</script><style>p { x: y }</style><p>going</p>",
+    "<div><!-- comment words --><p>visible <b>bold</b>text</p></div>",
+    "<figure><img src='x.png'><figcaption>Caption here</figcaption></figure>",
+    "plain text with no tags at all",
+]
+
+
+@pytest.mark.parametrize("html", SAMPLES)
+def test_word_count_matches_beautifulsoup_path(html):
+    assert count_html_words(html) == legacy_word_count(html)
+
+
+@pytest.mark.parametrize("html", SAMPLES)
+def test_index_text_matches_beautifulsoup_get_text(html):
+    soup = BeautifulSoup(html, "html.parser")
+    for tag in soup(["script", "style"]):
+        tag.decompose()
+    assert html_words_and_text(html) == (legacy_word_count(html), soup.get_text(" ", strip=True))
+
+
+def test_reading_time_matches_readtime_package():
+    html = "<p>" + " ".join(f"word{i}" for i in range(1200)) + "</p>"
+    soup_text = BeautifulSoup(html, "html.parser").get_text(strip=True)
+    assert MediumService().calculate_reading_time(html) == readtime.of_text(soup_text).text
+
+
+def test_reading_time_without_text_falls_back():
+    assert MediumService().calculate_reading_time("<script>only()</script>") == "1 min read"
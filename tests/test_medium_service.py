@@ -0,0 +1,214 @@
+import asyncio
+
+from services.medium_service import MediumService
+from tests.feed_stub import FeedStubServer, build_rss
+
+
+class CountingService(MediumService):
+    """MediumService whose feed load is replaced by a counter."""
+
+    def __init__(self, make_article, **kwargs):
+        super().__init__(**kwargs)
+        self.make_article = make_article
+        self.loads = 0
+
+    async def load_articles(self):
+        self.loads += 1
+        await asyncio.sleep(0)
+        return [self.make_article(f"post-{self.loads}")]
+
+
+def test_get_articles_serves_from_cache_within_ttl(make_article):
+    async def run():
+        service = CountingService(make_article, cache_ttl=60)
+        first = await service.get_articles()
+        second = await service.get_articles()
+        return service, first, second
+
+    service, first, second = asyncio.run(run())
+    assert service.loads == 1
+    assert first is second
+
+
+def test_stale_cache_is_served_while_single_refresh_runs(make_article):
+    async def run():
+        service = CountingService(make_article, cache_ttl=0)
+        await service.get_articles()
+        stale = await asyncio.gather(*(service.get_articles() for _ in range(5)))
+        await service._refresh_task
+        fresh = service._articles
+        return service, stale, fresh
+
+    service, stale, fresh = asyncio.run(run())
+    assert all(articles[0].title == "post-1" for articles in stale)
+    assert service.loads == 2
+    assert fresh[0].title == "post-2"
+
+
+def test_failed_refresh_keeps_stale_articles(make_article):
+    class FlakyService(CountingService):
+        async def load_articles(self):
+            self.loads += 1
+            return [self.make_article("ok")] if self.loads == 1 else None
+
+    async def run():
+        service = FlakyService(make_article, cache_ttl=0)
+        await service.get_articles()
+        await service.refresh_articles()
+        return await service.get_articles()
+
+    articles = asyncio.run(run())
+    assert articles[0].title == "ok"
+
+
+def test_conditional_get_reuses_articles_on_304():
+    with FeedStubServer(build_rss(count=3)) as stub:
+        async def run():
+            service = MediumService(rss_url=stub.url, cache_ttl=0)
+            first = await service.refresh_articles()
+            second = await service.refresh_articles()
+            return first, second
+
+        first, second = asyncio.run(run())
+
+    assert len(first) == 3
+    assert second is first
+    assert "If-None-Match" not in stub.requests[0]
+    assert stub.requests[1]["If-None-Match"] == '"v1"'
+    assert stub.requests[1]["If-Modified-Since"] == "Wed, 01 Jan 2025 00:00:00 GMT"
+
+
+def test_changed_feed_is_reparsed_after_200():
+    with FeedStubServer(build_rss(count=2)) as stub:
+        async def run():
+            service = MediumService(rss_url=stub.url, cache_ttl=0)
+            first = await service.refresh_articles()
+            stub.body, stub.etag = build_rss(count=4), '"v2"'
+            second = await service.refresh_articles()
+            return service, first, second
+
+        service, first, second = asyncio.run(run())
+
+    assert len(first) == 2
+    assert len(second) == 4
+    assert service._etag == '"v2"'
+
+
+def test_health_style_fetch_is_unconditional():
+    with FeedStubServer(build_rss(count=1)) as stub:
+        async def run():
+            service = MediumService(rss_url=stub.url)
+            await service.refresh_articles()
+            return await service.fetch_rss_data()
+
+        body = asyncio.run(run())
+
+    assert "Post 0" in body
+    assert "If-None-Match" not in stub.requests[1]
+
+
+def test_health_fetch_does_not_hide_a_new_feed_version():
+    with FeedStubServer(build_rss(count=2)) as stub:
+        async def run():
+            service = MediumService(rss_url=stub.url, cache_ttl=0)
+            first = await service.refresh_articles()
+            stub.body, stub.etag = build_rss(count=4), '"v2"'
+            # Unparsed fetch, as /api/articles/health does
+            await service.fetch_rss_data()
+            second = await service.refresh_articles()
+            return first, second
+
+        first, second = asyncio.run(run())
+
+    assert len(first) == 2
+    assert len(second) == 4
+    assert stub.requests[2]["If-None-Match"] == '"v1"'
+
+
+def test_unchanged_entries_are_not_reparsed():
+    import feedparser
+
+    class TrackingService(MediumService):
+        def __init__(self):
+            super().__init__()
+            self.parsed = []
+
+        def parse_feed_entry(self, entry, word_count=None):
+            self.parsed.append(entry.title)
+            return super().parse_feed_entry(entry, word_count)
+
+    service = TrackingService()
+    first = asyncio.run(service.parse_entries(feedparser.parse(build_rss(count=3)).entries))
+    assert sorted(service.parsed) == ["Post 0", "Post 1", "Post 2"]
+
+    service.parsed.clear()
+    edited = build_rss(count=4).replace("<title>Post 1</title>", "<title>Post 1 (edited)</title>")
+    second = asyncio.run(service.parse_entries(feedparser.parse(edited).entries))
+
+    assert sorted(service.parsed) == ["Post 1 (edited)", "Post 3"]
+    assert second[0] is first[0]
+    assert len(service._entry_cache) == 4
+
+
+def test_process_pool_parses_feed_in_batches():
+    from services.parse_executor import create_parse_executor
+
+    executor = create_parse_executor("process", workers=2)
+    try:
+        with FeedStubServer(build_rss(count=20)) as stub:
+            service = MediumService(rss_url=stub.url, executor=executor)
+            service.parse_batch_size = 3
+            articles = asyncio.run(service.refresh_articles())
+    finally:
+        executor.shutdown()
+
+    assert len(articles) == 20
+    assert articles[0].title == "Post 19"
+    assert all(article.reading_time == "1 min" for article in articles)
+
+
+def test_concurrent_requests_share_one_upstream_fetch():
+    with FeedStubServer(build_rss(count=5)) as stub:
+        stub.delay = 0.05
+
+        async def run():
+            service = MediumService(rss_url=stub.url)
+            return await asyncio.gather(*(service.get_articles() for _ in range(100)))
+
+        results = asyncio.run(run())
+
+    assert len(stub.requests) == 1
+    assert all(articles is results[0] for articles in results)
+    assert len(results[0]) == 5
+
+
+def test_cancelled_waiter_does_not_cancel_shared_refresh():
+    with FeedStubServer(build_rss(count=2)) as stub:
+        stub.delay = 0.05
+
+        async def run():
+            service = MediumService(rss_url=stub.url)
+            doomed = asyncio.create_task(service.refresh_articles())
+            survivor = asyncio.create_task(service.refresh_articles())
+            await asyncio.sleep(0.01)
+            doomed.cancel()
+            return await survivor
+
+        articles = asyncio.run(run())
+
+    assert len(articles) == 2
+    assert len(stub.requests) == 1
+
+
+def test_search_index_follows_feed_refreshes():
+    import feedparser
+
+    service = MediumService()
+    asyncio.run(service.parse_entries(feedparser.parse(build_rss(count=3)).entries))
+    assert [a.title for a, _ in service.search_index.search("post 2", limit=1)] == ["Post 2"]
+
+    edited = build_rss(count=2).replace("<title>Post 1</title>", "<title>Renamed entry</title>")
+    asyncio.run(service.parse_entries(feedparser.parse(edited).entries))
+    assert len(service.search_index) == 2
+    assert [a.title for a, _ in service.search_index.search("renamed")] == ["Renamed entry"]
+    assert service.search_index.search("word3")
@@ -0,0 +1,58 @@
+import asyncio
+from types import SimpleNamespace
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+from prometheus_client import CollectorRegistry, Counter, Histogram, generate_latest
+
+from services.medium_service import MediumService
+from services.metrics import MetricsMiddleware, MongoCommandMetrics, registry
+from tests.feed_stub import FeedStubServer, build_rss
+
+
+def test_middleware_labels_requests_by_route_template():
+    local = CollectorRegistry()
+    duration = Histogram("req_seconds", "Request duration", ("method", "route"), registry=local)
+    requests = Counter("req", "Requests", ("method", "route", "status"), registry=local)
+    app = FastAPI()
+
+    @app.get("/items/{item_id}")
+    async def get_item(item_id: int):
+        return {"id": item_id}
+
+    app.add_middleware(MetricsMiddleware, duration=duration, requests=requests)
+    client = TestClient(app)
+    client.get("/items/1")
+    client.get("/items/2")
+    client.get("/missing")
+
+    assert local.get_sample_value("req_seconds_count", {"method": "GET", "route": "/items/{item_id}"}) == 2
+    assert local.get_sample_value("req_total", {"method": "GET", "route": "/items/{item_id}", "status": "200"}) == 2
+    assert local.get_sample_value("req_total", {"method": "GET", "route": "unmatched", "status": "404"}) == 1
+
+
+def test_mongo_listener_records_command_durations():
+    local = CollectorRegistry()
+    histogram = Histogram("mongo_seconds", "Mongo commands", ("command", "outcome"), registry=local)
+    listener = MongoCommandMetrics(histogram)
+    listener.succeeded(SimpleNamespace(command_name="find", duration_micros=1500))
+    listener.failed(SimpleNamespace(command_name="insert", duration_micros=200))
+
+    assert local.get_sample_value("mongo_seconds_count", {"command": "find", "outcome": "success"}) == 1
+    assert local.get_sample_value("mongo_seconds_sum", {"command": "find", "outcome": "success"}) == 0.0015
+    assert local.get_sample_value("mongo_seconds_count", {"command": "insert", "outcome": "failure"}) == 1
+
+
+def test_medium_fetch_and_parse_are_timed():
+    with FeedStubServer(build_rss(count=2)) as stub:
+        service = MediumService(medium_username="metrics-test", rss_url=stub.url)
+        asyncio.run(service.refresh_articles())
+        asyncio.run(service.refresh_articles())
+
+    def count(name, **labels):
+        return registry.get_sample_value(f"{name}_count", {"feed": "metrics-test", **labels})
+
+    assert count("medium_fetch_duration_seconds", outcome="ok") == 1
+    assert count("medium_fetch_duration_seconds", outcome="not_modified") == 1
+    assert count("medium_parse_duration_seconds") == 1
+    assert b'medium_fetch_duration_seconds_count{feed="metrics-test",outcome="ok"} 1.0' in generate_latest(registry)
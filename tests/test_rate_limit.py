@@ -0,0 +1,89 @@
+import asyncio
+
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routes.contact import router
+from services.rate_limit import MongoRateLimiter, TokenBucketLimiter, client_ip, parse_networks, rate_limit_key
+
+TRUSTED = parse_networks("127.0.0.0/8,10.0.0.0/8")
+
+
+def test_client_ip_ignores_header_from_untrusted_peer():
+    assert client_ip("203.0.113.9", "198.51.100.1", TRUSTED) == "203.0.113.9"
+
+
+def test_client_ip_walks_trusted_proxy_chain():
+    assert client_ip("10.0.0.2", "198.51.100.7, 10.0.0.5", TRUSTED) == "198.51.100.7"
+    # A client-supplied first hop cannot override the address nginx appended
+    assert client_ip("10.0.0.2", "1.2.3.4, 198.51.100.7", TRUSTED) == "198.51.100.7"
+
+
+def test_token_bucket_limits_and_reports_retry_after():
+    limiter = TokenBucketLimiter(rate=2, period=60)
+
+    async def run():
+        return [await limiter.hit("a") for _ in range(3)] + [await limiter.hit("b")]
+
+    first, second, third, other = asyncio.run(run())
+    assert first == second == 0
+    assert 29 < third <= 30
+    assert other == 0
+
+
+def test_ipv6_clients_share_a_bucket_per_64():
+    assert rate_limit_key("2001:db8:1:2::1") == rate_limit_key("2001:db8:1:2:ffff::9") == "2001:db8:1:2::/64"
+    assert rate_limit_key("2001:db8:1:3::1") != rate_limit_key("2001:db8:1:2::1")
+    assert rate_limit_key("::ffff:198.51.100.7") == "198.51.100.7"
+    assert rate_limit_key("198.51.100.7") == "198.51.100.7"
+    assert rate_limit_key("unknown") == "unknown"
+
+
+def test_mongo_token_bucket_has_no_window_boundary_burst(mongo_db, monkeypatch):
+    import services.rate_limit as rate_limit
+
+    clock = [7199.0]  # one second before a fixed window would have reset
+    monkeypatch.setattr(rate_limit.time, "time", lambda: clock[0])
+
+    async def run():
+        limiter = MongoRateLimiter(mongo_db(), rate=2, period=3600)
+        await limiter.ensure_indexes()
+        results = [await limiter.hit("a"), await limiter.hit("a"), await limiter.hit("a")]
+        clock[0] = 7201.0
+        results.append(await limiter.hit("a"))
+        clock[0] = 7199.0 + 1801
+        results.append(await limiter.hit("a"))
+        results.append(await limiter.hit("b"))
+        return results
+
+    first, second, third, after_boundary, refilled, other = asyncio.run(run())
+    assert first == second == 0
+    assert 1799 < third <= 1800
+    assert after_boundary > 0
+    assert refilled == 0
+    assert other == 0
+
+
+def test_token_bucket_memory_is_bounded():
+    limiter = TokenBucketLimiter(rate=1, period=60, max_keys=3)
+
+    async def run():
+        for key in "abcde":
+            await limiter.hit(key)
+
+    asyncio.run(run())
+    assert len(limiter) == 3
+    assert list(limiter._buckets) == ["c", "d", "e"]
+
+
+def test_send_email_returns_429_with_retry_after():
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    app.state.contact_rate_limiter = TokenBucketLimiter(rate=1, period=60)
+    client = TestClient(app)
+    payload = {"name": "Bot", "email": "bot@example.com", "message": "x", "botField": "spam"}
+
+    assert client.post("/api/contact/send-email", json=payload).status_code == 400
+    response = client.post("/api/contact/send-email", json=payload)
+    assert response.status_code == 429
+    assert response.headers["Retry-After"] == "60"
@@ -0,0 +1,174 @@
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from routes.invoices import router
+from services.rule_engine import (
+    UNDEFINED,
+    RuleSetCache,
+    compile_path,
+    compile_rule_set,
+    loose_equals,
+    rule_set_digest,
+)
+
+INVOICE = {
+    "number": "INV-2025-001",
+    "currency": "RON",
+    "totals": {"net": 100, "vat": 19, "gross": "119"},
+    "seller": {"vat": "RO123456", "name": "Acme SRL"},
+    "lines": [{"qty": 2}],
+    "notes": "",
+    "discount": None,
+}
+
+
+def test_paths_follow_edge_function_resolution():
+    assert compile_path("totals.net")(INVOICE) == 100
+    assert compile_path("lines.0.qty")(INVOICE) == 2
+    assert compile_path("seller.vat.length")(INVOICE) is UNDEFINED
+    assert compile_path("discount.amount")(INVOICE) is UNDEFINED
+    assert compile_path("missing")(INVOICE) is UNDEFINED
+
+
+def test_array_length_and_indexes_match_resolve_path():
+    invoice = {"lines": [{"amount": 5}], "empty": [], "code": "abc"}
+    assert compile_path("lines.length")(invoice) == 1
+    assert compile_path("empty.length")(invoice) == 0
+    assert compile_path("lines.00")(invoice) is UNDEFINED
+    assert compile_path("code.length")(invoice) is UNDEFINED
+
+    result = compile_rule_set([
+        {"field": "lines.length", "operator": ">", "value": 0},
+        {"field": "empty.length", "operator": "===", "value": 0},
+        {"field": "lines.0.amount", "operator": ">=", "value": 5},
+    ]).validate(invoice)
+    assert result["isValid"] is True
+    assert result["errors"] == []
+
+
+def test_operators_use_javascript_coercions():
+    rules = [
+        {"field": "totals.gross", "operator": ">", "value": 100},       # "119" > 100
+        {"field": "totals.net", "operator": "==", "value": "100"},
+        {"field": "totals.net", "operator": "===", "value": "100"},
+        {"field": "notes", "operator": "notEmpty"},
+        {"field": "seller.name", "operator": "contains", "value": "SRL"},
+        {"field": "seller.vat", "operator": "matches", "value": "^RO\\d{6}$"},
+        {"field": "seller.vat", "operator": "matches", "value": "(", "action": "warning"},
+        {"field": "currency", "operator": "between", "value": 1},
+        {"field": "discount", "operator": "lessThan", "value": 1},     # null -> 0
+    ]
+    result = compile_rule_set(rules).validate(INVOICE)
+
+    assert [entry["passed"] for entry in result["ruleLog"]] == [True, True, False, False, True, True, False, False, True]
+    assert [entry["rule"] for entry in result["ruleLog"]] == list(range(1, 10))
+    assert result["isValid"] is False
+    assert result["errors"] == [
+        "Rule failed: totals.net === 100",
+        "Rule failed: notes notEmpty undefined",
+        "Rule failed: currency between 1",
+    ]
+    assert result["warnings"] == ["Rule failed: seller.vat matches ("]
+
+
+def test_loose_equality_matches_javascript():
+    assert loose_equals(None, UNDEFINED)
+    assert loose_equals(True, "1")
+    assert loose_equals(0, "")
+    assert not loose_equals(None, 0)
+    assert loose_equals([1, 2], "1,2")
+
+
+def test_rule_sets_are_compiled_once_per_content():
+    cache = RuleSetCache(max_size=2)
+    rules = [{"field": "totals.net", "operator": ">", "value": 0}]
+    first, hit = cache.get(rules)
+    assert not hit
+    # Same content with keys in another order hits the cache
+    second, hit = cache.get([{"value": 0, "operator": ">", "field": "totals.net"}])
+    assert hit and second is first
+    assert first.digest == rule_set_digest(rules)
+
+    cache.get([{"field": "a", "operator": "notEmpty"}])
+    cache.get([{"field": "b", "operator": "notEmpty"}])
+    assert len(cache) == 2
+    assert not cache.get(rules)[1]
+
+
+def test_validate_endpoint_returns_edge_function_shape():
+    app = FastAPI()
+    app.include_router(router, prefix="/api")
+    client = TestClient(app)
+
+    response = client.post("/api/invoices/validate", json={
+        "rules": [
+            {"field": "totals.vat", "operator": ">=", "value": 19},
+            {"field": "buyer.vat", "operator": "notEmpty", "action": "warning"},
+        ],
+        "invoice": INVOICE,
+    })
+
+    assert response.status_code == 200
+    assert response.json() == {
+        "isValid": True,
+        "errors": [],
+        "warnings": ["Rule failed: buyer.vat notEmpty undefined"],
+        "ruleLog": [{"rule": 1, "passed": True}, {"rule": 2, "passed": False}],
+    }
+
+
+def test_python_regex_differences_are_as_documented():
+    invoice = {"ref": "INV-42", "amount": "٣٤"}  # Arabic-Indic "34"
+    result = compile_rule_set([
+        {"field": "ref", "operator": "matches", "value": "^INV-(?<num>\\d+)$"},
+        {"field": "amount", "operator": "matches", "value": "^\\d+$"},
+    ]).validate(invoice)
+    # JS accepts the named group; Python re does not compile it, so the rule fails
+    # JS \d is ASCII only; Python's also matches other Unicode digits
+    assert [entry["passed"] for entry in result["ruleLog"]] == [False, True]
+
+
+def test_backtracking_pattern_cannot_block_the_event_loop():
+    import asyncio
+    import time
+
+    from services.rule_runner import RuleEvaluationError, RuleRunner
+
+    rules = [{"field": "code", "operator": "matches", "value": "^(a+)+$"}]
+    slow = {"code": "a" * 40 + "b"}
+
+    async def run():
+        runner = RuleRunner(timeout=1.0, workers=1)
+        try:
+            compiled = compile_rule_set(rules)
+            ok = await runner.validate(compiled, rules, {"code": "aaa"})
+            ticks = 0
+
+            async def ticker():
+                nonlocal ticks
+                while True:
+                    await asyncio.sleep(0.01)
+                    ticks += 1
+
+            ticking = asyncio.create_task(ticker())
+            start = time.perf_counter()
+            try:
+                await runner.validate(compiled, rules, slow)
+            except RuleEvaluationError:
+                timed_out = True
+            else:
+                timed_out = False
+            elapsed = time.perf_counter() - start
+            ticking.cancel()
+            # Workers are respawned after the restart
+            again = await runner.validate(compiled, rules, {"code": "aa"})
+            return ok, timed_out, elapsed, ticks, again
+        finally:
+            runner.close()
+
+    ok, timed_out, elapsed, ticks, again = asyncio.run(run())
+    assert ok["isValid"] is True
+    assert timed_out
+    assert elapsed < 5
+    assert ticks > 20  # the loop kept running while the match was stuck
+    assert again["isValid"] is True
@@ -0,0 +1,32 @@
+from services.search_index import SearchIndex
+
+
+def build_index(make_article) -> SearchIndex:
+    index = SearchIndex()
+    index.add("a", make_article("Peppol e-invoicing in Romania", tags=["einvoicing"]), "RO e-Factura clearance model")
+    index.add("b", make_article("AI agents for compliance"), "agents validate invoices against rules")
+    index.add("c", make_article("Sailing notes"), "wind and water, nothing about invoices")
+    return index
+
+
+def test_title_match_outranks_body_match(make_article):
+    results = build_index(make_article).search("invoices compliance")
+    assert [article.title for article, _ in results][:2] == ["AI agents for compliance", "Sailing notes"]
+
+
+def test_prefix_matching_expands_query_terms(make_article):
+    index = build_index(make_article)
+    assert [a.title for a, _ in index.search("peppo")] == ["Peppol e-invoicing in Romania"]
+    assert index.search("peppo", prefix=False) == []
+
+
+def test_reindex_and_remove_update_postings(make_article):
+    index = build_index(make_article)
+    index.add("c", make_article("Sailing and Peppol"), "")
+    assert {a.title for a, _ in index.search("peppol")} == {"Peppol e-invoicing in Romania", "Sailing and Peppol"}
+    assert index.search("wind") == []
+
+    index.retain(["a"])
+    assert len(index) == 1
+    assert index.search("agents") == []
+    assert "agents" not in index._postings
@@ -0,0 +1,14 @@
+import os
+import subprocess
+import sys
+
+
+def test_server_import_does_not_load_feed_parsers(backend_dir):
+    # Fresh interpreter: this test process has usually imported them already
+    check = "import server, sys; print(','.join(m for m in ('feedparser', 'bs4', 'dateutil') if m in sys.modules))"
+    result = subprocess.run(
+        [sys.executable, "-c", check],
+        cwd=backend_dir, capture_output=True, text=True, check=True,
+        env=dict(os.environ, PYTHONDONTWRITEBYTECODE="1"),
+    )
+    assert result.stdout.strip() == ""
@@ -0,0 +1,117 @@
+import asyncio
+
+from services.write_behind import WriteBehindBuffer
+
+
+class RecordingCollection:
+    def __init__(self, fail=False):
+        self.batches = []
+        self.fail = fail
+
+    async def insert_many(self, docs, ordered=True):
+        assert ordered is False
+        if self.fail:
+            raise RuntimeError("mongo down")
+        self.batches.append(list(docs))
+
+
+def test_full_batch_is_flushed_without_waiting_for_interval():
+    collection = RecordingCollection()
+
+    async def run():
+        buffer = WriteBehindBuffer(collection, batch_size=3, flush_interval_ms=10_000)
+        buffer.start()
+        for i in range(3):
+            await buffer.add({"i": i})
+        await asyncio.sleep(0.01)
+        written = len(collection.batches)
+        await buffer.stop()
+        return buffer, written
+
+    buffer, written = asyncio.run(run())
+    assert written == 1
+    assert collection.batches == [[{"i": 0}, {"i": 1}, {"i": 2}]]
+    assert buffer.stats()["max_batch_size"] == 3
+
+
+def test_partial_batch_is_flushed_on_interval_and_on_stop():
+    collection = RecordingCollection()
+
+    async def run():
+        buffer = WriteBehindBuffer(collection, batch_size=100, flush_interval_ms=20)
+        buffer.start()
+        await buffer.add({"i": 0})
+        await asyncio.sleep(0.06)
+        await buffer.add({"i": 1})
+        await buffer.stop()
+
+    asyncio.run(run())
+    assert collection.batches == [[{"i": 0}], [{"i": 1}]]
+
+
+def test_add_blocks_when_buffer_is_full():
+    collection = RecordingCollection()
+
+    async def run():
+        buffer = WriteBehindBuffer(collection, batch_size=100, flush_interval_ms=10_000, max_pending=2)
+        await buffer.add({"i": 0})
+        await buffer.add({"i": 1})
+        blocked = asyncio.create_task(buffer.add({"i": 2}))
+        await asyncio.sleep(0.01)
+        was_blocked = not blocked.done()
+        await buffer.flush()
+        await blocked
+        return was_blocked, buffer
+
+    was_blocked, buffer = asyncio.run(run())
+    assert was_blocked
+    assert buffer.stats()["pending"] == 1
+
+
+def test_failed_flush_releases_capacity():
+    async def run():
+        buffer = WriteBehindBuffer(RecordingCollection(fail=True), max_pending=1)
+        await buffer.add({"i": 0})
+        await buffer.flush()
+        await asyncio.wait_for(buffer.add({"i": 1}), 0.1)
+        return buffer.stats()
+
+    assert asyncio.run(run())["failed_batches"] == 1
+
+
+def test_stop_during_flush_still_writes_the_batch():
+    class SlowCollection(RecordingCollection):
+        async def insert_many(self, docs, ordered=True):
+            await asyncio.sleep(0.05)
+            await super().insert_many(docs, ordered)
+
+    collection = SlowCollection()
+
+    async def run():
+        buffer = WriteBehindBuffer(collection, batch_size=2, flush_interval_ms=10_000)
+        buffer.start()
+        await buffer.add({"i": 0})
+        await buffer.add({"i": 1})
+        await asyncio.sleep(0.01)  # flusher is now inside insert_many
+        await buffer.stop()
+
+    asyncio.run(run())
+    assert collection.batches == [[{"i": 0}, {"i": 1}]]
+
+
+def test_flushes_are_exported_as_metrics():
+    from services.metrics import registry
+
+    collection = RecordingCollection()
+    collection.name = "metrics_probe"
+
+    async def run():
+        buffer = WriteBehindBuffer(collection)
+        await buffer.add({"i": 0})
+        await buffer.add({"i": 1})
+        await buffer.flush()
+
+    asyncio.run(run())
+    labels = {"collection": "metrics_probe"}
+    assert registry.get_sample_value("write_behind_flush_duration_seconds_count", {**labels, "outcome": "success"}) == 1
+    assert registry.get_sample_value("write_behind_batch_size_sum", labels) == 2